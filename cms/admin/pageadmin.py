@@ -55,6 +55,7 @@ from cms.utils.compat.dj import is_installed
 from cms.utils.conf import get_cms_setting
 from cms.utils.helpers import find_placeholder_relation, current_site
 from cms.utils.permissions import has_global_page_permission, has_generic_permission
+from cms.utils.page import prefetch_titles
 from cms.utils.urlutils import add_url_parameters, admin_reverse
 
 require_POST = method_decorator(require_POST)
@@ -1540,10 +1541,14 @@ class PageAdmin(PlaceholderAdminMixin, ModelAdmin):
 
         if page_id:
             page = get_object_or_404(self.model, pk=int(page_id))
-            pages = list(page.get_children())
+            pages = page.get_children()
         else:
             pages = Page.get_root_nodes().filter(site=site,
                                                  publisher_is_draft=True)
+        pages = list(pages.select_related('publisher_public'))
+        # The tree shows the state of the draft and public titles of the pages
+        # in all languages
+        prefetch_titles(pages + [page.publisher_public for page in pages if page.publisher_public_id])
 
         template = "admin/cms/page/tree/lazy_menu.html"
         response = u""
@@ -1704,7 +1709,7 @@ class PageAdmin(PlaceholderAdminMixin, ModelAdmin):
                 | Q(title_set__path__icontains=query_term, title_set__language=language_code)
                 | Q(title_set__menu_title__icontains=query_term, title_set__language=language_code)
                 | Q(title_set__page_title__icontains=query_term, title_set__language=language_code)
-            ).distinct()
+            ).distinct().with_titles()
 
             results = []
             for page in matching_published_pages:
@@ -1,12 +1,13 @@
 # -*- coding: utf-8 -*-
 from collections import OrderedDict
 from importlib import import_module
+from threading import RLock
 
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.core.exceptions import ImproperlyConfigured
 from django.core.urlresolvers import (RegexURLResolver, Resolver404, reverse,
-                                      RegexURLPattern)
+                                      RegexURLPattern, clear_url_caches, get_resolver)
 from django.db import OperationalError, ProgrammingError
 from django.utils import six
 from django.utils.translation import get_language, override
@@ -17,11 +18,64 @@ from cms.utils.compat import DJANGO_1_8
 from cms.utils.i18n import get_language_list
 
 APP_RESOLVERS = []
+# Incremented whenever the app resolvers change
+APP_RESOLVERS_GENERATION = 0
+
+_app_resolvers_lock = RLock()
+
+# The resolvers of the apphooks hooked to the root of a page,
+# by apphook, page id, language and app resolvers generation
+_page_app_resolvers = {}
+
+# The app resolvers by language and path of their page,
+# see _get_app_resolvers_index()
+_app_resolvers_index = {}
 
 
 def clear_app_resolvers():
-    global APP_RESOLVERS
-    APP_RESOLVERS = []
+    global APP_RESOLVERS, APP_RESOLVERS_GENERATION
+
+    with _app_resolvers_lock:
+        APP_RESOLVERS = []
+        APP_RESOLVERS_GENERATION += 1
+        _page_app_resolvers.clear()
+        _app_resolvers_index.clear()
+
+
+def get_app_resolvers_generation():
+    return APP_RESOLVERS_GENERATION
+
+
+def get_page_app_resolver(page, language, app_urls):
+    """
+    Returns the resolver of the urls the given apphook provides for the page
+    in language, used to resolve the root of the page. Returns None if the
+    apphook is not registered.
+
+    The resolvers are kept until the app resolvers change, so that their
+    patterns are only compiled once.
+    """
+    key = (app_urls, page.pk, language, APP_RESOLVERS_GENERATION)
+    resolver = _page_app_resolvers.get(key)
+
+    if resolver is None:
+        app = apphook_pool.get_apphook(app_urls)
+
+        if not app:
+            return None
+
+        pattern_list = []
+
+        for urlpatterns in get_app_urls(app.get_urls(page, language)):
+            pattern_list += urlpatterns
+
+        # Same as the resolver django.core.urlresolvers.resolve() builds
+        resolver = RegexURLResolver(r'^/', tuple(pattern_list))
+
+        with _app_resolvers_lock:
+            if key[-1] == APP_RESOLVERS_GENERATION:
+                _page_app_resolvers[key] = resolver
+    return resolver
 
 
 def applications_page_check(request, current_page=None, path=None):
@@ -38,11 +92,11 @@ def applications_page_check(request, current_page=None, path=None):
     for lang in get_language_list():
         if path.startswith(lang + "/"):
             path = path[len(lang + "/"):]
-    for resolver in APP_RESOLVERS:
+    for resolver in _get_path_app_resolvers(path):
         try:
             page_id = resolver.resolve_page_id(path)
             # yes, it is application page
-            page = Page.objects.public().get(id=page_id)
+            page = _get_app_page(page_id)
             # If current page was matched, then we have some override for
             # content from cms, but keep current page. Otherwise return page
             # to which was application assigned.
@@ -55,10 +109,65 @@ def applications_page_check(request, current_page=None, path=None):
     return None
 
 
+def _get_app_page(page_id):
+    from cms.cache.page import get_app_page_cache, set_app_page_cache
+
+    page = get_app_page_cache(page_id)
+
+    if page is None:
+        page = Page.objects.public().get(id=page_id)
+        set_app_page_cache(page)
+    return page
+
+
+def _get_app_resolvers_index(language):
+    """
+    Returns the app resolvers with patterns in the given language,
+    by the path of the title their patterns are prefixed with.
+    """
+    generation = APP_RESOLVERS_GENERATION
+    index = _app_resolvers_index.get((language, generation))
+
+    if index is None:
+        index = {}
+
+        for resolver in APP_RESOLVERS:
+            if language in resolver.path_dict:
+                index.setdefault(resolver.path_dict[language], []).append(resolver)
+
+        with _app_resolvers_lock:
+            if generation == APP_RESOLVERS_GENERATION:
+                _app_resolvers_index[(language, generation)] = index
+    return index
+
+
+def _get_path_app_resolvers(path):
+    """
+    Returns the app resolvers which may resolve the given path: those of
+    the titles whose path is a prefix of it, the longest prefix first.
+    """
+    index = _get_app_resolvers_index(get_language())
+    resolvers = []
+
+    if not index:
+        return resolvers
+
+    bits = path.split('/')
+
+    # The patterns of a title are prefixed with its path and a slash
+    for depth in range(len(bits) - 1, 0, -1):
+        resolvers.extend(index.get('/'.join(bits[:depth]), []))
+    # Apphooks on the home page
+    resolvers.extend(index.get('', []))
+    return resolvers
+
+
 class AppRegexURLResolver(RegexURLResolver):
     def __init__(self, *args, **kwargs):
         self.page_id = None
         self.url_patterns_dict = {}
+        # The title path the patterns of each language are prefixed with
+        self.path_dict = {}
         super(AppRegexURLResolver, self).__init__(*args, **kwargs)
 
     @property
@@ -179,6 +288,129 @@ def get_patterns_for_title(path, title):
     return url_patterns
 
 
+def _get_title_app_patterns(title, app):
+    path = title.path
+
+    if not settings.APPEND_SLASH:
+        path += '/'
+
+    with override(title.language):
+        url_patterns = get_patterns_for_title(path, title)
+
+    if app.permissions:
+        _set_permissions(url_patterns, app.exclude_permissions)
+    return url_patterns
+
+
+def _clear_resolver_caches(resolver):
+    resolver._reverse_dict = {}
+    resolver._namespace_dict = {}
+    resolver._app_dict = {}
+
+
+def _clear_including_resolver_caches(resolver):
+    """
+    Clears the caches of the resolvers included by the given one, except
+    for the app resolvers. They cache what they include from app resolvers.
+    """
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, RegexURLResolver) and not isinstance(pattern, AppRegexURLResolver):
+            _clear_including_resolver_caches(pattern)
+            _clear_resolver_caches(pattern)
+
+
+def update_app_resolvers(changes):
+    """
+    Rebuilds the patterns of the given (page id, language) pairs in their
+    app resolvers and swaps them in, leaving the other app resolvers alone.
+
+    Returns False without changing anything if the app resolvers have to be
+    rebuilt from scratch instead: when a page has no app resolver yet or has
+    no hooked title anymore, when its application or namespace changed or
+    when the app resolvers are no longer in the order of their pages.
+    """
+    from cms.models import Title
+
+    global APP_RESOLVERS_GENERATION
+
+    resolvers = dict((resolver.page_id, resolver) for resolver in APP_RESOLVERS)
+    languages_by_page = OrderedDict()
+
+    for page_id, language in changes:
+        if page_id not in resolvers:
+            return False
+        languages_by_page.setdefault(page_id, set()).add(language)
+
+    if len(APP_RESOLVERS) > 1:
+        # The app resolvers are tried in the order of their page in the tree,
+        # which a move can change.
+        page_ids = [resolver.page_id for resolver in APP_RESOLVERS]
+        ordered_page_ids = list(
+            Page
+            .objects
+            .filter(pk__in=page_ids)
+            .order_by('-path')
+            .values_list('pk', flat=True)
+        )
+
+        if ordered_page_ids != page_ids:
+            return False
+
+    titles_by_page = {}
+    titles = (
+        Title
+        .objects
+        .public()
+        .filter(page__in=list(languages_by_page))
+        .exclude(page__application_urls=None)
+        .exclude(page__application_urls='')
+        .select_related('page')
+    )
+
+    for title in titles:
+        titles_by_page.setdefault(title.page_id, {})[title.language] = title
+
+    updates = []
+
+    for page_id, languages in languages_by_page.items():
+        resolver = resolvers[page_id]
+        titles = titles_by_page.get(page_id)
+
+        if not titles:
+            return False
+
+        page = next(iter(titles.values())).page
+        app = apphook_pool.get_apphook(page.application_urls)
+
+        if not app or (app.app_name, page.application_namespace) != (resolver.app_name, resolver.namespace):
+            return False
+
+        url_patterns_dict = resolver.url_patterns_dict.copy()
+        path_dict = resolver.path_dict.copy()
+
+        for language in languages:
+            if language in titles:
+                url_patterns_dict[language] = _get_title_app_patterns(titles[language], app)
+                path_dict[language] = titles[language].path
+            else:
+                url_patterns_dict.pop(language, None)
+                path_dict.pop(language, None)
+        updates.append((resolver, url_patterns_dict, path_dict))
+
+    with _app_resolvers_lock:
+        for resolver, url_patterns_dict, path_dict in updates:
+            # Requests see either the old or the new patterns
+            resolver.url_patterns_dict = url_patterns_dict
+            resolver.path_dict = path_dict
+            _clear_resolver_caches(resolver)
+        _clear_including_resolver_caches(get_resolver(None))
+        clear_url_caches()
+        _page_app_resolvers.clear()
+        _app_resolvers_index.clear()
+        APP_RESOLVERS_GENERATION += 1
+    return True
+
+
 def get_app_patterns():
     try:
         return _get_app_patterns()
@@ -209,6 +441,8 @@ def _get_app_patterns():
     """
     from cms.models import Title
 
+    global APP_RESOLVERS_GENERATION
+
     try:
         current_site = Site.objects.get_current()
     except Site.DoesNotExist:
@@ -229,38 +463,37 @@ def _get_app_patterns():
                       .order_by('-page__path').select_related())
     # TODO: Need to be fixed for django-treebeard when forward ported to 3.1
     for title in titles:
-        path = title.path
         mix_id = "%s:%s:%s" % (
-            path + "/", title.page.application_urls, title.language)
+            title.path + "/", title.page.application_urls, title.language)
         if mix_id in included:
             # don't add the same thing twice
             continue
-        if not settings.APPEND_SLASH:
-            path += '/'
         app = apphook_pool.get_apphook(title.page.application_urls)
         if not app:
             continue
         if title.page_id not in hooked_applications:
             hooked_applications[title.page_id] = {}
         app_ns = app.app_name, title.page.application_namespace
-        with override(title.language):
-            hooked_applications[title.page_id][title.language] = (
-                app_ns, get_patterns_for_title(path, title), app)
+        hooked_applications[title.page_id][title.language] = (
+            app_ns, title.path, _get_title_app_patterns(title, app))
         included.append(mix_id)
         # Build the app patterns to be included in the cms urlconfs
     app_patterns = []
     for page_id in hooked_applications.keys():
         resolver = None
         for lang in hooked_applications[page_id].keys():
-            (app_ns, inst_ns), current_patterns, app = hooked_applications[page_id][lang]  # nopyflakes
+            (app_ns, inst_ns), path, current_patterns = hooked_applications[page_id][lang]  # nopyflakes
             if not resolver:
                 resolver = AppRegexURLResolver(
                     r'', 'app_resolver', app_name=app_ns, namespace=inst_ns)
                 resolver.page_id = page_id
-            if app.permissions:
-                _set_permissions(current_patterns, app.exclude_permissions)
-
             resolver.url_patterns_dict[lang] = current_patterns
+            resolver.path_dict[lang] = path
         app_patterns.append(resolver)
         APP_RESOLVERS.append(resolver)
+
+    with _app_resolvers_lock:
+        # The index may have been built before these resolvers were added
+        APP_RESOLVERS_GENERATION += 1
+        _app_resolvers_index.clear()
     return app_patterns
@@ -10,7 +10,7 @@ def _get_cache_version():
     Returns the current page cache version, explicitly setting one if not
     defined.
     """
-    from django.core.cache import cache
+    from cms.cache.local import cache
 
     version = cache.get(CMS_PAGE_CACHE_VERSION_KEY)
 
@@ -25,7 +25,7 @@ def _set_cache_version(version):
     """
     Set the cache version to the specified value.
     """
-    from django.core.cache import cache
+    from cms.cache.local import cache
 
     cache.set(
         CMS_PAGE_CACHE_VERSION_KEY,
@@ -13,7 +13,7 @@ def _page_cache_key(lang):
 
 
 def _clean_many(prefix):
-    from django.core.cache import cache
+    from cms.cache.local import cache
     keys = []
     if settings.USE_I18N:
         for lang in [language[0] for language in settings.LANGUAGES]:
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module collects cache invalidation intents so that they can be
+de-duplicated and executed once.
+
+A single admin action usually fires many invalidations: saving a page clears
+the menu cache and the permission cache in ``pre_save_page``, again for every
+title being re-saved, and marks each affected placeholder as dirty. Outside of
+a batch every intent is executed right away, exactly as before. Inside a batch
+(opened through ``batch()`` or ``InvalidationMiddleware``) the intents are only
+recorded and run once when the outermost batch is closed.
+
+If the outermost batch is closed while a transaction is active, the intents
+are run through ``transaction.on_commit`` so that other processes can't
+re-populate the caches with data that is about to change. On Django 1.8,
+which has no ``on_commit`` hook, they are run immediately.
+"""
+
+from contextlib import contextmanager
+from threading import local
+
+from django.db import connection, transaction
+
+from cms.utils.compat import DJANGO_1_8
+
+
+_thread_locals = local()
+
+
+class InvalidationCollector(object):
+    """
+    Holds the de-duplicated invalidation intents of a batch.
+    """
+
+    def __init__(self):
+        self.page_cache = False
+        self.permissions = False
+        self.users = {}
+        self.placeholders = {}
+        self.menus_all = False
+        self.menu_sites = set()
+        self.menu_languages = set()
+
+    def __bool__(self):
+        return bool(
+            self.page_cache
+            or self.permissions
+            or self.users
+            or self.placeholders
+            or self.menus_all
+            or self.menu_sites
+            or self.menu_languages
+        )
+
+    __nonzero__ = __bool__
+
+    def add_menu(self, site_id=None, language=None, all=False):
+        if all or (not site_id and not language):
+            self.menus_all = True
+        elif not language:
+            self.menu_sites.add(site_id)
+        else:
+            self.menu_languages.add((site_id, language))
+
+    def add_placeholder(self, placeholder, language, site_id):
+        self.placeholders[(placeholder.pk, language, site_id)] = placeholder
+
+    def add_page_cache(self):
+        self.page_cache = True
+
+    def add_permissions(self, user=None):
+        if user is None:
+            self.permissions = True
+        else:
+            self.users[user.pk] = user
+
+    def merge(self, other):
+        self.page_cache = self.page_cache or other.page_cache
+        self.permissions = self.permissions or other.permissions
+        self.users.update(other.users)
+        self.placeholders.update(other.placeholders)
+        self.menus_all = self.menus_all or other.menus_all
+        self.menu_sites |= other.menu_sites
+        self.menu_languages |= other.menu_languages
+
+    def run(self):
+        from cms.cache import invalidate_cms_page_cache
+        from cms.cache.permissions import clear_permission_cache, clear_user_permission_cache
+        from cms.cache.placeholder import clear_placeholder_cache
+        from menus.menu_pool import menu_pool
+
+        if self.permissions:
+            clear_permission_cache()
+        else:
+            for user in self.users.values():
+                clear_user_permission_cache(user)
+
+        for (pk, language, site_id), placeholder in self.placeholders.items():
+            clear_placeholder_cache(placeholder, language, site_id)
+
+        if self.page_cache:
+            invalidate_cms_page_cache()
+
+        if self.menus_all:
+            menu_pool.clear(all=True)
+        else:
+            for site_id in self.menu_sites:
+                menu_pool.clear(site_id=site_id)
+
+            for site_id, language in self.menu_languages:
+                if site_id in self.menu_sites:
+                    # Already cleared for every language of this site
+                    continue
+                menu_pool.clear(site_id=site_id, language=language)
+
+
+def _get_batches():
+    if not hasattr(_thread_locals, 'batches'):
+        _thread_locals.batches = []
+    return _thread_locals.batches
+
+
+def get_current_collector():
+    """
+    Returns the collector of the innermost open batch or None
+    if no batch is open on the current thread.
+    """
+    batches = _get_batches()
+    return batches[-1] if batches else None
+
+
+def open_batch():
+    _get_batches().append(InvalidationCollector())
+
+
+def close_batch(discard=False):
+    """
+    Closes the innermost batch. Nested batches are merged into their parent,
+    the outermost batch runs the collected invalidations.
+    """
+    batches = _get_batches()
+
+    if not batches:
+        return
+
+    collector = batches.pop()
+
+    if discard or not collector:
+        return
+
+    if batches:
+        batches[-1].merge(collector)
+    elif connection.in_atomic_block and not DJANGO_1_8:
+        transaction.on_commit(collector.run)
+    else:
+        collector.run()
+
+
+def reset_batches():
+    """
+    Throws away any open batch on the current thread.
+    """
+    _thread_locals.batches = []
+
+
+@contextmanager
+def batch():
+    """
+    Records all invalidations made inside the block and runs them
+    once, de-duplicated, when the block is left.
+    """
+    open_batch()
+    try:
+        yield
+    finally:
+        close_batch()
+
+
+def invalidate_menu(site_id=None, language=None, all=False):
+    collector = get_current_collector()
+
+    if collector is None:
+        from menus.menu_pool import menu_pool
+        menu_pool.clear(site_id=site_id, language=language, all=all)
+    else:
+        collector.add_menu(site_id=site_id, language=language, all=all)
+
+
+def invalidate_placeholder(placeholder, language, site_id):
+    collector = get_current_collector()
+
+    if collector is None:
+        from cms.cache.placeholder import clear_placeholder_cache
+        clear_placeholder_cache(placeholder, language, site_id)
+    else:
+        collector.add_placeholder(placeholder, language, site_id)
+
+
+def invalidate_page_cache():
+    collector = get_current_collector()
+
+    if collector is None:
+        from cms.cache import invalidate_cms_page_cache
+        invalidate_cms_page_cache()
+    else:
+        collector.add_page_cache()
+
+
+def invalidate_permissions(user=None):
+    collector = get_current_collector()
+
+    if collector is None:
+        from cms.cache.permissions import clear_permission_cache, clear_user_permission_cache
+
+        if user is None:
+            clear_permission_cache()
+        else:
+            clear_user_permission_cache(user)
+    else:
+        collector.add_permissions(user=user)
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+"""
+An optional process-local tier in front of the shared cache for the CMS caches
+(see ``CMS_LOCAL_CACHE``).
+
+Entries read from or written to the shared cache are kept in a bounded LRU
+for a few seconds, so that the hottest ones, such as the cache version keys
+and the menus, don't cost a round-trip to the shared cache on every lookup.
+
+Writes and deletions go to both tiers, so a process sees its own changes
+right away. The other processes see them when their local entry expires.
+Most CMS entries are stored against a version counter (see
+``cms.cache.invalidation``). Incrementing the counter invalidates the local
+entries too, at the latest once the local copy of the counter expires.
+"""
+
+import pickle
+import time
+
+from collections import OrderedDict
+from threading import Lock
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.utils import six
+
+from cms.utils.conf import get_cms_setting
+
+
+# Values which can't be changed by who reads them are stored as they are
+IMMUTABLE_TYPES = six.integer_types + six.string_types + (bytes, float, bool, type(None))
+
+_MISSING = object()
+
+
+class LocalCacheTier(object):
+    """
+    Proxies the default cache, keeping what goes through it in a
+    process-local LRU when CMS_LOCAL_CACHE['TTL'] is set.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.local_hits = 0
+        self.shared_round_trips = 0
+
+    @property
+    def shared(self):
+        from django.core.cache import cache
+        return cache
+
+    def __getattr__(self, name):
+        return getattr(self.shared, name)
+
+    def _get_ttl(self, timeout=DEFAULT_TIMEOUT):
+        ttl = get_cms_setting('LOCAL_CACHE')['TTL']
+
+        if timeout is not DEFAULT_TIMEOUT and timeout is not None:
+            ttl = min(ttl, timeout)
+        return ttl
+
+    def _get_local(self, key):
+        with self._lock:
+            try:
+                expires, value = self._entries[key]
+            except KeyError:
+                return _MISSING
+
+            if expires <= time.time():
+                del self._entries[key]
+                return _MISSING
+            # Most recently used last
+            self._entries[key] = self._entries.pop(key)
+            self.local_hits += 1
+
+        if isinstance(value, _Pickled):
+            return pickle.loads(value.data)
+        return value
+
+    def _set_local(self, key, value, timeout=DEFAULT_TIMEOUT):
+        ttl = self._get_ttl(timeout)
+
+        if ttl <= 0:
+            self._delete_local(key)
+            return
+
+        config = get_cms_setting('LOCAL_CACHE')
+
+        if not isinstance(value, IMMUTABLE_TYPES):
+            # Who reads the value may change it
+            value = _Pickled(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+            if len(value.data) > config['MAX_ENTRY_SIZE']:
+                self._delete_local(key)
+                return
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time() + ttl, value)
+
+            while len(self._entries) > config['MAX_ENTRIES']:
+                self._entries.popitem(last=False)
+
+    def _delete_local(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def is_enabled(self):
+        return get_cms_setting('LOCAL_CACHE')['TTL'] > 0
+
+    def get(self, key, default=None, version=None):
+        if not self.is_enabled():
+            self.shared_round_trips += 1
+            return self.shared.get(key, default, version=version)
+
+        local_key = self.shared.make_key(key, version=version)
+        value = self._get_local(local_key)
+
+        if value is not _MISSING:
+            return value
+
+        self.shared_round_trips += 1
+        value = self.shared.get(key, _MISSING, version=version)
+
+        if value is _MISSING:
+            return default
+        self._set_local(local_key, value)
+        return value
+
+    def get_many(self, keys, version=None):
+        if not self.is_enabled():
+            self.shared_round_trips += 1
+            return self.shared.get_many(keys, version=version)
+
+        found = {}
+        missing = []
+
+        for key in keys:
+            value = self._get_local(self.shared.make_key(key, version=version))
+
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+
+        if missing:
+            self.shared_round_trips += 1
+            values = self.shared.get_many(missing, version=version)
+
+            for key, value in values.items():
+                self._set_local(self.shared.make_key(key, version=version), value)
+            found.update(values)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared_round_trips += 1
+        self.shared.set(key, value, timeout, version=version)
+
+        if self.is_enabled():
+            self._set_local(self.shared.make_key(key, version=version), value, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared_round_trips += 1
+        self.shared.set_many(data, timeout, version=version)
+
+        if self.is_enabled():
+            for key, value in data.items():
+                self._set_local(self.shared.make_key(key, version=version), value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared_round_trips += 1
+        added = self.shared.add(key, value, timeout, version=version)
+
+        if self.is_enabled():
+            local_key = self.shared.make_key(key, version=version)
+
+            if added:
+                self._set_local(local_key, value, timeout)
+            else:
+                # Another value is stored, don't keep an outdated one
+                self._delete_local(local_key)
+        return added
+
+    def incr(self, key, delta=1, version=None):
+        self.shared_round_trips += 1
+        value = self.shared.incr(key, delta, version=version)
+
+        if self.is_enabled():
+            self._set_local(self.shared.make_key(key, version=version), value)
+        return value
+
+    def delete(self, key, version=None):
+        self.shared_round_trips += 1
+        self.shared.delete(key, version=version)
+        self._delete_local(self.shared.make_key(key, version=version))
+
+    def delete_many(self, keys, version=None):
+        self.shared_round_trips += 1
+        self.shared.delete_many(keys, version=version)
+
+        for key in keys:
+            self._delete_local(self.shared.make_key(key, version=version))
+
+    def clear(self):
+        self.shared.clear()
+        self.clear_local()
+
+    def clear_local(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class _Pickled(object):
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+
+cache = LocalCacheTier()
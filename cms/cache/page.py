@@ -1,27 +1,68 @@
 # -*- coding: utf-8 -*-
 
+import calendar
+import fnmatch
 import hashlib
+import time
+import warnings
 
 from datetime import timedelta
 
 from django.conf import settings
 from django.utils.cache import add_never_cache_headers, patch_response_headers, patch_vary_headers
 from django.utils.encoding import iri_to_uri
+from django.utils.http import http_date, quote_etag, urlencode
+from django.utils.text import compress_string
 from django.utils.timezone import now
 
 from cms.cache import _get_cache_version, _set_cache_version, _get_cache_key
-from cms.constants import EXPIRE_NOW, MAX_EXPIRATION_TTL
+from cms.cache.publication import get_publication_ttl
+from cms.constants import (EXPIRE_NOW, MAX_EXPIRATION_TTL, TEMPLATE_INHERITANCE_MAGIC,
+                           X_FRAME_OPTIONS_INHERIT)
 from cms.toolbar.utils import get_toolbar_from_request
 from cms.utils import get_cms_setting
 from cms.utils.helpers import get_timezone_name
 
 
+# How many paths the page cache statistics are kept for
+MAX_PAGE_CACHE_STATS_PATHS = 1000
+
+
+def _is_cached_query_parameter(name):
+    allowed = get_cms_setting('PAGE_CACHE_QUERY_PARAMETERS')
+
+    if allowed is not None and not any(fnmatch.fnmatchcase(name, pattern) for pattern in allowed):
+        return False
+    ignored = get_cms_setting('PAGE_CACHE_IGNORED_QUERY_PARAMETERS')
+    return not any(fnmatch.fnmatchcase(name, pattern) for pattern in ignored)
+
+
+def get_page_cache_path(request):
+    """
+    Returns the URL the page cache stores the response to the request under:
+    its scheme, host and path, followed by the query parameters which aren't
+    ignored (see CMS_PAGE_CACHE_QUERY_PARAMETERS and
+    CMS_PAGE_CACHE_IGNORED_QUERY_PARAMETERS) in sorted order.
+    """
+    parameters = [
+        (name, value)
+        for name in sorted(request.GET)
+        if _is_cached_query_parameter(name)
+        for value in request.GET.getlist(name)
+    ]
+    path = '%s://%s%s' % (request.scheme, request.get_host(), iri_to_uri(request.path))
+
+    if parameters:
+        path += '?' + urlencode(parameters)
+    return path
+
+
 def _page_cache_key(request):
     #md5 key of current path
     cache_key = "%s:%d:%s" % (
         get_cms_setting("CACHE_PREFIX"),
         settings.SITE_ID,
-        hashlib.md5(iri_to_uri(request.get_full_path()).encode('utf-8')).hexdigest()
+        hashlib.md5(get_page_cache_path(request).encode('utf-8')).hexdigest()
     )
     if settings.USE_TZ:
         cache_key += '.%s' % get_timezone_name()
@@ -29,7 +70,7 @@ def _page_cache_key(request):
 
 
 def set_page_cache(response):
-    from django.core.cache import cache
+    from cms.cache.local import cache
 
     request = response._request
     toolbar = get_toolbar_from_request(request)
@@ -68,23 +109,46 @@ def set_page_cache(response):
             get_cms_setting('CACHE_DURATIONS')['content'],
             min_placeholder_ttl
         )
+        # Don't serve the page past the moment another page goes live
+        # or expires, the menus it renders would be outdated.
+        ttl = get_publication_ttl(ttl, settings.SITE_ID, timestamp)
 
         if ttl > 0:
             # Adds expiration, etc. to headers
             patch_response_headers(response, cache_timeout=ttl)
             patch_vary_headers(response, sorted(vary_cache_on_set))
 
+            content = response.content
+            gzip_content = None
+
+            if get_cms_setting('PAGE_CACHE_GZIP') and len(content) >= 200:
+                gzip_content = compress_string(content)
+
+                if len(gzip_content) >= len(content):
+                    gzip_content = None
+                else:
+                    patch_vary_headers(response, ('Accept-Encoding',))
+
+            # Validators for conditional requests
+            etag = hashlib.md5(content).hexdigest()
+            last_modified = calendar.timegm(timestamp.utctimetuple())
+            response['ETag'] = quote_etag(etag)
+            response['Last-Modified'] = http_date(last_modified)
+
             version = _get_cache_version()
             # We also store the absolute expiration timestamp to avoid
             # recomputing it on cache-reads.
             expires_datetime = timestamp + timedelta(seconds=ttl)
             cache.set(
                 _page_cache_key(request),
-                (
-                    response.content,
-                    response._headers,
-                    expires_datetime,
-                ),
+                {
+                    'content': content,
+                    'gzip_content': gzip_content,
+                    'headers': response._headers,
+                    'expires': expires_datetime,
+                    'etag': etag,
+                    'last_modified': last_modified,
+                },
                 ttl,
                 version=version
             )
@@ -94,21 +158,229 @@ def set_page_cache(response):
 
 
 def get_page_cache(request):
+    """
+    Returns the cache entry of the page requested, a dictionary with:
+
+    * content: the rendered page
+    * gzip_content: the page compressed with gzip, or None
+    * headers: the headers of the response
+    * expires: when the entry expires
+    * etag: the hash of the content
+    * last_modified: when the page was rendered, in seconds since the epoch
+
+    Returns None if the page is not cached.
+    """
+    from cms.cache.local import cache
+
+    entry = cache.get(_page_cache_key(request), version=_get_cache_version())
+
+    if not isinstance(entry, dict):
+        # Not cached, or cached in an older format
+        entry = None
+
+    if get_cms_setting('PAGE_CACHE_STATS'):
+        record_page_cache_lookup(get_page_cache_path(request), hit=entry is not None)
+    return entry
+
+
+def _page_cache_stats_key(path, kind):
+    return '%s:page_cache_stats:%s:%s' % (
+        get_cms_setting('CACHE_PREFIX'),
+        kind,
+        hashlib.md5(path.encode('utf-8')).hexdigest(),
+    )
+
+
+def _page_cache_stats_paths_key():
+    return '%s:page_cache_stats:paths' % get_cms_setting('CACHE_PREFIX')
+
+
+def record_page_cache_lookup(path, hit):
+    """
+    Counts a page cache hit or miss for the given path, as returned by
+    get_page_cache_path(). The counters are kept until they're cleared.
+
+    The counters are shared by all processes, they're read and written
+    without the local cache tier, which would lose increments and
+    serve stale counts.
+    """
     from django.core.cache import cache
-    return cache.get(_page_cache_key(request), version=_get_cache_version())
 
+    key = _page_cache_stats_key(path, 'hits' if hit else 'misses')
 
-def get_xframe_cache(page):
+    if cache.add(key, 1, None):
+        paths_key = _page_cache_stats_paths_key()
+        paths = cache.get(paths_key) or []
+
+        if path not in paths and len(paths) < MAX_PAGE_CACHE_STATS_PATHS:
+            # Not atomic, a path may get lost when two are added at once
+            cache.set(paths_key, paths + [path], None)
+        return
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The counter has just been evicted
+        cache.set(key, 1, None)
+
+
+def get_page_cache_stats():
+    """
+    Returns the page cache hits and misses of every path counted,
+    the most requested paths first.
+    """
     from django.core.cache import cache
-    return cache.get('cms:xframe_options:%s' % page.pk)
 
+    paths = cache.get(_page_cache_stats_paths_key()) or []
+    keys = [_page_cache_stats_key(path, kind) for path in paths for kind in ('hits', 'misses')]
+    counters = cache.get_many(keys)
+    stats = []
 
-def set_xframe_cache(page, xframe_options):
+    for path in paths:
+        hits = counters.get(_page_cache_stats_key(path, 'hits'), 0)
+        misses = counters.get(_page_cache_stats_key(path, 'misses'), 0)
+        stats.append({
+            'path': path,
+            'hits': hits,
+            'misses': misses,
+            'ratio': float(hits) / (hits + misses) if hits + misses else 0.0,
+        })
+    return sorted(stats, key=lambda stat: stat['hits'] + stat['misses'], reverse=True)
+
+
+def clear_page_cache_stats():
     from django.core.cache import cache
-    cache.set('cms:xframe_options:%s' % page.pk,
-              xframe_options,
-              version=_get_cache_version())
-    _set_cache_version(_get_cache_version())
+
+    paths_key = _page_cache_stats_paths_key()
+    paths = cache.get(paths_key) or []
+    keys = [_page_cache_stats_key(path, kind) for path in paths for kind in ('hits', 'misses')]
+    cache.delete_many(keys + [paths_key])
+
+
+def get_xframe_cache(page):
+    """
+    Deprecated, use Page.get_xframe_options(). Returns the X-Frame-Options
+    of «page» if what it inherits is cached, None otherwise.
+    """
+    warnings.warn('get_xframe_cache() is deprecated, and it will be removed in version 3.5; '
+                  'please use Page.get_xframe_options() instead.', DeprecationWarning)
+
+    if page.xframe_options and page.xframe_options != X_FRAME_OPTIONS_INHERIT:
+        return page.xframe_options
+
+    inherited, version = get_page_inheritance_cache(page)
+
+    if inherited is None:
+        return None
+    return inherited[1]
+
+
+def set_xframe_cache(page, xframe_options):
+    """
+    Deprecated, does nothing. What pages inherit is cached
+    by Page.get_xframe_options().
+    """
+    warnings.warn('set_xframe_cache() is deprecated, and it will be removed in version 3.5; '
+                  'the X-Frame-Options of pages are cached by Page.get_xframe_options().',
+                  DeprecationWarning)
+
+
+def _page_inheritance_version_key(site_id):
+    return '%s:page_inheritance_version:%s' % (get_cms_setting('CACHE_PREFIX'), site_id)
+
+
+def _page_inheritance_key(site_id, page_id):
+    return '%s:page_inheritance:%s:%s' % (get_cms_setting('CACHE_PREFIX'), site_id, page_id)
+
+
+def get_page_inheritance_cache(page):
+    """
+    Returns the (template, xframe_options) pair «page» inherits from its
+    ancestors, or None if it's not cached, along with the version of the
+    cached inheritance of its site (None if there is none).
+
+    The template is the one of the nearest ancestor that doesn't inherit
+    its template, the X-Frame-Options those of the nearest ancestor that
+    doesn't inherit them. Either is None if there is no such ancestor.
+    """
+    from cms.cache.local import cache
+
+    version_key = _page_inheritance_version_key(page.site_id)
+    key = _page_inheritance_key(page.site_id, page.pk)
+    cached = cache.get_many([version_key, key])
+    version = cached.get(version_key)
+
+    if key in cached and cached[key][0] == version:
+        return cached[key][1:], version
+    return None, version
+
+
+def set_page_inheritance_cache(page, inherited, version):
+    """
+    Caches what a single page inherits, under the given version of the
+    cached inheritance of its site.
+    """
+    from cms.cache.local import cache
+
+    # Kept until the version changes
+    cache.set(_page_inheritance_key(page.site_id, page.pk), (version,) + tuple(inherited), None)
+
+
+def update_page_inheritance_cache(site_id):
+    """
+    Computes what every page of the given site inherits from its ancestors
+    in a single pass over the page tree and caches it.
+    Returns a dictionary mapping page ids to (template, xframe_options).
+    """
+    from cms.cache.local import cache
+    from cms.models import Page
+
+    pages = (
+        Page
+        .objects
+        .filter(site=site_id)
+        .order_by('path')
+        .values_list('pk', 'path', 'template', 'xframe_options')
+    )
+
+    inheritance = {}
+    # (path, template, xframe_options) of the ancestors of the current page,
+    # as passed on to their children.
+    ancestors = []
+
+    for page_id, path, template, xframe_options in pages:
+        while ancestors and not path.startswith(ancestors[-1][0]):
+            ancestors.pop()
+
+        if ancestors:
+            inherited = ancestors[-1][1:]
+        else:
+            inherited = (None, None)
+        inheritance[page_id] = inherited
+
+        if template == TEMPLATE_INHERITANCE_MAGIC:
+            template = inherited[0]
+
+        if xframe_options == X_FRAME_OPTIONS_INHERIT:
+            xframe_options = inherited[1]
+        ancestors.append((path, template, xframe_options))
+
+    version = int(time.time() * 1000000)
+    entries = dict(
+        (_page_inheritance_key(site_id, page_id), (version,) + inherited)
+        for page_id, inherited in inheritance.items()
+    )
+    # Kept until a page changes what its descendants inherit, which drops
+    # the version
+    cache.set_many(entries, None)
+    cache.set(_page_inheritance_version_key(site_id), version, None)
+    return inheritance
+
+
+def clear_page_inheritance_cache(site_id):
+    from cms.cache.local import cache
+
+    cache.delete(_page_inheritance_version_key(site_id))
 
 
 def _page_url_key(page_lookup, lang, site_id):
@@ -116,14 +388,70 @@ def _page_url_key(page_lookup, lang, site_id):
 
 
 def set_page_url_cache(page_lookup, lang, site_id, url):
-    from django.core.cache import cache
+    from cms.cache.local import cache
+    duration = get_publication_ttl(get_cms_setting('CACHE_DURATIONS')['content'], site_id)
     cache.set(_page_url_key(page_lookup, lang, site_id),
               url,
-              get_cms_setting('CACHE_DURATIONS')['content'], version=_get_cache_version())
+              duration, version=_get_cache_version())
     _set_cache_version(_get_cache_version())
 
 
 def get_page_url_cache(page_lookup, lang, site_id):
-    from django.core.cache import cache
+    from cms.cache.local import cache
     return cache.get(_page_url_key(page_lookup, lang, site_id),
                      version=_get_cache_version())
+
+
+def _app_page_key(page_id):
+    return '%s:app_page:%s' % (get_cms_setting('CACHE_PREFIX'), page_id)
+
+
+def get_app_page_cache(page_id):
+    """
+    Returns the public page an apphook is attached to, or None if it's not
+    cached. The page is stored against the page cache version, so publishing
+    or unpublishing any page invalidates it.
+    """
+    from cms.cache.local import cache
+    return cache.get(_app_page_key(page_id), version=_get_cache_version())
+
+
+def set_app_page_cache(page):
+    from cms.cache.local import cache
+
+    duration = get_publication_ttl(get_cms_setting('CACHE_DURATIONS')['content'], page.site_id)
+
+    if duration <= 0:
+        return
+
+    version = _get_cache_version()
+    cache.set(_app_page_key(page.pk), page, duration, version=version)
+    # See note in invalidate_cms_page_cache()
+    _set_cache_version(version)
+
+
+def _page_render_profile_key(page_id):
+    return '%s:page_render_profile:%s' % (get_cms_setting('CACHE_PREFIX'), page_id)
+
+
+def get_page_render_profile_cache(page_id):
+    """
+    Returns the render profile of the given public page, or None if it's
+    not cached. See cms.utils.page.get_page_render_profile().
+    """
+    from cms.cache.local import cache
+    return cache.get(_page_render_profile_key(page_id), version=_get_cache_version())
+
+
+def set_page_render_profile_cache(page, profile):
+    from cms.cache.local import cache
+
+    duration = get_publication_ttl(get_cms_setting('CACHE_DURATIONS')['content'], page.site_id)
+
+    if duration <= 0:
+        return
+
+    version = _get_cache_version()
+    cache.set(_page_render_profile_key(page.pk), profile, duration, version=version)
+    # See note in invalidate_cms_page_cache()
+    _set_cache_version(version)
@@ -22,7 +22,7 @@ def get_cache_permission_version_key():
 
 
 def get_cache_permission_version():
-    from django.core.cache import cache
+    from cms.cache.local import cache
     try:
         version = int(cache.get(get_cache_permission_version_key()))
     except Exception:
@@ -34,7 +34,7 @@ def get_permission_cache(user, key):
     """
     Helper for reading values from cache
     """
-    from django.core.cache import cache
+    from cms.cache.local import cache
     return cache.get(get_cache_key(user, key), version=get_cache_permission_version())
 
 
@@ -43,7 +43,7 @@ def set_permission_cache(user, key, value):
     Helper method for storing values in cache. Stores used keys so
     all of them can be cleaned when clean_permission_cache gets called.
     """
-    from django.core.cache import cache
+    from cms.cache.local import cache
     # store this key, so we can clean it when required
     cache_key = get_cache_key(user, key)
     cache.set(cache_key, value,
@@ -55,13 +55,13 @@ def clear_user_permission_cache(user):
     """
     Cleans permission cache for given user.
     """
-    from django.core.cache import cache
+    from cms.cache.local import cache
     for key in PERMISSION_KEYS:
         cache.delete(get_cache_key(user, key), version=get_cache_permission_version())
 
 
 def clear_permission_cache():
-    from django.core.cache import cache
+    from cms.cache.local import cache
     version = get_cache_permission_version()
     if version > 1:
         cache.incr(get_cache_permission_version_key())
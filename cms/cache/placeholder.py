@@ -24,6 +24,7 @@ import time
 
 from django.utils.timezone import now
 
+from cms.cache.publication import get_publication_ttl
 from cms.utils import get_cms_setting
 from cms.utils.helpers import get_header_name, get_timezone_name
 
@@ -57,7 +58,7 @@ def _get_placeholder_cache_version(placeholder, lang, site_id):
     Gets the (placeholder x lang)'s current version and vary-on header-names
     list, if present, otherwise resets to («timestamp», []).
     """
-    from django.core.cache import cache
+    from cms.cache.local import cache
 
     key = _get_placeholder_cache_version_key(placeholder, lang, site_id)
     cached = cache.get(key)
@@ -74,7 +75,7 @@ def _set_placeholder_cache_version(placeholder, lang, site_id, version, vary_on_
     """
     Sets the (placeholder x lang)'s version and vary-on header-names list.
     """
-    from django.core.cache import cache
+    from cms.cache.local import cache
 
     key = _get_placeholder_cache_version_key(placeholder, lang, site_id)
 
@@ -141,14 +142,16 @@ def set_placeholder_cache(placeholder, lang, site_id, content, request):
     """
     Sets the (correct) placeholder cache with the rendered placeholder.
     """
-    from django.core.cache import cache
+    from cms.cache.local import cache
 
     key = _get_placeholder_cache_key(placeholder, lang, site_id, request)
 
+    timestamp = now()
     duration = min(
       get_cms_setting('CACHE_DURATIONS')['content'],
-      placeholder.get_cache_expiration(request, now())
+      placeholder.get_cache_expiration(request, timestamp)
     )
+    duration = get_publication_ttl(duration, site_id, timestamp)
     cache.set(key, content, duration)
     # "touch" the cache-version, so that it stays as fresh as this content.
     version, vary_on_list = _get_placeholder_cache_version(placeholder, lang, site_id)
@@ -161,7 +164,7 @@ def get_placeholder_cache(placeholder, lang, site_id, request):
     Returns the placeholder from cache respecting the placeholder's
     VARY headers.
     """
-    from django.core.cache import cache
+    from cms.cache.local import cache
 
     key = _get_placeholder_cache_key(placeholder, lang, site_id, request, soft=True)
     content = cache.get(key)
@@ -176,3 +179,136 @@ def clear_placeholder_cache(placeholder, lang, site_id):
     """
     version = int(time.time() * 1000000)
     _set_placeholder_cache_version(placeholder, lang, site_id, version, [])
+
+
+def _get_page_placeholders_key(page_id):
+    prefix = get_cms_setting('CACHE_PREFIX')
+    return '{prefix}|page_placeholders|id:{id}'.format(prefix=prefix, id=page_id)
+
+
+def get_page_placeholders_cache(page):
+    """
+    Returns the («template», {slot: placeholder id}) pair cached for «page»
+    or None if nothing is cached.
+    """
+    from cms.cache.local import cache
+
+    return cache.get(_get_page_placeholders_key(page.pk))
+
+
+def set_page_placeholders_cache(page, template, placeholder_ids):
+    """
+    Caches the placeholder ids of «page» by slot, along with the «template»
+    they were resolved from.
+    """
+    from cms.cache.local import cache
+
+    duration = get_cms_setting('CACHE_DURATIONS')['content']
+    cache.set(_get_page_placeholders_key(page.pk), (template, placeholder_ids), duration)
+
+
+def clear_page_placeholders_cache(page_id):
+    from cms.cache.local import cache
+
+    cache.delete(_get_page_placeholders_key(page_id))
+
+
+def _get_inherited_placeholders_version_key(page_id=None):
+    """
+    Returns the key of the version of the whole inherited placeholder index,
+    or of the content of the placeholders of the given page.
+    """
+    prefix = get_cms_setting('CACHE_PREFIX')
+
+    if page_id is None:
+        return '{prefix}|inherited_placeholders_version'.format(prefix=prefix)
+    return '{prefix}|inherited_placeholders_version|page:{page}'.format(prefix=prefix, page=page_id)
+
+
+def _get_inherited_placeholders_key(page_id, slot, lang):
+    prefix = get_cms_setting('CACHE_PREFIX')
+    key = '{prefix}|inherited_placeholders|page:{page}|slot:{slot}|lang:{lang}'.format(
+        prefix=prefix,
+        page=page_id,
+        slot=slot,
+        lang=lang,
+    )
+    if len(key) > 250:
+        key = '{prefix}|{hash}'.format(
+            prefix=prefix,
+            hash=hashlib.md5(key.encode('utf-8')).hexdigest(),
+        )
+    return key
+
+
+def _new_inherited_placeholders_version():
+    return int(time.time() * 1000000)
+
+
+def get_inherited_placeholders_cache(page, ancestors, slot, lang):
+    """
+    Returns a (sources, versions) tuple. «sources» is the
+    [(page id, placeholder id), ...] list of the «ancestors» of «page» whose
+    «slot» placeholder has content in «lang», nearest first, or None if the
+    index has no (current) entry for it. «versions» must be passed on to
+    set_inherited_placeholders_cache() when storing the sources computed
+    after a miss.
+
+    An entry is current as long as neither the whole index nor the content
+    of any of the ancestors was invalidated. The entry and the versions are
+    fetched in a single round trip.
+    """
+    from cms.cache.local import cache
+
+    version_keys = [_get_inherited_placeholders_version_key()]
+    version_keys.extend(_get_inherited_placeholders_version_key(ancestor.pk) for ancestor in ancestors)
+    key = _get_inherited_placeholders_key(page.pk, slot, lang)
+    cached = cache.get_many(version_keys + [key])
+    missing = dict(
+        (version_key, _new_inherited_placeholders_version())
+        for version_key in version_keys if version_key not in cached
+    )
+
+    if missing:
+        # Versions are never missing from entries, an evicted
+        # version can't be mistaken for an unchanged one.
+        cache.set_many(missing, None)
+        cached.update(missing)
+
+    versions = tuple(cached[version_key] for version_key in version_keys)
+
+    if key in cached and cached[key][0] == versions:
+        return cached[key][1], versions
+    return None, versions
+
+
+def set_inherited_placeholders_cache(page, slot, lang, sources, versions):
+    """
+    Stores the «sources» of the inherited «slot» placeholder of «page» in
+    «lang» under the «versions» returned by get_inherited_placeholders_cache()
+    before they were computed, so that an invalidation in between isn't lost.
+    """
+    from cms.cache.local import cache
+
+    duration = get_cms_setting('CACHE_DURATIONS')['content']
+    key = _get_inherited_placeholders_key(page.pk, slot, lang)
+    cache.set(key, (versions, sources), duration)
+
+
+def clear_inherited_placeholders_cache(page_ids=None):
+    """
+    Invalidates the entries of the descendants of the given pages, after
+    the content of their placeholders changed, or the whole inherited
+    placeholder index if None. Entries are rebuilt lazily, one
+    (page x slot x lang) at a time.
+    """
+    from cms.cache.local import cache
+
+    if page_ids is None:
+        page_ids = [None]
+
+    version = _new_inherited_placeholders_version()
+    cache.set_many(
+        dict((_get_inherited_placeholders_version_key(page_id), version) for page_id in page_ids),
+        None,
+    )
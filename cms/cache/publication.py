@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+"""
+Keeps cached content in line with the publication window of pages.
+
+Public pages with a ``publication_date`` or ``publication_end_date`` in the
+future will appear or disappear at that moment without any write to the
+database, so nothing invalidates the caches. Cache entries written by the
+CMS are therefore never allowed to outlive the next publication boundary of
+the site, and ``sweep_publication_windows`` can be run periodically (see
+``cms publication-sweep``) to invalidate the affected caches as soon as a
+window opens or closes.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Case, Min, Q, When
+from django.utils.timezone import now
+
+from cms.utils import get_cms_setting
+
+
+def _publication_boundary_key(site_id):
+    return '%spublication_boundary:%s' % (get_cms_setting('CACHE_PREFIX'), site_id)
+
+
+def _publication_sweep_key():
+    return '%spublication_sweep' % get_cms_setting('CACHE_PREFIX')
+
+
+def get_next_publication_boundary(site_id, timestamp=None):
+    """
+    Returns the next point in time after timestamp at which a public page
+    of the given site goes live or expires, or None if there is none.
+    """
+    from cms.cache.local import cache
+
+    if timestamp is None:
+        timestamp = now()
+
+    cached = cache.get(_publication_boundary_key(site_id))
+
+    # The cached value is a one-item tuple so that "no boundary"
+    # can be told apart from a cache miss.
+    if cached is not None and (cached[0] is None or cached[0] > timestamp):
+        return cached[0]
+    return update_publication_boundary(site_id, timestamp)
+
+
+def update_publication_boundary(site_id, timestamp=None):
+    """
+    Looks up the next publication boundary of the given site and caches it.
+    Called whenever a page is published or unpublished and on every sweep,
+    so that rendering doesn't have to.
+    """
+    from cms.cache.local import cache
+    from cms.models import Page
+
+    if timestamp is None:
+        timestamp = now()
+
+    dates = (
+        Page.objects
+        .public()
+        .filter(site=site_id)
+        .aggregate(
+            start=Min(Case(When(publication_date__gt=timestamp, then='publication_date'))),
+            end=Min(Case(When(publication_end_date__gt=timestamp, then='publication_end_date'))),
+        )
+    )
+    boundaries = [date for date in dates.values() if date]
+    boundary = min(boundaries) if boundaries else None
+    # The boundary only changes when pages are published or unpublished,
+    # which updates it, or once it has passed, which is checked on read.
+    cache.set(_publication_boundary_key(site_id), (boundary,), None)
+    return boundary
+
+
+def _seconds_until(boundary, timestamp):
+    delta = boundary - timestamp
+    # Rounded up so that the entry expires after the boundary, not before it
+    return int(delta.total_seconds()) + 1
+
+
+def get_publication_ttl(ttl, site_id, timestamp=None):
+    """
+    Returns ttl capped at the number of seconds until the
+    next publication boundary of the given site.
+    """
+    if timestamp is None:
+        timestamp = now()
+
+    boundary = get_next_publication_boundary(site_id, timestamp)
+
+    if boundary is None:
+        return ttl
+    return min(ttl, _seconds_until(boundary, timestamp))
+
+
+def sweep_publication_windows(until=None):
+    """
+    Invalidates the menu, page and page url caches of every site that has
+    a page which went live or expired since the last sweep.
+    Returns the ids of the affected sites.
+    """
+    from cms.cache.local import cache
+    from cms.cache.invalidation import invalidate_menu, invalidate_page_cache
+    from cms.models import Page
+
+    if until is None:
+        until = now()
+
+    durations = get_cms_setting('CACHE_DURATIONS')
+    max_duration = max(durations['content'], durations['menus'])
+    since = cache.get(_publication_sweep_key())
+
+    if since is None:
+        # Nothing cached before this can still be around
+        since = until - timedelta(seconds=max_duration)
+
+    site_ids = set(
+        Page.objects
+        .public()
+        .filter(
+            Q(publication_date__gt=since, publication_date__lte=until)
+            | Q(publication_end_date__gt=since, publication_end_date__lte=until)
+        )
+        .values_list('site', flat=True)
+    )
+
+    for site_id in site_ids:
+        invalidate_menu(site_id=site_id)
+
+    if site_ids:
+        # Page url entries are stored against the page cache version too
+        invalidate_page_cache()
+
+    public_site_ids = (
+        Page.objects
+        .public()
+        .order_by()
+        .values_list('site', flat=True)
+        .distinct()
+    )
+
+    for site_id in public_site_ids:
+        update_publication_boundary(site_id, until)
+
+    cache.set(_publication_sweep_key(), until, max_duration)
+    return site_ids
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""
+Rendered url entries of the CMS sitemaps, per sitemap class and options,
+site, sitemap page, protocol and domain. The entries are stored against the page cache version,
+so publishing or unpublishing a page (which invalidates the page cache)
+invalidates them as well.
+"""
+
+from django.utils.timezone import now
+
+from cms.cache import _get_cache_version, _set_cache_version, _clean_key
+from cms.cache.publication import get_publication_ttl
+from cms.utils import get_cms_setting
+
+
+# What the sitemap template shows of each url. The title of the
+# url entries isn't cached, it would take most of the space.
+SITEMAP_URL_FIELDS = ('location', 'lastmod', 'changefreq', 'priority')
+
+
+def _get_sitemap_key(sitemap, site_id, page, protocol, domain):
+    # Subclasses may list other items, and the limit and i18n
+    # options (the latter from Django 2.0) change the pages.
+    sitemap_class = type(sitemap)
+    return '%s:sitemap:%s.%s:%s:%s:%s:%s:%s:%s:%s' % (
+        get_cms_setting('CACHE_PREFIX'),
+        sitemap_class.__module__,
+        sitemap_class.__name__,
+        sitemap.limit,
+        int(bool(getattr(sitemap, 'i18n', False))),
+        site_id,
+        sitemap.language or '',
+        page,
+        protocol,
+        _clean_key(domain),
+    )
+
+
+def get_sitemap_cache(sitemap, site_id, page, protocol, domain):
+    """
+    Returns the (urls, latest_lastmod) pair of the given page of the
+    sitemap, or None if it's not cached. The urls only have the
+    SITEMAP_URL_FIELDS.
+    """
+    from cms.cache.local import cache
+
+    key = _get_sitemap_key(sitemap, site_id, page, protocol, domain)
+    return cache.get(key, version=_get_cache_version())
+
+
+def set_sitemap_cache(sitemap, site_id, page, protocol, domain, urls, latest_lastmod):
+    from cms.cache.local import cache
+
+    # The sitemap lists pages that go live or expire, don't keep it
+    # past the next publication boundary.
+    ttl = get_publication_ttl(get_cms_setting('CACHE_DURATIONS')['content'], site_id, now())
+
+    if ttl <= 0:
+        return
+
+    version = _get_cache_version()
+    key = _get_sitemap_key(sitemap, site_id, page, protocol, domain)
+    urls = [
+        dict((name, url[name]) for name in SITEMAP_URL_FIELDS if name in url)
+        for url in urls
+    ]
+    cache.set(key, (urls, latest_lastmod), ttl, version=version)
+    # See note in invalidate_cms_page_cache()
+    _set_cache_version(version)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+"""
+Per-user data the toolbar reads on every request of a staff user: the
+primary key of the latest admin log entry of the user and their
+UserSettings. Both are kept up to date by signal handlers whenever log
+entries or user settings are saved.
+"""
+
+from cms.utils import get_cms_setting
+
+
+def _get_latest_log_entry_key(user_id):
+    return '%s:toolbar:latest_log_entry:%s' % (get_cms_setting('CACHE_PREFIX'), user_id)
+
+
+def _get_user_settings_key(user_id):
+    return '%s:toolbar:user_settings:%s' % (get_cms_setting('CACHE_PREFIX'), user_id)
+
+
+def _get_duration():
+    return get_cms_setting('CACHE_DURATIONS')['permissions']
+
+
+def get_latest_log_entry(user):
+    """
+    Returns the primary key of the latest addition or change logged
+    by the given user, or -1 if there is none.
+    """
+    from django.contrib.admin.models import LogEntry, ADDITION, CHANGE
+    from cms.cache.local import cache
+
+    entry_id = cache.get(_get_latest_log_entry_key(user.pk))
+
+    if entry_id is None:
+        try:
+            entry_id = LogEntry.objects.filter(
+                user=user,
+                action_flag__in=(ADDITION, CHANGE)
+            ).only('pk').order_by('-pk')[0].pk
+        except IndexError:
+            entry_id = -1
+        set_latest_log_entry(user.pk, entry_id)
+    return entry_id
+
+
+def set_latest_log_entry(user_id, entry_id):
+    from cms.cache.local import cache
+
+    cache.set(_get_latest_log_entry_key(user_id), entry_id, _get_duration())
+
+
+def get_user_settings_cache(user):
+    """
+    Returns the UserSettings of the given user, with its clipboard,
+    or None if they are not cached.
+    """
+    from cms.cache.local import cache
+
+    return cache.get(_get_user_settings_key(user.pk))
+
+
+def set_user_settings_cache(user_settings):
+    from cms.cache.local import cache
+
+    cache.set(_get_user_settings_key(user_settings.user_id), user_settings, _get_duration())
+
+
+def clear_user_settings_cache(user_id):
+    from cms.cache.local import cache
+
+    cache.delete(_get_user_settings_key(user_id))
@@ -10,7 +10,8 @@ from cms.utils.conf import get_cms_setting
 from cms.utils.helpers import current_site
 from cms.utils.i18n import get_fallback_languages, hide_untranslated
 from cms.utils.page_resolver import get_page_queryset
-from cms.utils.moderator import get_title_queryset, use_draft
+from cms.utils.moderator import use_draft
+from cms.utils.page import prefetch_titles
 from menus.base import Menu, NavigationNode, Modifier
 from menus.menu_pool import menu_pool
 
@@ -178,7 +179,6 @@ class CMSMenu(Menu):
         if not use_draft(request):
             page_queryset = page_queryset.published()
         pages = page_queryset.filter(**filters).order_by("path")
-        ids = {}
         nodes = []
         first = True
         home_cut = False
@@ -204,19 +204,14 @@ class CMSMenu(Menu):
             if ((page.pk == home.pk and home.in_navigation)
                     or page.pk != home.pk):
                 first = False
-            ids[page.id] = page
             actual_pages.append(page)
-            page.title_cache = {}
 
         langs = [lang]
         if not hide_untranslated(lang):
             langs.extend(get_fallback_languages(lang))
 
-        titles = list(get_title_queryset(request).filter(
-            page__in=ids, language__in=langs))
-        for title in titles:  # add the title and slugs and some meta data
-            page = ids[title.page_id]
-            page.title_cache[title.language] = title
+        # add the title and slugs and some meta data
+        prefetch_titles(actual_pages, langs)
 
         renderer = self.renderer
 
@@ -9,9 +9,14 @@ from .subcommands.base import SubcommandsCommand
 from .subcommands.check import CheckInstallation
 from .subcommands.list import ListCommand
 from .subcommands.moderator import ModeratorCommand
+from .subcommands.page_cache_stats import PageCacheStatsCommand
+from .subcommands.publication_sweep import PublicationSweepCommand
 from .subcommands.publisher_publish import PublishCommand
+from .subcommands.render_profile import RenderProfileCommand
+from .subcommands.search_index import RebuildSearchIndexCommand
 from .subcommands.tree import FixTreeCommand
 from .subcommands.uninstall import UninstallCommand
+from .subcommands.warmup import WarmupCommand
 from .subcommands.copy import CopyCommand
 from .subcommands.delete_orphaned_plugins import DeleteOrphanedPluginsCommand
 
@@ -25,8 +30,13 @@ class Command(SubcommandsCommand):
         ('fix-tree', FixTreeCommand),
         ('list', ListCommand),
         ('moderator', ModeratorCommand),
+        ('page-cache-stats', PageCacheStatsCommand),
+        ('publication-sweep', PublicationSweepCommand),
         ('publisher-publish', PublishCommand),
+        ('rebuild-search-index', RebuildSearchIndexCommand),
+        ('render-profile', RenderProfileCommand),
         ('uninstall', UninstallCommand),
+        ('warmup', WarmupCommand),
     ))
     missing_args_message = 'one of the available sub commands must be provided'
 
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, print_function, unicode_literals
+
+from cms.cache.page import clear_page_cache_stats, get_page_cache_stats
+
+from .base import SubcommandsCommand
+
+
+class PageCacheStatsCommand(SubcommandsCommand):
+    help_string = 'List the page cache hits and misses per path counted with CMS_PAGE_CACHE_STATS'
+    command_name = 'page-cache-stats'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', action='store', dest='limit', type=int, default=20,
+                            help='Number of paths to list')
+        parser.add_argument('--clear', action='store_true', dest='clear', default=False,
+                            help='Reset the counters')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            clear_page_cache_stats()
+            self.stdout.write('Page cache statistics cleared\n')
+            return
+
+        stats = get_page_cache_stats()[:options['limit']]
+
+        if not stats:
+            self.stdout.write('No page cache lookup has been counted\n')
+            return
+
+        self.stdout.write('%10s %10s %8s  %s\n' % ('hits', 'misses', 'ratio', 'path'))
+
+        for stat in stats:
+            self.stdout.write('%10d %10d %7.1f%%  %s\n' % (
+                stat['hits'],
+                stat['misses'],
+                stat['ratio'] * 100,
+                stat['path'],
+            ))
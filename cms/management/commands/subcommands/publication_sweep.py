@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, print_function, unicode_literals
+
+from cms.cache.publication import sweep_publication_windows
+
+from .base import SubcommandsCommand
+
+
+class PublicationSweepCommand(SubcommandsCommand):
+    help_string = ('Invalidate the caches of sites with pages that went live or expired '
+                   'since the last run. Meant to be run periodically, e.g. from cron')
+    command_name = 'publication-sweep'
+
+    def handle(self, *args, **options):
+        site_ids = sweep_publication_windows()
+
+        if site_ids:
+            self.stdout.write('Invalidated caches for sites: %s\n' % ', '.join(str(pk) for pk in sorted(site_ids)))
+        else:
+            self.stdout.write('No publication window changed\n')
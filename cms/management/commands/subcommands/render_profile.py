@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, print_function, unicode_literals
+
+import io
+
+from cms.utils.profiling import summarize_plugin_types
+
+from .base import SubcommandsCommand
+
+
+class RenderProfileCommand(SubcommandsCommand):
+    help_string = ('Summarize the slowest plugin types of the render profiles logged '
+                   'by RenderProfilingMiddleware')
+    command_name = 'render-profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('logs', nargs='+', help='Log files of the cms.profiling logger')
+        parser.add_argument('--limit', action='store', dest='limit', type=int, default=10,
+                            help='Number of plugin types to list')
+
+    def handle(self, *args, **options):
+        summaries = summarize_plugin_types(_read_lines(options['logs']))[:options['limit']]
+
+        if not summaries:
+            self.stdout.write('No plugin has been profiled\n')
+            return
+
+        self.stdout.write('%-30s %8s %12s %10s %10s %10s %12s\n' % (
+            'plugin type', 'count', 'total ms', 'mean ms', 'max ms', 'queries', 'bytes'))
+
+        for summary in summaries:
+            self.stdout.write('%-30s %8d %12.1f %10.1f %10.1f %10d %12d\n' % (
+                summary['plugin_type'],
+                summary['count'],
+                summary['time'],
+                summary['time'] / summary['count'],
+                summary['max_time'],
+                summary['queries'],
+                summary['bytes'],
+            ))
+
+
+def _read_lines(paths):
+    for path in paths:
+        with io.open(path, encoding='utf-8', errors='replace') as log:
+            for line in log:
+                yield line
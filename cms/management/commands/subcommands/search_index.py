@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, print_function, unicode_literals
+
+from cms.search import rebuild_index
+
+from .base import SubcommandsCommand
+
+
+class RebuildSearchIndexCommand(SubcommandsCommand):
+    help_string = 'Rebuild the search index of the published pages'
+    command_name = 'rebuild-search-index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--site', action='store', dest='site', type=int, default=None,
+                            help='Only rebuild the index of the pages of this site')
+
+    def handle(self, *args, **options):
+        count = rebuild_index(site=options.get('site'))
+        self.stdout.write('%d search documents indexed\n' % count)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, print_function, unicode_literals
+
+import time
+
+from django.core.management.base import CommandError
+
+from cms.utils.warmup import get_warmup_urls, warm_up
+
+from .base import SubcommandsCommand
+
+
+class WarmupCommand(SubcommandsCommand):
+    help_string = 'Render the published pages of the current site to fill the CMS caches'
+    command_name = 'warmup'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-l', '--language', action='append', dest='languages',
+                            help='Language code of the pages to render, can be repeated')
+        parser.add_argument('--workers', action='store', dest='workers', type=int, default=1,
+                            help='Number of threads rendering pages')
+        parser.add_argument('--rate', action='store', dest='rate', type=float, default=0,
+                            help='Maximum number of pages rendered per second, 0 for no limit')
+        parser.add_argument('--host', action='store', dest='host',
+                            help='Host the pages are requested for, the domain of the current site by default')
+        parser.add_argument('--secure', action='store_true', dest='secure', default=False,
+                            help='Request the pages over HTTPS, as the visitors of the site do')
+        parser.add_argument('--limit', action='store', dest='limit', type=int, default=None,
+                            help='Maximum number of pages to render')
+        parser.add_argument('--slowest', action='store', dest='slowest', type=int, default=5,
+                            help='Number of the slowest pages to list')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError('--workers must be at least 1.')
+
+        if options['rate'] < 0:
+            raise CommandError('--rate can\'t be negative.')
+
+        urls = get_warmup_urls(options['languages'])
+
+        if options['limit'] is not None:
+            urls = urls[:options['limit']]
+
+        if not urls:
+            self.stdout.write('No published page to render\n')
+            return
+
+        verbosity = options.get('verbosity', 1)
+
+        def report(result):
+            if result['error']:
+                self.stdout.write('FAILED  %s [%s]: %s\n' % (result['url'], result['language'], result['error']))
+            elif verbosity > 1:
+                self.stdout.write('%7.1f ms  %s [%s]\n' % (result['time'], result['url'], result['language']))
+
+        start = time.time()
+        results = warm_up(
+            urls,
+            workers=options['workers'],
+            rate=options['rate'],
+            host=options['host'],
+            secure=options['secure'],
+            callback=report,
+        )
+        elapsed = time.time() - start
+        times = [result['time'] for result in results]
+        failures = sum(1 for result in results if result['error'])
+
+        self.stdout.write('\n')
+        self.stdout.write('=' * 40)
+        self.stdout.write('\nRendered: %d\n' % (len(results) - failures))
+        self.stdout.write('Failed:   %d\n' % failures)
+        self.stdout.write('Total:    %.1f s\n' % elapsed)
+        self.stdout.write('Mean:     %.1f ms\n' % (sum(times) / len(times)))
+        self.stdout.write('Max:      %.1f ms\n' % max(times))
+
+        slowest = sorted(results, key=lambda result: result['time'], reverse=True)[:options['slowest']]
+
+        if slowest:
+            self.stdout.write('\nSlowest pages:\n')
+
+        for result in slowest:
+            self.stdout.write('%7.1f ms  %s [%s]\n' % (result['time'], result['url'], result['language']))
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+from cms.cache import invalidation
+
+
+class InvalidationMiddleware(object):
+    """
+    Collects the cache invalidations made during a request and
+    runs them once, de-duplicated, when the response is returned.
+    """
+    def process_request(self, request):
+        # A batch could be left open on this thread if a previous
+        # request never reached process_response.
+        invalidation.reset_batches()
+        invalidation.open_batch()
+
+    def process_response(self, request, response):
+        # Also called with the error response of a failed request,
+        # which may have changed data before failing: the batch is
+        # only ever closed here.
+        invalidation.close_batch()
+        return response
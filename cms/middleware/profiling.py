@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from cms.utils import profiling
+
+
+class RenderProfilingMiddleware(object):
+    """
+    Profiles the rendering of placeholders and plugins of a sample of the
+    requests and reports it through the render_profiled signal, the
+    cms.profiling logger and, for staff users, the X-CMS-Render-Profile
+    response header.
+    """
+    def process_request(self, request):
+        profiling.start_profiling(request)
+
+    def process_response(self, request, response):
+        from cms.signals import render_profiled
+
+        profiler = profiling.stop_profiling(request)
+
+        if profiler is None or not profiler.records:
+            # Not sampled or nothing has been rendered,
+            # e.g. the response came from the page cache.
+            return response
+
+        report = profiler.get_report(request)
+        render_profiled.send(sender=self.__class__, request=request, report=report)
+        profiling.log_report(report)
+
+        user = getattr(request, 'user', None)
+
+        if user is not None and user.is_staff:
+            response[profiling.PROFILE_HEADER] = profiling.get_report_summary(report)
+        return response
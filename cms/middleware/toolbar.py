@@ -2,11 +2,11 @@
 """
 Edit Toolbar middleware
 """
-from django.contrib.admin.models import LogEntry, ADDITION, CHANGE
 from django.core.urlresolvers import resolve
 from django.http import HttpResponse
 
-from cms.toolbar.toolbar import CMSToolbar
+from cms.cache.toolbar import get_latest_log_entry
+from cms.toolbar.toolbar import CMSToolbar, InertToolbar
 from cms.toolbar.utils import get_toolbar_from_request
 from cms.utils.conf import get_cms_setting
 from cms.utils.request_ip_resolvers import get_request_ip_resolver
@@ -21,6 +21,12 @@ class ToolbarMiddleware(object):
     """
 
     def is_cms_request(self, request):
+        # Called for the request, the view and the response
+        if not hasattr(request, '_cms_toolbar_request'):
+            request._cms_toolbar_request = self._is_cms_request(request)
+        return request._cms_toolbar_request
+
+    def _is_cms_request(self, request):
         toolbar_hide = get_cms_setting('TOOLBAR_HIDE')
         internal_ips = get_cms_setting('INTERNAL_IPS')
 
@@ -80,14 +86,13 @@ class ToolbarMiddleware(object):
             request.session['cms_build'] = False
             request.session['cms_edit'] = False
         if request.user.is_staff:
-            try:
-                request.cms_latest_entry = LogEntry.objects.filter(
-                    user=request.user,
-                    action_flag__in=(ADDITION, CHANGE)
-                ).only('pk').order_by('-pk')[0].pk
-            except IndexError:
-                request.cms_latest_entry = -1
-        request.toolbar = CMSToolbar(request)
+            request.cms_latest_entry = get_latest_log_entry(request.user)
+
+        if request.user.is_staff or request.session.get('cms_edit', False):
+            request.toolbar = CMSToolbar(request)
+        else:
+            # Visitors who can't edit get the real toolbar only if needed
+            request.toolbar = InertToolbar(request)
 
     def process_view(self, request, view_func, view_args, view_kwarg):
         if not self.is_cms_request(request):
@@ -109,19 +114,13 @@ class ToolbarMiddleware(object):
             add_never_cache_headers(response)
 
         if hasattr(request, 'user') and request.user.is_staff and response.status_code != 500:
-            try:
-                if hasattr(request, 'cms_latest_entry'):
-                    pk = LogEntry.objects.filter(
-                        user=request.user,
-                        action_flag__in=(ADDITION, CHANGE)
-                    ).only('pk').order_by('-pk')[0].pk
-
-                    if request.cms_latest_entry != pk:
-                        request.session['cms_log_latest'] = pk
-            # If there were no LogEntries, just don't touch the session.
-            # Note that in the case of a user logging-in as another user,
-            # request may have a cms_latest_entry attribute, but there are no
-            # LogEntries for request.user.
-            except IndexError:
-                pass
+            if hasattr(request, 'cms_latest_entry'):
+                pk = get_latest_log_entry(request.user)
+
+                # If there were no LogEntries, just don't touch the session.
+                # Note that in the case of a user logging-in as another user,
+                # request may have a cms_latest_entry attribute, but there are no
+                # LogEntries for request.user.
+                if pk != -1 and request.cms_latest_entry != pk:
+                    request.session['cms_log_latest'] = pk
         return response
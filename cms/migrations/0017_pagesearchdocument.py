@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def create_search_index(apps, schema_editor):
+    from cms.search.backends import PostgresSearchBackend, SqliteFTS5SearchBackend
+
+    connection = schema_editor.connection
+
+    if connection.vendor == 'postgresql':
+        PostgresSearchBackend.create_index(connection)
+    elif SqliteFTS5SearchBackend.is_available(connection):
+        SqliteFTS5SearchBackend.create_table(connection)
+
+
+def drop_search_index(apps, schema_editor):
+    from cms.search.backends import PostgresSearchBackend, SqliteFTS5SearchBackend
+
+    connection = schema_editor.connection
+
+    if connection.vendor == 'postgresql':
+        PostgresSearchBackend.drop_index(connection)
+    elif connection.vendor == 'sqlite':
+        SqliteFTS5SearchBackend.drop_table(connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0016_auto_20160608_1535'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageSearchDocument',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('language', models.CharField(max_length=15, verbose_name='language', db_index=True)),
+                ('title', models.TextField(verbose_name='title', blank=True)),
+                ('content', models.TextField(verbose_name='content', blank=True)),
+                ('changed_date', models.DateTimeField(auto_now=True)),
+                ('page', models.ForeignKey(related_name='search_documents', editable=False, to='cms.Page')),
+            ],
+            options={
+                'verbose_name': 'page search document',
+                'verbose_name_plural': 'page search documents',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='pagesearchdocument',
+            unique_together=set([('page', 'language')]),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
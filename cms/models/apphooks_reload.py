@@ -41,3 +41,11 @@ class UrlconfRevision(models.Model):
         if not created:
             obj.revision = revision
             obj.save()
+
+    @classmethod
+    def replace_revision(cls, previous_revision, revision):
+        """
+        Updates the revision only if it's still the given previous one.
+        Returns whether it has been updated.
+        """
+        return bool(cls.objects.filter(pk=1, revision=previous_revision).update(revision=revision))
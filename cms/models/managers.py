@@ -47,18 +47,39 @@ class PageManager(PublisherManager):
     def get_home(self, site=None):
         return self.get_queryset().get_home(site)
 
+    def with_titles(self, languages=None):
+        return self.get_queryset().with_titles(languages)
+
     def search(self, q, language=None, current_site_only=True):
         """Simple search function
 
+        Searches the public pages through the search index, see cms.search.
         Plugins can define a 'search_fields' tuple similar to ModelAdmin classes
+        to choose which of their fields are indexed.
+        Results are ordered by relevance.
+
+        Until the index has been built (see ``cms rebuild-search-index``),
+        the titles and plugins are searched directly, unordered.
         """
-        from cms.plugin_pool import plugin_pool
+        from cms.models import PageSearchDocument
+        from cms.search import search_pages
 
         qs = self.get_queryset()
         qs = qs.public()
 
         if current_site_only:
             site = Site.objects.get_current()
+        else:
+            site = None
+
+        if not PageSearchDocument.objects.using(qs.db).exists():
+            return self._search_unindexed(qs, q, language=language, site=site)
+        return search_pages(qs, q, language=language, site=site)
+
+    def _search_unindexed(self, qs, q, language=None, site=None):
+        from cms.plugin_pool import plugin_pool
+
+        if site:
             qs = qs.filter(site=site)
 
         qt = Q(title_set__title__icontains=q)
@@ -84,7 +105,7 @@ class PageManager(PublisherManager):
                         ): q})
         if language:
             qt &= Q(title_set__language=language)
-            qp &= Q(cmsplugin__language=language)
+            qp &= Q(placeholders__cmsplugin__language=language)
 
         qs = qs.filter(qt | qp)
 
@@ -14,7 +14,9 @@ from django.utils.timezone import now
 from django.utils.translation import get_language, ugettext_lazy as _
 
 from cms import constants
-from cms.cache.page import set_xframe_cache, get_xframe_cache
+from cms.cache.invalidation import invalidate_menu, invalidate_page_cache
+from cms.cache.page import (clear_page_inheritance_cache, get_page_inheritance_cache,
+                            set_page_inheritance_cache, update_page_inheritance_cache)
 from cms.constants import PUBLISHER_STATE_DEFAULT, PUBLISHER_STATE_PENDING, PUBLISHER_STATE_DIRTY, TEMPLATE_INHERITANCE_MAGIC
 from cms.exceptions import PublicIsUnmodifiable, LanguageError, PublicVersionNeeded
 from cms.models.managers import PageManager, PagePermissionsPermissionManager
@@ -24,7 +26,6 @@ from cms.utils import i18n, page as page_utils
 from cms.utils.conf import get_cms_setting
 from cms.utils.copy_plugins import copy_plugins_to
 from cms.utils.helpers import reversion_register
-from menus.menu_pool import menu_pool
 from treebeard.mp_tree import MP_Node
 
 
@@ -248,7 +249,11 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
                 # and sets it on the moved page.
                 # This is because the page is being moved to a root
                 # position and so can't inherit from anything.
-                self.template = self.get_template()
+                # It's stored for good, so it's looked up in the database
+                # rather than in the inheritance cache, which may lag
+                # behind the changes made by other processes.
+                template = self._get_inherited_attributes_from_ancestors()[0]
+                self.template = template or get_cms_setting('TEMPLATES')[0][0]
 
         if position == 'first-child' or position == 'last-child':
             self.parent_id = target.pk
@@ -325,8 +330,7 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
                 moved_page.mark_as_published(language)
                 moved_page.mark_descendants_as_published(language)
 
-        from cms.cache import invalidate_cms_page_cache
-        invalidate_cms_page_cache()
+        invalidate_page_cache()
 
     def _copy_titles(self, target, language, published):
         """
@@ -537,7 +541,7 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
             pages_by_old_pk[child_page_id] = new_child_page
 
         # invalidate the menu for this site
-        menu_pool.clear(site_id=site.pk)
+        invalidate_menu(site_id=site.pk)
         return new_page
 
     def delete(self, *args, **kwargs):
@@ -554,6 +558,8 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
         # delete template cache
         if hasattr(self, '_template_cache'):
             delattr(self, '_template_cache')
+        if hasattr(self, '_xframe_options_cache'):
+            delattr(self, '_xframe_options_cache')
 
         created = not bool(self.pk)
         if self.reverse_id == "":
@@ -645,8 +651,7 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
         # If there was a change, invalidate the cms page cache
         #
         if self.in_navigation != old:
-            from cms.cache import invalidate_cms_page_cache
-            invalidate_cms_page_cache()
+            invalidate_page_cache()
 
         return self.in_navigation
 
@@ -712,7 +717,7 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
             # trigger home update
             public_page.save()
             # invalidate the menu for this site
-            menu_pool.clear(site_id=self.site_id)
+            invalidate_menu(site_id=self.site_id)
             self.publisher_public = public_page
             published = True
         else:
@@ -742,8 +747,7 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
 
         cms_signals.post_publish.send(sender=Page, instance=self, language=language)
 
-        from cms.cache import invalidate_cms_page_cache
-        invalidate_cms_page_cache()
+        invalidate_page_cache()
 
         return published
 
@@ -776,8 +780,7 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
         self.save()
         self.mark_descendants_pending(language)
 
-        from cms.cache import invalidate_cms_page_cache
-        invalidate_cms_page_cache()
+        invalidate_page_cache()
 
         from cms.signals import post_unpublish
         post_unpublish.send(sender=Page, instance=self, language=language)
@@ -806,16 +809,74 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
             draft.set_publisher_state(language, state=PUBLISHER_STATE_PENDING)
 
     def mark_descendants_pending(self, language):
+        """
+        Marks the public descendants of this page as unpublished and sets the
+        published drafts among them to pending, using one UPDATE for each.
+        """
+        from cms.models import Title
+
         assert self.publisher_is_draft
 
         # Go through all children of our public instance
         public_page = self.publisher_public
 
-        if public_page:
-            descendants = public_page.get_descendants().filter(title_set__language=language)
+        if not public_page:
+            return
 
-            for child in descendants:
-                child.mark_as_pending(language)
+        public_titles = Title.objects.filter(
+            language=language,
+            page__path__startswith=public_page.path,
+            page__depth__gt=public_page.depth,
+            page__publisher_is_draft=False,
+        )
+        draft_titles = Title.objects.filter(
+            language=language,
+            page__publisher_public__path__startswith=public_page.path,
+            page__publisher_public__depth__gt=public_page.depth,
+            page__publisher_is_draft=True,
+        )
+        page_ids = list(draft_titles.values_list('page', flat=True))
+
+        if not page_ids:
+            return
+
+        unpublished = public_titles.filter(published=True)
+        has_apphooks = (
+            unpublished
+            .exclude(page__application_urls=None)
+            .exclude(page__application_urls='')
+            .exists()
+        )
+        unpublished.update(published=False)
+
+        # Only change the state if the draft page is published
+        # and it's state is the default (0)
+        (draft_titles
+         .filter(published=True, publisher_state=PUBLISHER_STATE_DEFAULT)
+         .update(publisher_state=PUBLISHER_STATE_PENDING))
+
+        self._descendants_state_changed(language, page_ids, has_apphooks)
+
+        import cms.signals as cms_signals
+
+        cms_signals.post_mark_descendants_pending.send(
+            sender=Page,
+            instance=self,
+            language=language,
+            pages=page_ids,
+        )
+
+    def _descendants_state_changed(self, language, page_ids, has_apphooks):
+        """
+        Runs the side effects a title save would have had after the
+        publisher state of the given descendants was changed in bulk.
+        """
+        invalidate_menu(site_id=self.site_id)
+
+        if has_apphooks:
+            from cms.signals.apphook import register_apphook_change
+
+            register_apphook_change()
 
     def mark_as_published(self, language):
         from cms.models import Title
@@ -852,21 +913,23 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
         publish_set = list(
             self.get_descendants()
             .filter(title_set__published=True, title_set__language=language)
-            .select_related('publisher_public', 'publisher_public__parent')
+            .select_related('publisher_public')
             .order_by('depth', 'path')
         )
 
+        if not publish_set:
+            return
+
         # prefetch the titles
-        page_ids = []
+        page_ids = set()
+        public_parent_ids = set()
 
         for page in publish_set:
-            if not page.pk in page_ids:
-                page_ids.append(page.pk)
-
-            publisher_id = page.publisher_public_id
+            page_ids.add(page.pk)
 
-            if publisher_id and not publisher_id in page_ids:
-                page_ids.append(publisher_id)
+            if page.publisher_public_id:
+                page_ids.add(page.publisher_public_id)
+                public_parent_ids.add(page.publisher_public.parent_id)
 
         titles = Title.objects.filter(page__pk__in=page_ids, language=language)
         titles_by_page_id = {}
@@ -874,6 +937,18 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
         for title in titles:
             titles_by_page_id[title.page_id] = title
 
+        # Public pages known to be published in this language.
+        # Is updated as descendants get published, top to bottom.
+        published_page_ids = set(
+            Title.objects
+            .filter(page__pk__in=public_parent_ids, language=language, published=True)
+            .values_list('page', flat=True)
+        )
+        public_title_ids = []
+        draft_title_ids = []
+        changed_page_ids = []
+        pending_pages = []
+
         for page in publish_set:
             if page.pk in titles_by_page_id:
                 page.title_cache = {language: titles_by_page_id[page.pk]}
@@ -892,25 +967,57 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
                     # since it didn't exist when the move happened.
                     publisher_public = page._publisher_save_public(publisher_public)
 
+                    if publisher_public.parent.is_published(language):
+                        published_page_ids.add(publisher_public.parent_id)
+
                 # Check if the parent of this page's
                 # public version is published.
-                if publisher_public.parent.is_published(language):
+                if publisher_public.parent_id in published_page_ids:
                     public_title = titles_by_page_id.get(page.publisher_public_id)
 
                     if public_title and not public_title.published:
-                        public_title._publisher_keep_state = True
-                        public_title.published = True
-                        public_title.publisher_state = PUBLISHER_STATE_DEFAULT
-                        public_title.save()
+                        public_title_ids.append(public_title.pk)
+                        changed_page_ids.append(page.pk)
+
+                    if public_title:
+                        published_page_ids.add(publisher_public.pk)
 
                     draft_title = titles_by_page_id[page.pk]
 
                     if draft_title.publisher_state == PUBLISHER_STATE_PENDING:
-                        draft_title.publisher_state = PUBLISHER_STATE_DEFAULT
-                        draft_title._publisher_keep_state = True
-                        draft_title.save()
+                        draft_title_ids.append(draft_title.pk)
             elif page.get_publisher_state(language) == PUBLISHER_STATE_PENDING:
-                page.publish(language)
+                if not any(page.path.startswith(pending.path) for pending in pending_pages):
+                    # Descendants of a page that gets published
+                    # are taken care of by its publish() call.
+                    pending_pages.append(page)
+
+        if public_title_ids:
+            public_titles = Title.objects.filter(pk__in=public_title_ids)
+            has_apphooks = (
+                public_titles
+                .exclude(page__application_urls=None)
+                .exclude(page__application_urls='')
+                .exists()
+            )
+            public_titles.update(published=True, publisher_state=PUBLISHER_STATE_DEFAULT)
+            self._descendants_state_changed(language, changed_page_ids, has_apphooks)
+
+        if draft_title_ids:
+            Title.objects.filter(pk__in=draft_title_ids).update(publisher_state=PUBLISHER_STATE_DEFAULT)
+
+        if changed_page_ids:
+            import cms.signals as cms_signals
+
+            cms_signals.post_mark_descendants_published.send(
+                sender=Page,
+                instance=self,
+                language=language,
+                pages=changed_page_ids,
+            )
+
+        for page in pending_pages:
+            page.publish(language)
 
     def revert(self, language):
         """Revert the draft version to the same state as the public version
@@ -1111,13 +1218,15 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
         if not hasattr(self, "title_cache") or force_reload:
             load = True
             self.title_cache = {}
+            self._prefetched_title_languages = ()
         elif language not in self.title_cache:
             if fallback:
                 fallback_langs = i18n.get_fallback_languages(language)
                 for lang in fallback_langs:
                     if lang in self.title_cache:
                         return lang
-            load = True
+            # The page has no title in a language its titles were prefetched in
+            load = not self._has_prefetched_titles(language)
         if load:
             from cms.models.titlemodels import Title
 
@@ -1144,6 +1253,11 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
                                 return lang
         return language
 
+    def _has_prefetched_titles(self, language):
+        # None stands for all languages, see cms.utils.page.prefetch_titles()
+        languages = getattr(self, '_prefetched_title_languages', ())
+        return languages is None or language in languages
+
     def get_template(self):
         """
         get the template of this page if defined or if closer parent if
@@ -1156,16 +1270,7 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
             if self.template != constants.TEMPLATE_INHERITANCE_MAGIC:
                 template = self.template
             else:
-                try:
-                    template = list(
-                        reversed(
-                            self.get_ancestors().exclude(
-                                template=constants.TEMPLATE_INHERITANCE_MAGIC
-                            ).values_list('template', flat=True)
-                        )
-                    )[0]
-                except IndexError:
-                    pass
+                template = self._get_inherited_attributes()[0]
         if not template:
             template = get_cms_setting('TEMPLATES')[0][0]
         self._template_cache = template
@@ -1426,6 +1531,7 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
 
     def move(self, target, pos=None):
         super(Page, self).move(target, pos)
+        clear_page_inheritance_cache(self.site_id)
         return self.reload()
 
     def rescan_placeholders(self):
@@ -1436,7 +1542,10 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
         from cms.models.placeholdermodel import Placeholder
         from cms.utils.placeholder import get_placeholders
 
-        placeholders = get_placeholders(self.get_template())
+        from cms.cache.placeholder import set_page_placeholders_cache
+
+        template = self.get_template()
+        placeholders = get_placeholders(template)
         found = {}
         for placeholder in self.placeholders.all():
             if placeholder.slot in placeholders:
@@ -1446,32 +1555,89 @@ class Page(six.with_metaclass(PageMetaClass, MP_Node)):
                 placeholder = Placeholder.objects.create(slot=placeholder_name)
                 self.placeholders.add(placeholder)
                 found[placeholder_name] = placeholder
+        placeholder_ids = {slot: placeholder.pk for slot, placeholder in found.items()}
+        set_page_placeholders_cache(self, template, placeholder_ids)
         return found
 
+    def get_declared_placeholders(self):
+        """
+        Returns a dictionary mapping the slots declared in the current
+        template to the placeholders of this page.
+
+        Unlike rescan_placeholders() this never writes to the database,
+        slots without a placeholder are left out. Placeholders are created
+        when the page is saved, moved or the template it inherits changes.
+        """
+        # inline import to prevent circular imports
+        from cms.cache.placeholder import get_page_placeholders_cache, set_page_placeholders_cache
+        from cms.models.placeholdermodel import Placeholder
+        from cms.utils.placeholder import get_placeholders
+
+        template = self.get_template()
+        cached = get_page_placeholders_cache(self)
+
+        if cached and cached[0] == template:
+            placeholders = Placeholder.objects.filter(pk__in=cached[1].values())
+        else:
+            slots = get_placeholders(template)
+            placeholders = self.placeholders.filter(slot__in=slots)
+            placeholder_ids = {placeholder.slot: placeholder.pk for placeholder in placeholders}
+            set_page_placeholders_cache(self, template, placeholder_ids)
+        return {placeholder.slot: placeholder for placeholder in placeholders}
+
     def get_xframe_options(self):
         """ Finds X_FRAME_OPTION from tree if inherited """
-        xframe_options = get_xframe_cache(self)
-        if xframe_options is None:
-            xframe_options = self.xframe_options
-            if not xframe_options or xframe_options == self.X_FRAME_OPTIONS_INHERIT:
-                ancestors = self.get_ancestors()
-
-                # Ignore those pages which just inherit their value
-                ancestors = ancestors.exclude(xframe_options=self.X_FRAME_OPTIONS_INHERIT)
-
-                # Now just give me the clickjacking setting (not anything else)
-                xframe_options = list(reversed(ancestors.values_list('xframe_options', flat=True)))
-                if self.xframe_options != self.X_FRAME_OPTIONS_INHERIT:
-                    xframe_options.append(self.xframe_options)
-                if len(xframe_options) <= 0:
-                    # No ancestors were found
-                    return None
-
-                xframe_options = xframe_options[0]
-            set_xframe_cache(self, xframe_options)
-
+        if hasattr(self, '_xframe_options_cache'):
+            return self._xframe_options_cache
+        xframe_options = self.xframe_options
+        if not xframe_options or xframe_options == self.X_FRAME_OPTIONS_INHERIT:
+            # None if no ancestor sets them
+            xframe_options = self._get_inherited_attributes()[1]
+        self._xframe_options_cache = xframe_options
         return xframe_options
 
+    def _get_inherited_attributes(self):
+        """
+        Returns the (template, xframe_options) pair this page inherits from
+        its ancestors. What every page of the site inherits is computed in one
+        pass over the tree and cached until a page changes what its
+        descendants inherit. Pages missing from the cache since then are
+        looked up on their own.
+        """
+        if not self.pk:
+            return self._get_inherited_attributes_from_ancestors()
+
+        inherited, version = get_page_inheritance_cache(self)
+
+        if inherited is not None:
+            return inherited
+
+        if version is None:
+            inheritance = update_page_inheritance_cache(self.site_id)
+
+            if self.pk in inheritance:
+                return inheritance[self.pk]
+            # The page is not (yet) part of the tree of its site
+            return self._get_inherited_attributes_from_ancestors()
+
+        inherited = self._get_inherited_attributes_from_ancestors()
+        set_page_inheritance_cache(self, inherited, version)
+        return inherited
+
+    def _get_inherited_attributes_from_ancestors(self):
+        template = None
+        xframe_options = None
+        ancestors = self.get_ancestors().values_list('template', 'xframe_options')
+
+        # From the root down, the nearest ancestor setting them wins
+        for ancestor_template, ancestor_xframe_options in ancestors:
+            if ancestor_template != constants.TEMPLATE_INHERITANCE_MAGIC:
+                template = ancestor_template
+
+            if ancestor_xframe_options != self.X_FRAME_OPTIONS_INHERIT:
+                xframe_options = ancestor_xframe_options
+        return template, xframe_options
+
     def undo(self):
         """
         Revert the current page to the previous revision
@@ -4,10 +4,35 @@ from django.contrib.sites.models import Site
 from treebeard.mp_tree import MP_NodeQuerySet
 from cms.publisher.query import PublisherQuerySet
 from cms.exceptions import NoHomeFound
+from cms.utils.page import prefetch_titles
 from django.utils import timezone
 
 
 class PageQuerySet(MP_NodeQuerySet, PublisherQuerySet):
+    _prefetch_titles = False
+    _title_languages = None
+
+    def _clone(self, *args, **kwargs):
+        kwargs.setdefault('_prefetch_titles', self._prefetch_titles)
+        kwargs.setdefault('_title_languages', self._title_languages)
+        return super(PageQuerySet, self)._clone(*args, **kwargs)
+
+    def _fetch_all(self):
+        prefetch = self._result_cache is None and self._prefetch_titles
+        super(PageQuerySet, self)._fetch_all()
+
+        if prefetch:
+            pages = [obj for obj in self._result_cache if isinstance(obj, self.model)]
+            prefetch_titles(pages, self._title_languages)
+
+    def with_titles(self, languages=None):
+        """
+        Fills the title cache of the pages with their titles in the given
+        languages (all languages if None) using one query once the queryset
+        is evaluated.
+        """
+        return self._clone(_prefetch_titles=True, _title_languages=languages)
+
     def on_site(self, site=None):
         if not site:
             try:
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from django.db import models
+from django.utils.encoding import python_2_unicode_compatible
+from django.utils.translation import ugettext_lazy as _
+
+
+@python_2_unicode_compatible
+class PageSearchDocument(models.Model):
+    """
+    Denormalized text of a public page in one language, as fed to the
+    search backend. Documents are refreshed whenever the page is published.
+    """
+    page = models.ForeignKey('cms.Page', related_name='search_documents', editable=False)
+    language = models.CharField(_("language"), max_length=15, db_index=True)
+    title = models.TextField(_("title"), blank=True)
+    content = models.TextField(_("content"), blank=True)
+    changed_date = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = (('page', 'language'),)
+        verbose_name = _('page search document')
+        verbose_name_plural = _('page search documents')
+        app_label = 'cms'
+
+    def __str__(self):
+        return u"%s (%s)" % (self.title, self.language)
@@ -403,8 +403,11 @@ class CMSPluginBase(six.with_metaclass(CMSPluginBaseMetaclass, admin.ModelAdmin)
         if child_classes:
             return child_classes
 
+        from cms.plugin_pool import plugin_pool
+
         # Get all child plugin candidates
         installed_plugins = cls.get_child_plugin_candidates(slot, page)
+        plugin_parents = plugin_pool.get_plugin_parents(slot, page)
 
         child_classes = []
         plugin_type = cls.__name__
@@ -418,7 +421,11 @@ class CMSPluginBase(six.with_metaclass(CMSPluginBaseMetaclass, admin.ModelAdmin)
         # If there are no restrictions then the plugin
         # is a valid child class.
         for plugin_class in installed_plugins:
-            allowed_parents = plugin_class().get_parent_classes(slot, page) or []
+            try:
+                allowed_parents = plugin_parents[plugin_class.__name__]
+            except KeyError:
+                # Candidate that isn't registered with the plugin pool
+                allowed_parents = plugin_class().get_parent_classes(slot, page) or []
 
             if not allowed_parents or plugin_type in allowed_parents:
                 # Plugin has no parent restrictions or
@@ -2,6 +2,7 @@
 from operator import attrgetter
 
 from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
 from django.conf.urls import url, include
 from django.db.models import signals
 from django.template.defaultfilters import slugify
@@ -18,12 +19,37 @@ from cms.utils.helpers import reversion_register, normalize_name
 from cms.utils.compat.dj import is_installed
 
 
+# The CMSPluginBase methods each cached result of the plugin pool depends on
+PAGE_DEPENDENT_METHODS = {
+    'plugins': ('requires_parent_plugin', 'get_require_parent', 'get_parent_classes'),
+    'parents': ('get_parent_classes',),
+    'children': (
+        'get_child_classes',
+        'get_child_class_overrides',
+        'get_child_plugin_candidates',
+        'get_parent_classes',
+    ),
+}
+
+
+def _overrides(plugin, name):
+    for cls in plugin.__mro__:
+        if cls is CMSPluginBase:
+            return False
+
+        if name in cls.__dict__:
+            return True
+    return False
+
+
 class PluginPool(object):
 
     def __init__(self):
         self.plugins = {}
         self.discovered = False
         self.patched = False
+        # Allowed plugins and parent / child classes by template and slot
+        self._cache = {}
 
     def discover_plugins(self):
         if self.discovered:
@@ -37,6 +63,15 @@ class PluginPool(object):
         self.discovered = False
         self.plugins = {}
         self.patched = False
+        self.clear_cache()
+
+    def clear_cache(self):
+        """
+        Forgets the allowed plugins and plugin compatibility computed
+        so far. Called whenever a plugin is (un)registered or the
+        placeholder configuration changes.
+        """
+        self._cache = {}
 
     def validate_templates(self, plugin=None):
         """
@@ -115,6 +150,7 @@ class PluginPool(object):
 
         plugin.value = plugin_name
         self.plugins[plugin_name] = plugin
+        self.clear_cache()
         from cms.signals import pre_save_plugins, post_delete_plugins, pre_delete_plugins
 
         signals.pre_save.connect(pre_save_plugins, sender=plugin.model,
@@ -144,6 +180,7 @@ class PluginPool(object):
                 'The plugin %r is not registered' % plugin
             )
         del self.plugins[plugin_name]
+        self.clear_cache()
 
     def set_plugin_meta(self):
         """
@@ -161,12 +198,29 @@ class PluginPool(object):
         self.patched = True
 
     def get_all_plugins(self, placeholder=None, page=None, setting_key="plugins", include_page_only=True):
-        from cms.utils.placeholder import get_placeholder_conf
-
         self.discover_plugins()
         self.set_plugin_meta()
-        plugins = sorted(self.plugins.values(), key=attrgetter('name'))
         template = page and page.get_template() or None
+        key = ('plugins', template, placeholder, setting_key, include_page_only)
+
+        if placeholder and not self._is_cacheable('plugins'):
+            # Only the plugins requiring a parent depend on the page
+            return self._get_all_plugins(placeholder, page, template, setting_key, include_page_only)
+
+        if key not in self._cache:
+            self._cache[key] = self._get_all_plugins(
+                placeholder,
+                page,
+                template,
+                setting_key,
+                include_page_only,
+            )
+        return list(self._cache[key])
+
+    def _get_all_plugins(self, placeholder, page, template, setting_key, include_page_only):
+        from cms.utils.placeholder import get_placeholder_conf
+
+        plugins = sorted(self.plugins.values(), key=attrgetter('name'))
 
         allowed_plugins = get_placeholder_conf(
             setting_key,
@@ -197,6 +251,66 @@ class PluginPool(object):
             plugins = (plugin for plugin in plugins if not plugin.requires_parent_plugin(placeholder, page))
         return sorted(plugins, key=attrgetter('module'))
 
+    def get_plugin_parents(self, slot, page=None):
+        """
+        Returns a dictionary mapping the name of every plugin to
+        the plugin types it can be added to in the given slot.
+        """
+        self.discover_plugins()
+        template = page and page.get_template() or None
+        key = ('parents', template, slot)
+
+        if not self._is_cacheable('parents'):
+            return self._get_plugin_parents(slot, page)
+
+        if key not in self._cache:
+            self._cache[key] = self._get_plugin_parents(slot, page)
+        return self._cache[key]
+
+    def _get_plugin_parents(self, slot, page):
+        return {
+            name: plugin().get_parent_classes(slot, page) or []
+            for name, plugin in self.plugins.items()
+        }
+
+    def get_plugin_children(self, slot, page=None):
+        """
+        Returns a dictionary mapping the name of every plugin to
+        the plugin types that can be added to it in the given slot.
+        """
+        self.discover_plugins()
+        template = page and page.get_template() or None
+        key = ('children', template, slot)
+
+        if not self._is_cacheable('children'):
+            return self._get_plugin_children(slot, page)
+
+        if key not in self._cache:
+            self._cache[key] = self._get_plugin_children(slot, page)
+        return self._cache[key]
+
+    def _get_plugin_children(self, slot, page):
+        return {
+            name: plugin.get_child_classes(slot, page) or []
+            for name, plugin in self.plugins.items()
+        }
+
+    def _is_cacheable(self, kind):
+        """
+        The results are cached by template and slot, which is only correct
+        as long as no registered plugin overrides a method that may use
+        anything else from the page.
+        """
+        key = ('cacheable', kind)
+
+        if key not in self._cache:
+            self._cache[key] = not any(
+                _overrides(plugin, name)
+                for plugin in self.plugins.values()
+                for name in PAGE_DEPENDENT_METHODS[kind]
+            )
+        return self._cache[key]
+
     def get_text_enabled_plugins(self, placeholder, page):
         plugins = self.get_all_plugins(placeholder, page)
         plugins += self.get_all_plugins(placeholder, page, 'text_only_plugins')
@@ -239,3 +353,11 @@ class PluginPool(object):
 
 
 plugin_pool = PluginPool()
+
+
+def clear_plugin_pool_cache(**kwargs):
+    if kwargs.get('setting') == 'CMS_PLACEHOLDER_CONF':
+        plugin_pool.clear_cache()
+
+
+setting_changed.connect(clear_plugin_pool_cache, dispatch_uid='cms_clear_plugin_pool_cache')
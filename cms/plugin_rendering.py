@@ -4,17 +4,23 @@ from collections import deque
 from classytags.utils import flatten_context
 from django.template import Template, Context
 from django.template.loader import get_template
+from django.utils.encoding import force_bytes
 from django.utils.functional import cached_property
 from django.utils.safestring import mark_safe
 
-from cms.cache.placeholder import get_placeholder_cache, set_placeholder_cache
+from cms.cache.placeholder import (get_inherited_placeholders_cache, get_placeholder_cache,
+                                   set_inherited_placeholders_cache, set_placeholder_cache)
+from cms.constants import TEMPLATE_INHERITANCE_MAGIC
 from cms.exceptions import PlaceholderNotFound
 from cms.plugin_processors import (plugin_meta_context_processor, mark_safe_plugin_processor)
 from cms.toolbar.utils import get_toolbar_from_request
 from cms.utils import get_language_from_request
 from cms.utils.conf import get_cms_setting, get_site_id
 from cms.utils.django_load import iterload_objects
-from cms.utils.placeholder import get_toolbar_plugin_struct, restore_sekizai_context
+from cms.utils.i18n import get_fallback_languages
+from cms.utils.placeholder import (get_placeholder_conf, get_placeholders, get_toolbar_plugin_struct,
+                                   restore_sekizai_context)
+from cms.utils.profiling import NOOP_MEASURE, get_render_profiler
 
 
 DEFAULT_PLUGIN_CONTEXT_PROCESSORS = (
@@ -104,8 +110,31 @@ class ContentRenderer(object):
     def get_rendered_static_placeholders(self):
         return self._rendered_static_placeholders
 
+    def _measure(self, kind, **info):
+        profiler = get_render_profiler(self.request)
+
+        if profiler is None:
+            return NOOP_MEASURE
+        return profiler.measure(kind, **info)
+
     def render_placeholder(self, placeholder, context, language=None, page=None,
                            editable=False, use_cache=False, nodelist=None, width=None):
+        with self._measure('placeholder', placeholder=placeholder.pk, slot=placeholder.slot) as record:
+            content = self._render_placeholder(
+                placeholder,
+                context=context,
+                language=language,
+                page=page,
+                editable=editable,
+                use_cache=use_cache,
+                nodelist=nodelist,
+                width=width,
+            )
+            record['bytes'] = len(force_bytes(content))
+        return content
+
+    def _render_placeholder(self, placeholder, context, language=None, page=None,
+                            editable=False, use_cache=False, nodelist=None, width=None):
         from sekizai.helpers import Watcher
         from cms.utils.plugins import get_plugins
 
@@ -130,6 +159,11 @@ class ContentRenderer(object):
                 site_id=site_id,
                 language=language,
             )
+
+            profiler = get_render_profiler(self.request)
+
+            if profiler is not None:
+                profiler.add_cache_lookup(hit=cached_value is not None)
         else:
             cached_value = None
 
@@ -157,12 +191,13 @@ class ContentRenderer(object):
         if use_cache:
             watcher = Watcher(context)
 
-        plugins = get_plugins(
-            request=self.request,
-            placeholder=placeholder,
-            template=template,
-            lang=language,
-        )
+        with self._measure('assign_plugins', placeholder=placeholder.pk, slot=placeholder.slot):
+            plugins = get_plugins(
+                request=self.request,
+                placeholder=placeholder,
+                template=template,
+                lang=language,
+            )
 
         if plugins:
             plugin_content = self.render_plugins(
@@ -233,19 +268,17 @@ class ContentRenderer(object):
         if not inherit or self.toolbar.edit_mode:
             return content
 
-        pages = list(reversed(current_page.get_cached_ancestors()))
-
-        for page in pages:
-            # nodelist is set to None to avoid rendering the nodes inside
+        for page, placeholder in self._get_inherited_placeholders(current_page, slot):
+            # nodelist is not passed to avoid rendering the nodes inside
             # a {% placeholder or %} block tag.
             # When placeholder inheritance is used, we only care about placeholders
             # with plugins.
-            inherited_content = self._render_page_placeholder(
+            inherited_content = self.render_placeholder(
+                placeholder,
                 context=context,
-                slot=slot,
                 page=page,
-                nodelist=None,
                 editable=False,
+                use_cache=True,
             )
 
             if inherited_content:
@@ -284,6 +317,13 @@ class ContentRenderer(object):
         if not placeholder:
             placeholder = instance.placeholder
 
+        with self._measure('plugin', plugin=instance.pk, plugin_type=instance.plugin_type,
+                           placeholder=placeholder.pk, slot=placeholder.slot) as record:
+            content = self._render_plugin(instance, context, placeholder, editable)
+            record['bytes'] = len(force_bytes(content))
+        return content
+
+    def _render_plugin(self, instance, context, placeholder, editable):
         instance, plugin = instance.get_plugin_instance()
 
         if not instance or not plugin.render_plugin:
@@ -341,18 +381,18 @@ class ContentRenderer(object):
         children_cache = placeholder_cache.setdefault('plugin_children', {})
 
         if plugin_type not in parents_cache:
-            parent_classes = plugin_class.get_parent_classes(
+            plugin_parents = self.plugin_pool.get_plugin_parents(
                 slot=placeholder.slot,
                 page=self.current_page,
             )
-            parents_cache[plugin_type] = parent_classes or []
+            parents_cache[plugin_type] = plugin_parents.get(plugin_type, [])
 
         if plugin_type not in children_cache:
-            child_classes = plugin_class.get_child_classes(
+            plugin_children = self.plugin_pool.get_plugin_children(
                 slot=placeholder.slot,
                 page=self.current_page,
             )
-            children_cache[plugin_type] = child_classes or []
+            children_cache[plugin_type] = plugin_children.get(plugin_type, [])
         return content
 
     def render_editable_placeholder(self, placeholder, context, language):
@@ -447,6 +487,110 @@ class ContentRenderer(object):
         )
         return content
 
+    def _get_inherited_placeholders(self, page, slot):
+        """
+        Yields the (ancestor, placeholder) pairs «slot» can be inherited
+        from, nearest ancestor first.
+
+        The sources are looked up in the inherited placeholder index, so
+        only the placeholders that have content are fetched, one at a time
+        and only until one of them renders.
+        """
+        from cms.models import Placeholder
+
+        ancestors = page.get_cached_ancestors()
+
+        if not ancestors:
+            return
+
+        language = self.request_language
+        sources, versions = get_inherited_placeholders_cache(page, ancestors, slot, language)
+
+        if sources is None:
+            sources = self._get_inherited_placeholder_sources(ancestors, slot)
+            set_inherited_placeholders_cache(page, slot, language, sources, versions)
+
+        ancestors_by_id = dict((ancestor.pk, ancestor) for ancestor in ancestors)
+
+        for page_id, placeholder_id in sources:
+            ancestor = ancestors_by_id.get(page_id)
+
+            if ancestor is None:
+                continue
+
+            try:
+                # Reuse the placeholder if the ancestor has been rendered already
+                placeholder = self._placeholders_by_page_cache[page_id][slot]
+            except KeyError:
+                try:
+                    placeholder = Placeholder.objects.get(pk=placeholder_id)
+                except Placeholder.DoesNotExist:
+                    continue
+                placeholder.page = ancestor
+            yield ancestor, placeholder
+
+    def _get_inherited_placeholder_sources(self, ancestors, slot):
+        """
+        Returns the [(page id, placeholder id), ...] list of «ancestors»
+        whose «slot» placeholder renders plugins in the request language,
+        either its own, those of a fallback language or default plugins,
+        nearest ancestor first.
+        """
+        from cms.models import Placeholder
+
+        language = self.request_language
+        fallback_languages = get_fallback_languages(language)
+        placeholders_by_page = {}
+
+        placeholders = (
+            Placeholder
+            .objects
+            .filter(page__in=ancestors, slot=slot)
+            .values_list('page', 'pk', 'cmsplugin__language')
+            .distinct()
+        )
+
+        for page_id, placeholder_id, plugin_language in placeholders:
+            page_placeholders = placeholders_by_page.setdefault(page_id, {})
+            languages = page_placeholders.setdefault(placeholder_id, set())
+
+            if plugin_language:
+                languages.add(plugin_language)
+
+        # Resolve the template of every ancestor from the root down
+        # so that inherited templates don't need a query each.
+        templates = {}
+        template = get_cms_setting('TEMPLATES')[0][0]
+
+        for ancestor in ancestors:
+            if ancestor.template and ancestor.template != TEMPLATE_INHERITANCE_MAGIC:
+                template = ancestor.template
+            templates[ancestor.pk] = template
+
+        sources = []
+
+        for ancestor in reversed(ancestors):
+            template = templates[ancestor.pk]
+            page_placeholders = placeholders_by_page.get(ancestor.pk)
+
+            if not page_placeholders or slot not in get_placeholders(template):
+                continue
+
+            for placeholder_id, languages in page_placeholders.items():
+                if language in languages:
+                    has_content = True
+                elif languages:
+                    has_content = (
+                        any(fallback in languages for fallback in fallback_languages)
+                        and get_placeholder_conf('language_fallback', slot, template, True)
+                    )
+                else:
+                    has_content = bool(get_placeholder_conf('default_plugins', slot, template))
+
+                if has_content:
+                    sources.append((ancestor.pk, placeholder_id))
+        return sources
+
     def _preload_placeholders_for_page(self, page):
         """
         Populates the internal plugin cache of each placeholder
@@ -456,7 +600,14 @@ class ContentRenderer(object):
         from cms.utils.plugins import assign_plugins
 
         site_id = page.site_id
-        placeholders = page.rescan_placeholders().values()
+
+        if self.toolbar.edit_mode:
+            # Editors need every placeholder of the template, even those
+            # added to it after the page was last saved.
+            placeholders = page.rescan_placeholders().values()
+        else:
+            # Read only, placeholders are created when the page is saved
+            placeholders = page.get_declared_placeholders().values()
 
         if self.placeholder_cache_is_enabled():
             _cached_content = self._get_cached_placeholder_content
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+"""
+Full-text search over the public pages.
+
+Every public page has one PageSearchDocument per language holding its titles,
+meta description and the text of its plugins. Documents are refreshed when the
+page is published and removed when it's unpublished, so searching only touches
+a single table instead of joining every searchable plugin model.
+
+The backend doing the matching and ranking is chosen by ``CMS_SEARCH_BACKEND``.
+By default PostgreSQL full-text search is used on PostgreSQL, an FTS5 table on
+SQLite if the extension was available when migrating, and a plain scan of the
+documents table ranked in Python everywhere else.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import Case, IntegerField, Value, When
+from django.utils.encoding import force_text
+from django.utils.html import strip_tags
+from django.utils.module_loading import import_string
+
+from cms.search.backends import (
+    DatabaseSearchBackend,
+    PostgresSearchBackend,
+    SqliteFTS5SearchBackend,
+)
+from cms.utils import get_cms_setting
+
+WHITESPACE_RE = re.compile(r'\s+', re.UNICODE)
+
+# How many of the best matching pages are returned. The pages are ordered by
+# a CASE expression with one branch per page, which has to stay well below
+# the number of query parameters databases accept (999 on SQLite).
+MAX_SEARCH_RESULTS = 250
+
+_backends = {}
+
+
+def get_search_backend(using='default'):
+    """
+    Returns the search backend for the given database alias.
+    """
+    path = get_cms_setting('SEARCH_BACKEND')
+    key = (using, path)
+
+    if key not in _backends:
+        if path:
+            backend_class = import_string(path)
+        else:
+            connection = connections[using]
+
+            if connection.vendor == 'postgresql':
+                backend_class = PostgresSearchBackend
+            elif (SqliteFTS5SearchBackend.is_available(connection)
+                  and SqliteFTS5SearchBackend.get_table_name() in connection.introspection.table_names()):
+                backend_class = SqliteFTS5SearchBackend
+            else:
+                backend_class = DatabaseSearchBackend
+        _backends[key] = backend_class(using)
+    return _backends[key]
+
+
+def _clean_text(value):
+    return WHITESPACE_RE.sub(' ', strip_tags(force_text(value))).strip()
+
+
+def _get_field_value(instance, field):
+    for name in field.split('__'):
+        instance = getattr(instance, name, None)
+
+        if instance is None:
+            return ''
+    return instance
+
+
+def get_plugin_text(instance):
+    """
+    Returns the searchable text of a plugin instance. Plugin models
+    can set search_fields to choose the fields being indexed, for any
+    other plugin the translatable content is used.
+    """
+    search_fields = getattr(instance, 'search_fields', None)
+
+    if search_fields:
+        values = [_get_field_value(instance, field) for field in search_fields]
+    else:
+        values = instance.get_translatable_content().values()
+    return ' '.join(_clean_text(value) for value in values if value)
+
+
+def get_page_text(page, language):
+    """
+    Returns the (title, content) text of page in language
+    or None if the page has no title in that language.
+    """
+    from cms.models import CMSPlugin, Title
+    from cms.plugin_pool import plugin_pool
+    from cms.utils.plugins import downcast_plugins
+
+    try:
+        title = Title.objects.get(page=page, language=language)
+    except Title.DoesNotExist:
+        return None
+
+    titles = [title.title, title.page_title, title.menu_title]
+    plugin_types = [plugin.__name__ for plugin in plugin_pool.get_all_plugins()]
+    plugins = CMSPlugin.objects.filter(
+        placeholder__page=page,
+        language=language,
+        plugin_type__in=plugin_types,
+    ).order_by('placeholder', 'path')
+    content = [title.meta_description]
+    content.extend(get_plugin_text(instance) for instance in downcast_plugins(plugins))
+    return (
+        ' '.join(_clean_text(value) for value in titles if value),
+        ' '.join(value for value in content if value),
+    )
+
+
+def update_page_index(page, language):
+    """
+    Refreshes the search document of the public page in language.
+    """
+    from cms.models import PageSearchDocument
+
+    backend = get_search_backend(page._state.db or 'default')
+    text = get_page_text(page, language)
+
+    if text is None:
+        remove_page_index(page, language)
+        return None
+
+    document, created = PageSearchDocument.objects.update_or_create(
+        page=page,
+        language=language,
+        defaults={'title': text[0], 'content': text[1]},
+    )
+    backend.update(document)
+    return document
+
+
+def remove_page_index(page, language=None):
+    """
+    Removes the search documents of the page, in all languages
+    if language is not given.
+    """
+    from cms.models import PageSearchDocument
+
+    documents = PageSearchDocument.objects.filter(page=page)
+
+    if language:
+        documents = documents.filter(language=language)
+
+    document_ids = list(documents.values_list('pk', flat=True))
+
+    if document_ids:
+        get_search_backend(documents.db).remove(document_ids)
+        PageSearchDocument.objects.filter(pk__in=document_ids).delete()
+
+
+def rebuild_index(site=None):
+    """
+    Re-creates the search documents of all published public pages,
+    optionally limited to one site. Returns the number of documents.
+    """
+    from cms.models import Page, PageSearchDocument
+
+    pages = Page.objects.public()
+
+    if site:
+        pages = pages.filter(site=site)
+
+    existing = PageSearchDocument.objects.filter(page__in=pages)
+    get_search_backend(existing.db).remove(list(existing.values_list('pk', flat=True)))
+    existing.delete()
+    count = 0
+
+    for page in pages.prefetch_related('title_set'):
+        for title in page.title_set.all():
+            if title.published and update_page_index(page, title.language):
+                count += 1
+    return count
+
+
+def search_pages(queryset, q, language=None, site=None):
+    """
+    Returns the pages of queryset matching q, best match first,
+    at most MAX_SEARCH_RESULTS of them.
+    """
+    from cms.models import PageSearchDocument
+
+    documents = PageSearchDocument.objects.using(queryset.db).filter(page__publisher_is_draft=False)
+
+    if language:
+        documents = documents.filter(language=language)
+
+    if site:
+        documents = documents.filter(page__site=site)
+
+    page_ids = get_search_backend(queryset.db).search(documents, q)[:MAX_SEARCH_RESULTS]
+
+    if not page_ids:
+        return queryset.none()
+
+    ranking = Case(
+        *[When(pk=page_id, then=Value(rank)) for rank, page_id in enumerate(page_ids)],
+        output_field=IntegerField()
+    )
+    return (
+        queryset
+        .filter(pk__in=page_ids)
+        .annotate(search_rank=ranking)
+        .order_by('search_rank')
+    )
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+# Matches in the title count this many times more than in the content
+TITLE_WEIGHT = 10
+
+
+def get_terms(q):
+    """
+    Splits the query into lowercase words, dropping any syntax
+    the full-text engines would otherwise interpret.
+    """
+    return [term.lower() for term in WORD_RE.findall(q or '')]
+
+
+class BaseSearchBackend(object):
+    """
+    A search backend ranks PageSearchDocument objects against a query.
+
+    Backends that keep their own index are told about every document that
+    is updated or removed, the documents table itself is maintained by
+    cms.search.
+    """
+
+    def __init__(self, using):
+        self.using = using
+
+    def update(self, document):
+        pass
+
+    def remove(self, document_ids):
+        pass
+
+    def search(self, documents, q):
+        """
+        Returns the ids of the pages of the matching documents,
+        best match first.
+        """
+        raise NotImplementedError
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """
+    Works on any database. Narrows down the documents with a single
+    table scan and ranks them in Python by the number of occurrences
+    of the query terms.
+    """
+
+    def search(self, documents, q):
+        terms = get_terms(q)
+
+        if not terms:
+            return []
+
+        for term in terms:
+            documents = documents.filter(Q(title__icontains=term) | Q(content__icontains=term))
+
+        scores = {}
+
+        for page_id, title, content in documents.values_list('page', 'title', 'content'):
+            title = title.lower()
+            content = content.lower()
+            score = sum(title.count(term) * TITLE_WEIGHT + content.count(term) for term in terms)
+            scores[page_id] = max(scores.get(page_id, 0), score)
+        return sorted(scores, key=lambda page_id: (-scores[page_id], page_id))
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Uses the PostgreSQL full-text search with prefix matching, ranking
+    title matches over content matches. The documents are looked up with
+    a GIN index on the weighted vector, created by the migration adding
+    PageSearchDocument.
+    """
+    config = 'simple'
+    index_suffix = '_fts'
+
+    @classmethod
+    def get_index_name(cls):
+        from cms.models import PageSearchDocument
+
+        return PageSearchDocument._meta.db_table + cls.index_suffix
+
+    @classmethod
+    def get_vector(cls, prefix=''):
+        """
+        Returns the SQL of the weighted vector of the documents. Searches
+        must use the same expression as the index for it to be used.
+        """
+        config = "'%s'::regconfig" % cls.config
+        return (
+            "(setweight(to_tsvector({config}, {prefix}title), 'A') || "
+            "setweight(to_tsvector({config}, {prefix}content), 'B'))"
+        ).format(config=config, prefix=prefix)
+
+    @classmethod
+    def create_index(cls, connection):
+        from cms.models import PageSearchDocument
+
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE INDEX %s ON %s USING gin (%s)' % (
+                connection.ops.quote_name(cls.get_index_name()),
+                connection.ops.quote_name(PageSearchDocument._meta.db_table),
+                cls.get_vector(),
+            ))
+
+    @classmethod
+    def drop_index(cls, connection):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP INDEX IF EXISTS %s' % connection.ops.quote_name(cls.get_index_name()))
+
+    def search(self, documents, q):
+        terms = get_terms(q)
+
+        if not terms:
+            return []
+
+        table = connections[self.using].ops.quote_name(documents.model._meta.db_table)
+        vector = self.get_vector(prefix='%s.' % table)
+        query = ' & '.join('%s:*' % term for term in terms)
+        documents = documents.extra(
+            select={'rank': 'ts_rank(%s, to_tsquery(%%s, %%s))' % vector},
+            select_params=(self.config, query),
+            where=['%s @@ to_tsquery(%%s, %%s)' % vector],
+            params=(self.config, query),
+        )
+        page_ids = []
+
+        for page_id, rank in documents.order_by('-rank', 'page').values_list('page', 'rank'):
+            if page_id not in page_ids:
+                page_ids.append(page_id)
+        return page_ids
+
+
+class SqliteFTS5SearchBackend(BaseSearchBackend):
+    """
+    Mirrors the documents into an SQLite FTS5 table and ranks them with
+    bm25. The table is created by the migration adding PageSearchDocument.
+    """
+    table_suffix = '_fts'
+
+    @classmethod
+    def get_table_name(cls):
+        from cms.models import PageSearchDocument
+
+        return PageSearchDocument._meta.db_table + cls.table_suffix
+
+    @classmethod
+    def is_available(cls, connection):
+        if connection.vendor != 'sqlite':
+            return False
+
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA compile_options')
+            compile_options = [row[0] for row in cursor.fetchall()]
+        return 'ENABLE_FTS5' in compile_options
+
+    @classmethod
+    def create_table(cls, connection):
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE VIRTUAL TABLE IF NOT EXISTS %s USING fts5(title, content)'
+                           % connection.ops.quote_name(cls.get_table_name()))
+
+    @classmethod
+    def drop_table(cls, connection):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TABLE IF EXISTS %s' % connection.ops.quote_name(cls.get_table_name()))
+
+    def get_table(self):
+        return connections[self.using].ops.quote_name(self.get_table_name())
+
+    def update(self, document):
+        table = self.get_table()
+
+        with connections[self.using].cursor() as cursor:
+            cursor.execute('DELETE FROM %s WHERE rowid = %%s' % table, [document.pk])
+            cursor.execute(
+                'INSERT INTO %s (rowid, title, content) VALUES (%%s, %%s, %%s)' % table,
+                [document.pk, document.title, document.content],
+            )
+
+    def remove(self, document_ids):
+        if not document_ids:
+            return
+
+        table = self.get_table()
+        placeholders = ', '.join(['%s'] * len(document_ids))
+
+        with connections[self.using].cursor() as cursor:
+            cursor.execute('DELETE FROM %s WHERE rowid IN (%s)' % (table, placeholders), list(document_ids))
+
+    def search(self, documents, q):
+        terms = get_terms(q)
+
+        if not terms:
+            return []
+
+        table = self.get_table()
+        documents_table = connections[self.using].ops.quote_name(documents.model._meta.db_table)
+        # Quoted terms can't be taken as FTS5 operators
+        query = ' '.join('"%s"*' % term for term in terms)
+        documents = documents.extra(
+            tables=[table],
+            select={'rank': 'bm25(%s, %s, 1.0)' % (table, TITLE_WEIGHT)},
+            where=['%s.rowid = %s.id' % (table, documents_table), '%s MATCH %%s' % table],
+            params=[query],
+        )
+        page_ids = []
+
+        # bm25 scores are negative, the lower the better
+        for page_id, rank in documents.order_by('rank', 'page').values_list('page', 'rank'):
+            if page_id not in page_ids:
+                page_ids.append(page_id)
+        return page_ids
@@ -1,20 +1,23 @@
 # -*- coding: utf-8 -*-
 
 from cms.signals.apphook import debug_server_restart, trigger_server_restart
-from cms.signals.page import pre_save_page, post_save_page, pre_delete_page, post_delete_page, post_moved_page
+from cms.signals.page import pre_save_page, post_save_page, pre_delete_page, post_delete_page, post_moved_page, post_publish_page, post_change_page_placeholders
 from cms.signals.permissions import post_save_user, post_save_user_group, pre_save_user, pre_delete_user, pre_save_group, pre_delete_group, pre_save_pagepermission, pre_delete_pagepermission, pre_save_globalpagepermission, pre_delete_globalpagepermission
 from cms.signals.placeholder import pre_delete_placeholder_ref, post_delete_placeholder_ref
-from cms.signals.plugins import post_delete_plugins, pre_save_plugins, pre_delete_plugins
+from cms.signals.plugins import post_delete_plugins, pre_save_plugins, pre_delete_plugins, post_change_plugins
 from cms.signals.reversion_signals import post_revision
+from cms.signals.search import update_search_index, remove_search_index
 from cms.signals.title import pre_save_title, post_save_title, pre_delete_title, post_delete_title
+from cms.signals.toolbar import post_save_log_entry, post_save_user_settings
 from cms.utils.compat.dj import is_installed
 from cms.utils.conf import get_cms_setting
 
 from django.db.models import signals
 from django.dispatch import Signal
 
-from cms.models import Page, Title, CMSPlugin, PagePermission, GlobalPagePermission, PageUser, PageUserGroup, PlaceholderReference
+from cms.models import Page, Title, CMSPlugin, PagePermission, GlobalPagePermission, PageUser, PageUserGroup, PlaceholderReference, UserSettings
 from django.conf import settings
+from django.contrib.admin.models import LogEntry
 from django.contrib.auth.models import User, Group
 
 #################### Our own signals ###################
@@ -27,8 +30,22 @@ page_moved = Signal(providing_args=["instance"])
 post_publish = Signal(providing_args=["instance", "language"])
 post_unpublish = Signal(providing_args=["instance", "language"])
 
-# fired if a public page with an apphook is added or changed
-urls_need_reloading = Signal(providing_args=[])
+# fired once after the publisher state of the descendants of a page has been
+# changed in bulk, pages holds the primary keys of the affected draft pages
+post_mark_descendants_pending = Signal(providing_args=["instance", "language", "pages"])
+post_mark_descendants_published = Signal(providing_args=["instance", "language", "pages"])
+
+# fired once after the paths of the descendants of a title have been
+# rewritten because the path of the title changed
+title_paths_updated = Signal(providing_args=["instance", "language", "old_path", "new_path", "titles"])
+
+# fired by RenderProfilingMiddleware with the render profile of a request
+render_profiled = Signal(providing_args=["request", "report"])
+
+# fired if a public page with an apphook is added or changed, changes holds
+# the (page id, language) pairs of the changed apphooks or None if all of
+# them have to be reloaded
+urls_need_reloading = Signal(providing_args=["changes"])
 
 ################### apphook reloading ###################
 
@@ -46,6 +63,8 @@ urls_need_reloading.connect(
 signals.pre_delete.connect(pre_delete_plugins, sender=CMSPlugin, dispatch_uid='cms_pre_delete_plugin')
 signals.post_delete.connect(post_delete_plugins, sender=CMSPlugin, dispatch_uid='cms_post_delete_plugin')
 signals.pre_save.connect(pre_save_plugins, sender=CMSPlugin, dispatch_uid='cms_pre_save_plugin')
+signals.post_save.connect(post_change_plugins, sender=CMSPlugin, dispatch_uid='cms_post_change_plugin_save')
+signals.post_delete.connect(post_change_plugins, sender=CMSPlugin, dispatch_uid='cms_post_change_plugin_delete')
 
 ########################## page #########################
 
@@ -54,6 +73,10 @@ signals.post_save.connect(post_save_page, sender=Page, dispatch_uid='cms_post_sa
 signals.pre_delete.connect(pre_delete_page, sender=Page, dispatch_uid='cms_pre_delete_page')
 signals.post_delete.connect(post_delete_page, sender=Page, dispatch_uid='cms_post_delete_page')
 page_moved.connect(post_moved_page, sender=Page, dispatch_uid='cms_post_move_page')
+post_publish.connect(post_publish_page, sender=Page, dispatch_uid='cms_post_publish_page')
+post_unpublish.connect(post_publish_page, sender=Page, dispatch_uid='cms_post_unpublish_page')
+signals.m2m_changed.connect(post_change_page_placeholders, sender=Page.placeholders.through,
+                            dispatch_uid='cms_post_change_page_placeholders')
 
 ######################### title #########################
 
@@ -96,6 +119,17 @@ if get_cms_setting('PERMISSION'):
     signals.pre_delete.connect(pre_delete_globalpagepermission, sender=GlobalPagePermission,
                                dispatch_uid='cms_pre_delete_globalpagepermission')
 
+######################## toolbar #########################
+
+signals.post_save.connect(post_save_log_entry, sender=LogEntry, dispatch_uid='cms_post_save_log_entry')
+signals.post_save.connect(post_save_user_settings, sender=UserSettings, dispatch_uid='cms_post_save_user_settings')
+signals.post_delete.connect(post_save_user_settings, sender=UserSettings, dispatch_uid='cms_post_delete_user_settings')
+
+######################## search ##########################
+
+post_publish.connect(update_search_index, sender=Page, dispatch_uid='cms_update_search_index')
+post_unpublish.connect(remove_search_index, sender=Page, dispatch_uid='cms_remove_search_index')
+
 ###################### reversion #########################
 
 if is_installed('reversion'):
@@ -10,12 +10,29 @@ from cms.utils.apphook_reload import mark_urlconf_as_changed
 
 DISPATCH_UID = 'cms-restart'
 
+# The (page id, language) pairs of the apphooked titles changed since the
+# urls were last marked as stale. None stands for a change which requires
+# all apphooks to be reloaded.
+_changed_apphooks = set()
+
+
+def register_apphook_change(page_id=None, language=None):
+    """
+    Schedules the reload of the apphook urls at the end of the request.
+    Without a page and language, all apphooks are reloaded.
+    """
+    if page_id is None:
+        _changed_apphooks.add(None)
+    else:
+        _changed_apphooks.add((page_id, language))
+    request_finished.connect(trigger_restart, dispatch_uid=DISPATCH_UID)
+
 
 def trigger_server_restart(**kwargs):
     """
     Marks the URLs as stale so that they can be reloaded.
     """
-    mark_urlconf_as_changed()
+    mark_urlconf_as_changed(changes=kwargs.get('changes'))
 
 
 def apphook_pre_title_checker(instance, **kwargs):
@@ -36,9 +53,9 @@ def apphook_post_page_checker(page):
                 old_page.application_urls != page.application_urls or old_page.application_namespace != page.application_namespace)) or (
             not old_page and page.application_urls):
 
-        from cms.cache import invalidate_cms_page_cache
-        invalidate_cms_page_cache()
-        request_finished.connect(trigger_restart, dispatch_uid=DISPATCH_UID)
+        from cms.cache.invalidation import invalidate_page_cache
+        invalidate_page_cache()
+        register_apphook_change()
 
 
 def apphook_post_title_checker(instance, **kwargs):
@@ -50,10 +67,7 @@ def apphook_post_title_checker(instance, **kwargs):
     old_title = getattr(instance, '_old_data', None)
     if not old_title:
         if instance.page.application_urls:
-            request_finished.connect(
-                trigger_restart,
-                dispatch_uid=DISPATCH_UID
-            )
+            register_apphook_change(instance.page_id, instance.language)
     else:
         old_values = (
             old_title.published,
@@ -70,17 +84,21 @@ def apphook_post_title_checker(instance, **kwargs):
             instance.slug,
         )
         if old_values != new_values and (old_values[2] or new_values[2]):
-            request_finished.connect(trigger_restart, dispatch_uid=DISPATCH_UID)
+            if old_values[1:3] != new_values[1:3]:
+                # The apphook itself changed
+                register_apphook_change()
+            else:
+                register_apphook_change(instance.page_id, instance.language)
 
 
 def apphook_post_delete_title_checker(instance, **kwargs):
     """
     Check if this was an apphook
     """
-    from cms.cache import invalidate_cms_page_cache
-    invalidate_cms_page_cache()
+    from cms.cache.invalidation import invalidate_page_cache
+    invalidate_page_cache()
     if instance.page.application_urls:
-        request_finished.connect(trigger_restart, dispatch_uid=DISPATCH_UID)
+        register_apphook_change(instance.page_id, instance.language)
 
 
 def apphook_post_delete_page_checker(instance, **kwargs):
@@ -88,7 +106,7 @@ def apphook_post_delete_page_checker(instance, **kwargs):
     Check if this was an apphook
     """
     if instance.application_urls:
-        request_finished.connect(trigger_restart, dispatch_uid=DISPATCH_UID)
+        register_apphook_change()
 
 # import the logging library
 import logging
@@ -101,7 +119,13 @@ def trigger_restart(**kwargs):
     from cms.signals import urls_need_reloading
 
     request_finished.disconnect(trigger_restart, dispatch_uid=DISPATCH_UID)
-    urls_need_reloading.send(sender=None)
+
+    if None in _changed_apphooks:
+        changes = None
+    else:
+        changes = frozenset(_changed_apphooks)
+    _changed_apphooks.clear()
+    urls_need_reloading.send(sender=None, changes=changes)
 
 
 def debug_server_restart(**kwargs):
@@ -4,12 +4,15 @@ import warnings
 from django.core.exceptions import ObjectDoesNotExist
 from django.template import TemplateDoesNotExist
 
-from cms.cache.permissions import clear_permission_cache
+from cms.cache.invalidation import invalidate_menu, invalidate_page_cache, invalidate_permissions
+from cms.cache.page import clear_page_inheritance_cache
+from cms.cache.placeholder import clear_inherited_placeholders_cache, clear_page_placeholders_cache
+from cms.cache.publication import update_publication_boundary
+from cms.constants import TEMPLATE_INHERITANCE_MAGIC
 from cms.exceptions import NoHomeFound
-from cms.models import Page
+from cms.models import Page, Title
 from cms.signals.apphook import apphook_post_delete_page_checker, apphook_post_page_checker
 from cms.signals.title import update_title, update_title_paths
-from menus.menu_pool import menu_pool
 
 
 def pre_save_page(instance, **kwargs):
@@ -18,23 +21,59 @@ def pre_save_page(instance, **kwargs):
         instance.old_page = Page.objects.get(pk=instance.pk)
     except ObjectDoesNotExist:
         pass
-    menu_pool.clear(instance.site_id)
-    clear_permission_cache()
+    invalidate_menu(instance.site_id)
+    invalidate_permissions()
 
 
 def post_save_page(instance, **kwargs):
+    if instance.old_page and (
+            instance.old_page.template != instance.template or
+            instance.old_page.xframe_options != instance.xframe_options or
+            instance.old_page.parent_id != instance.parent_id or
+            instance.old_page.site_id != instance.site_id):
+        # Clear what the descendants inherit before they are rescanned
+        clear_page_inheritance_cache(instance.old_page.site_id)
+        clear_page_inheritance_cache(instance.site_id)
     if not kwargs.get('raw'):
         try:
             instance.rescan_placeholders()
         except TemplateDoesNotExist as e:
             warnings.warn('Exception occurred: %s template does not exists' % e)
         update_home(instance)
+        if instance.old_page and instance.old_page.template != instance.template:
+            rescan_inherited_placeholders(instance)
+            clear_inherited_placeholders_cache()
     if instance.old_page is None or instance.old_page.parent_id != instance.parent_id or instance.is_home != instance.old_page.is_home:
-        pages = [instance] + list(instance.get_descendants())
-        for page in pages:
-            for title in page.title_set.all().select_related('page'):
+        # Descendant titles are rewritten in bulk by post_save_title
+        languages = set()
+
+        for title in instance.title_set.all().select_related('page'):
+            update_title(title)
+            title._publisher_keep_state = True
+            title.save()
+            languages.add(title.language)
+
+        if instance.old_page is not None:
+            # The paths of the descendant titles in other languages were
+            # built from a fallback language, they are saved one by one,
+            # parents first.
+            descendant_titles = (
+                Title
+                .objects
+                .filter(
+                    page__path__startswith=instance.path,
+                    page__depth__gt=instance.depth,
+                    page__site=instance.site_id,
+                )
+                .exclude(language__in=languages)
+                .select_related('page')
+                .order_by('page__path')
+            )
+
+            for title in descendant_titles:
                 update_title(title)
                 title._publisher_keep_state = True
+                title.tmp_prevent_descendant_update = True
                 title.save()
     if (instance.old_page is None and instance.application_urls) or (instance.old_page and (
                 instance.old_page.application_urls != instance.application_urls or instance.old_page.application_namespace != instance.application_namespace)):
@@ -53,26 +92,71 @@ def post_save_page(instance, **kwargs):
 
 
 def pre_delete_page(instance, **kwargs):
-    menu_pool.clear(instance.site_id)
+    invalidate_menu(instance.site_id)
     for placeholder in instance.get_placeholders():
         for plugin in placeholder.get_plugins().order_by('-depth'):
             plugin._no_reorder = True
             plugin.delete(no_mp=True)
         placeholder.delete()
-    clear_permission_cache()
+    invalidate_permissions()
 
 
 def post_delete_page(instance, **kwargs):
     update_home(instance, **kwargs)
     apphook_post_delete_page_checker(instance)
-    from cms.cache import invalidate_cms_page_cache
-    invalidate_cms_page_cache()
+    invalidate_page_cache()
 
 
 def post_moved_page(instance, **kwargs):
     update_title_paths(instance, **kwargs)
     update_home(instance, **kwargs)
 
+    if instance.template == TEMPLATE_INHERITANCE_MAGIC:
+        try:
+            instance.rescan_placeholders()
+        except TemplateDoesNotExist as e:
+            warnings.warn('Exception occurred: %s template does not exists' % e)
+    rescan_inherited_placeholders(instance)
+    # The ancestors of the moved pages changed
+    clear_inherited_placeholders_cache()
+
+
+def rescan_inherited_placeholders(instance):
+    """
+    Creates the placeholders missing on the descendants of instance which
+    inherit their template, as rendering doesn't create any.
+    """
+    # instance.numchild may be outdated, get_descendants() can't be used
+    descendants = Page.objects.filter(
+        path__startswith=instance.path,
+        depth__gt=instance.depth,
+        template=TEMPLATE_INHERITANCE_MAGIC,
+    )
+
+    for page in descendants:
+        try:
+            page.rescan_placeholders()
+        except TemplateDoesNotExist as e:
+            warnings.warn('Exception occurred: %s template does not exists' % e)
+
+
+def post_change_page_placeholders(instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+
+    if not reverse:
+        clear_page_placeholders_cache(instance.pk)
+    elif pk_set:
+        for page_id in pk_set:
+            clear_page_placeholders_cache(page_id)
+    clear_inherited_placeholders_cache()
+
+
+def post_publish_page(instance, **kwargs):
+    # Look up the next publication date of the site right away,
+    # so that the first render after publishing doesn't have to.
+    update_publication_boundary(instance.site_id)
+
 
 def update_home(instance, **kwargs):
     """
@@ -1,8 +1,7 @@
 # -*- coding: utf-8 -*-
 
-from cms.cache.permissions import clear_user_permission_cache
+from cms.cache.invalidation import invalidate_menu, invalidate_page_cache, invalidate_permissions
 from cms.models import PageUser, PageUserGroup
-from menus.menu_pool import menu_pool
 
 
 def post_save_user(instance, raw, created, **kwargs):
@@ -42,46 +41,49 @@ def post_save_user_group(instance, raw, created, **kwargs):
 
 
 def pre_save_user(instance, raw, **kwargs):
-    clear_user_permission_cache(instance)
+    invalidate_permissions(instance)
 
 
 def pre_delete_user(instance, **kwargs):
-    clear_user_permission_cache(instance)
+    invalidate_permissions(instance)
 
 
 def pre_save_group(instance, raw, **kwargs):
     if instance.pk:
         user_set = getattr(instance, 'user_set')
         for user in user_set.all():
-            clear_user_permission_cache(user)
+            invalidate_permissions(user)
 
 
 def pre_delete_group(instance, **kwargs):
     user_set = getattr(instance, 'user_set')
     for user in user_set.all():
-        clear_user_permission_cache(user)
+        invalidate_permissions(user)
 
 
 def _clear_users_permissions(instance):
     if instance.user:
-        clear_user_permission_cache(instance.user)
+        invalidate_permissions(instance.user)
     if instance.group:
         user_set = getattr(instance.group, 'user_set')
         for user in user_set.all():
-            clear_user_permission_cache(user)
+            invalidate_permissions(user)
 
 
 def pre_save_pagepermission(instance, raw, **kwargs):
     _clear_users_permissions(instance)
+    # The view restrictions of the pages are cached with them
+    invalidate_page_cache()
 
 
 def pre_delete_pagepermission(instance, **kwargs):
     _clear_users_permissions(instance)
+    invalidate_page_cache()
 
 
 def pre_save_globalpagepermission(instance, raw, **kwargs):
     _clear_users_permissions(instance)
-    menu_pool.clear(all=True)
+    invalidate_menu(all=True)
 
 
 def pre_delete_globalpagepermission(instance, **kwargs):
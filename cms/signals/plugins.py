@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
-from cms.models import CMSPlugin, Placeholder
+from cms.cache.placeholder import clear_inherited_placeholders_cache
+from cms.models import CMSPlugin, Page, Placeholder
 
 
 def get_placeholder(plugin):
@@ -66,3 +67,19 @@ def post_delete_plugins(**kwargs):
         if p.position != pos:
             p.position = pos
             p.save()
+
+
+def post_change_plugins(**kwargs):
+    # Adding, moving or removing a plugin may change the placeholders
+    # the descendants of its page inherit their content from.
+    plugin = kwargs['instance']
+
+    if not plugin.placeholder_id:
+        return
+
+    page_ids = list(Page.objects.filter(placeholders=plugin.placeholder_id).values_list('pk', flat=True))
+
+    if page_ids:
+        # Plugins outside of pages (clipboard, static placeholders...)
+        # are never inherited.
+        clear_inherited_placeholders_cache(page_ids)
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+from cms.search import remove_page_index, update_page_index
+
+
+def update_search_index(instance, language, **kwargs):
+    """
+    Refreshes the search document of the newly published page
+    """
+    if instance.publisher_public_id:
+        update_page_index(instance.publisher_public, language)
+
+
+def remove_search_index(instance, language, **kwargs):
+    if instance.publisher_public_id:
+        remove_page_index(instance.publisher_public, language)
@@ -1,8 +1,16 @@
 # -*- coding: utf-8 -*-
 
+from django.db.models import Value
+from django.db.models.functions import Concat, Substr
+
+from cms.cache.invalidation import invalidate_menu
 from cms.models import Title, Page
-from cms.signals.apphook import apphook_pre_title_checker, apphook_post_title_checker, apphook_post_delete_title_checker
-from menus.menu_pool import menu_pool
+from cms.signals.apphook import (
+    apphook_pre_title_checker,
+    apphook_post_title_checker,
+    apphook_post_delete_title_checker,
+    register_apphook_change,
+)
 
 
 def update_title_paths(instance, **kwargs):
@@ -39,7 +47,7 @@ def pre_save_title(instance, raw, **kwargs):
         instance.page._publisher_keep_state = True
         instance.page.save(no_signals=True)
     if not instance.page.publisher_is_draft:
-        menu_pool.clear(instance.page.site_id)
+        invalidate_menu(instance.page.site_id)
     if instance.pk and not hasattr(instance, "tmp_path"):
         instance.tmp_path = None
         try:
@@ -54,23 +62,97 @@ def pre_save_title(instance, raw, **kwargs):
     apphook_pre_title_checker(instance, **kwargs)
 
 
+def _get_path_prefix(path):
+    return u'%s/' % path if path else u''
+
+
+def update_descendant_title_paths(instance, old_path):
+    """
+    Rewrites the path of all descendant titles in the language of instance
+    whose path was derived from old_path, using a single UPDATE statement.
+
+    Titles with an url overwrite are left untouched, and so is the subtree
+    below them because their paths are derived from the overwritten url.
+    Returns the list of primary keys of the updated titles.
+    """
+    page = instance.page
+    old_prefix = _get_path_prefix(old_path)
+    new_prefix = _get_path_prefix(instance.path)
+
+    descendants = Title.objects.filter(
+        page__path__startswith=page.path,
+        page__depth__gt=page.depth,
+        page__site=page.site_id,
+        language=instance.language,
+    )
+    overwritten_paths = (
+        descendants
+        .filter(has_url_overwrite=True)
+        .values_list('page__path', flat=True)
+    )
+    titles = descendants.filter(has_url_overwrite=False, path__startswith=old_prefix)
+
+    for path in overwritten_paths:
+        titles = titles.exclude(page__path__startswith=path)
+
+    title_ids = list(titles.values_list('pk', flat=True))
+
+    if not title_ids:
+        return title_ids
+
+    if instance.publisher_is_draft:
+        hooked_pages = []
+    else:
+        hooked_pages = list(
+            titles
+            .exclude(page__application_urls=None)
+            .exclude(page__application_urls='')
+            .values_list('page', flat=True)
+        )
+    titles.update(path=Concat(Value(new_prefix), Substr('path', len(old_prefix) + 1)))
+
+    if not instance.publisher_is_draft:
+        invalidate_menu(page.site_id)
+
+    for page_id in hooked_pages:
+        register_apphook_change(page_id, instance.language)
+
+    from cms.signals import title_paths_updated
+
+    title_paths_updated.send(
+        sender=Title,
+        instance=instance,
+        language=instance.language,
+        old_path=old_path,
+        new_path=instance.path,
+        titles=title_ids,
+    )
+    return title_ids
+
+
 def post_save_title(instance, raw, created, **kwargs):
     # Update descendants only if path changed
     prevent_descendants = hasattr(instance, 'tmp_prevent_descendant_update')
-    if instance.path != getattr(instance, 'tmp_path', None) and not prevent_descendants:
-        child_titles = Title.objects.filter(
-            page__depth=instance.page.depth + 1,
-            page__path__range=Page._get_children_path_interval(instance.page.path),
-            language=instance.language,
-            has_url_overwrite=False, # TODO: what if child has no url overwrite?
-        ).order_by('page__depth', 'page__path')
-
-        for child_title in child_titles:
-            child_title.path = ''  # just reset path
-            child_title.tmp_prevent_descendant_update = True
-            child_title._publisher_keep_state = True
-            child_title.save()
-            # remove temporary attributes
+    old_path = getattr(instance, 'tmp_path', None)
+
+    if instance.path != old_path and not prevent_descendants:
+        if old_path is not None:
+            update_descendant_title_paths(instance, old_path)
+        else:
+            # There's no previous path to rewrite from, the children of a new
+            # title may be using a path built from a fallback language.
+            child_titles = Title.objects.filter(
+                page__depth=instance.page.depth + 1,
+                page__path__range=Page._get_children_path_interval(instance.page.path),
+                language=instance.language,
+                has_url_overwrite=False,
+            ).order_by('page__depth', 'page__path')
+
+            for child_title in child_titles:
+                child_title.path = ''  # just reset path
+                child_title._publisher_keep_state = True
+                child_title.save()
+    # remove temporary attributes
     if hasattr(instance, 'tmp_path'):
         del instance.tmp_path
     if prevent_descendants:
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+from django.contrib.admin.models import ADDITION, CHANGE
+
+from cms.cache.toolbar import clear_user_settings_cache, set_latest_log_entry
+
+
+def post_save_log_entry(instance, created, **kwargs):
+    if created and instance.action_flag in (ADDITION, CHANGE):
+        set_latest_log_entry(instance.user_id, instance.pk)
+
+
+def post_save_user_settings(instance, **kwargs):
+    clear_user_settings_cache(instance.user_id)
@@ -1,26 +1,25 @@
 # -*- coding: utf-8 -*-
-
+from django.conf import settings
 from django.contrib.sitemaps import Sitemap
 from django.contrib.sites.models import Site
-from django.db.models import Q
-from django.utils import translation
-
-from cms.models import Title
-
+from django.core.urlresolvers import reverse
+from django.db.models import Max, Q
+from django.utils.encoding import iri_to_uri
 
-def from_iterable(iterables):
-    """
-    Backport of itertools.chain.from_iterable
-    """
-    for it in iterables:
-        for element in it:
-            yield element
+from cms.cache.sitemap import get_sitemap_cache, set_sitemap_cache
+from cms.models import CMSPlugin, Title
+from cms.utils.i18n import force_language
 
 
 class CMSSitemap(Sitemap):
     changefreq = "monthly"
     priority = 0.5
 
+    def __init__(self, language=None):
+        # Only list the titles in this language if given
+        self.language = language
+        self._root_urls = {}
+
     def items(self):
         #
         # It is counter-productive to provide entries for:
@@ -50,19 +49,62 @@ class CMSSitemap(Sitemap):
             Q(redirect='') | Q(redirect__isnull=True),
             page__login_required=False,
             page__site=Site.objects.get_current(),
-        ).order_by('page__path')
-        return all_titles
+        )
+
+        if self.language:
+            all_titles = all_titles.filter(language=self.language)
+
+        # The newest plugin of every page is looked up in the same query
+        all_titles = all_titles.annotate(
+            plugins_changed_date=Max('page__placeholders__cmsplugin__changed_date'),
+        )
+        return all_titles.select_related('page').order_by('page__path')
 
     def lastmod(self, title):
-        modification_dates = [title.page.changed_date, title.page.publication_date]
-        plugins_for_placeholder = lambda placeholder: placeholder.get_plugins()
-        plugins = from_iterable(map(plugins_for_placeholder, title.page.placeholders.all()))
-        plugin_modification_dates = map(lambda plugin: plugin.changed_date, plugins)
-        modification_dates.extend(plugin_modification_dates)
-        return max(modification_dates)
+        try:
+            plugins_changed_date = title.plugins_changed_date
+        except AttributeError:
+            plugins_changed_date = (
+                CMSPlugin
+                .objects
+                .filter(placeholder__page=title.page_id)
+                .aggregate(changed_date=Max('changed_date'))['changed_date']
+            )
+        modification_dates = [title.page.changed_date, title.page.publication_date, plugins_changed_date]
+        return max(date for date in modification_dates if date)
 
     def location(self, title):
-        translation.activate(title.language)
-        url = title.page.get_absolute_url(title.language)
-        translation.deactivate()
+        # Same as Page.get_absolute_url() without looking up the title again
+        # or reversing the url of every title.
+        try:
+            root_url = self._root_urls[title.language]
+        except KeyError:
+            with force_language(title.language):
+                root_url = self._root_urls[title.language] = reverse('pages-root')
+
+        if title.page.is_home:
+            return root_url
+
+        url = root_url + iri_to_uri(title.path or title.slug)
+
+        if settings.APPEND_SLASH:
+            url += '/'
         return url
+
+    def _urls(self, page, protocol, domain):
+        # Only the urls rendered by this request have their "item" (the
+        # title), the cached ones just have the fields the sitemap template
+        # shows. Templates and subclasses must not rely on "item".
+        site_id = Site.objects.get_current().pk
+        cached = get_sitemap_cache(self, site_id, page, protocol, domain)
+
+        if cached is None:
+            urls = super(CMSSitemap, self)._urls(page, protocol, domain)
+            latest_lastmod = getattr(self, 'latest_lastmod', None)
+            set_sitemap_cache(self, site_id, page, protocol, domain, urls, latest_lastmod)
+        else:
+            urls, latest_lastmod = cached
+
+            if latest_lastmod:
+                self.latest_lastmod = latest_lastmod
+        return urls
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+
+"""
+Performance benchmarks of the CMS.
+
+A synthetic site (see ``fixtures.create_fixture``) is built in a fresh test
+database, then the time, the database queries and the cache operations of
+rendering, publishing, copying, searching and listing its pages are measured
+(see ``runner``). The results are JSON documents, two of which can be
+compared to spot regressions::
+
+    python manage.py benchmark --pages 200 --output before.json
+    python manage.py benchmark --pages 200 --output after.json
+    python manage.py benchmark --compare before.json after.json
+"""
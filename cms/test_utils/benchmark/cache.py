@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+from functools import wraps
+
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def _counted(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # Operations made of others (get_many(), incr()...) count once
+        if not self._depth:
+            self.operations += 1
+        self._depth += 1
+
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._depth -= 1
+    return wrapper
+
+
+class CountingLocMemCache(LocMemCache):
+    """
+    A local memory cache counting the operations made on it, each of which
+    would be a round-trip to a shared cache server.
+    """
+
+    def __init__(self, name, params):
+        super(CountingLocMemCache, self).__init__(name, params)
+        self.operations = 0
+        self._depth = 0
+
+    add = _counted(LocMemCache.add)
+    get = _counted(LocMemCache.get)
+    set = _counted(LocMemCache.set)
+    incr = _counted(LocMemCache.incr)
+    has_key = _counted(LocMemCache.has_key)
+    delete = _counted(LocMemCache.delete)
+    clear = _counted(LocMemCache.clear)
+    get_many = _counted(LocMemCache.get_many)
+    set_many = _counted(LocMemCache.set_many)
+    delete_many = _counted(LocMemCache.delete_many)
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.contrib.sites.models import Site
+
+from cms.api import add_plugin, assign_user_to_page, create_page, create_title
+from cms.utils.i18n import get_public_languages
+from cms.utils.permissions import set_current_user
+
+
+WORDS = (
+    'lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur', 'adipiscing',
+    'elit', 'sed', 'eiusmod', 'tempor', 'incididunt', 'labore', 'dolore',
+    'magna', 'aliqua', 'benchmark',
+)
+
+
+class BenchmarkFixture(object):
+    """
+    A synthetic site: ``pages`` pages in a tree ``depth`` levels deep,
+    translated in ``languages`` languages and published in all of them,
+    with ``plugins`` text plugins per placeholder and language, and
+    ``permissions`` page permissions granted to a staff user.
+
+    The same parameters and seed build the same site.
+    """
+    template = 'col_two.html'
+
+    def __init__(self, pages=100, depth=3, plugins=3, languages=2, permissions=10, seed=0):
+        self.params = {
+            'pages': pages,
+            'depth': depth,
+            'plugins': plugins,
+            'languages': languages,
+            'permissions': permissions,
+            'seed': seed,
+        }
+        self.random = random.Random(seed)
+        self.site = Site.objects.get_current()
+        self.languages = get_public_languages(self.site.pk)[:languages]
+        # Draft pages, parents before their children
+        self.pages = []
+        self.superuser = None
+        self.staff_user = None
+
+    def create(self):
+        self.superuser = self._create_user('benchmark-admin', is_superuser=True)
+        self.staff_user = self._create_user('benchmark-editor', is_superuser=False)
+        self.staff_user.user_permissions.add(*Permission.objects.filter(content_type__app_label='cms'))
+        set_current_user(self.superuser)
+
+        try:
+            self._create_pages()
+            self._create_permissions()
+        finally:
+            set_current_user(None)
+        return self
+
+    @property
+    def leaf(self):
+        """The deepest page, the most expensive to render."""
+        return self.pages[-1]
+
+    @property
+    def branch(self):
+        """The parent of the deepest page, or that page if it's a root."""
+        leaf = self.leaf
+
+        for page in self.pages:
+            if page.pk == leaf.parent_id:
+                return page
+        return leaf
+
+    def get_fan_out(self):
+        """
+        Returns the number of children per page (and of root pages) needed
+        to fit all pages in a tree of the given depth.
+        """
+        pages, depth = self.params['pages'], self.params['depth']
+        fan_out = 1
+
+        while sum(fan_out ** level for level in range(1, depth + 1)) < pages:
+            fan_out += 1
+        return fan_out
+
+    def get_text(self, length=30):
+        return ' '.join(self.random.choice(WORDS) for index in range(length))
+
+    def _create_user(self, username, is_superuser):
+        User = get_user_model()
+        user = User(is_staff=True, is_superuser=is_superuser, **{User.USERNAME_FIELD: username})
+        user.set_password(username)
+        user.save()
+        return user
+
+    def _create_pages(self):
+        fan_out = self.get_fan_out()
+        parents = [None]
+
+        for level in range(self.params['depth']):
+            children = []
+
+            for parent in parents:
+                for index in range(fan_out):
+                    if len(self.pages) >= self.params['pages']:
+                        break
+                    children.append(self._create_page(parent))
+            parents = children
+
+    def _create_page(self, parent):
+        number = len(self.pages) + 1
+        page = create_page(
+            'Page %d' % number,
+            self.template,
+            self.languages[0],
+            parent=parent,
+            in_navigation=True,
+            created_by=self.superuser,
+        )
+
+        for language in self.languages[1:]:
+            create_title(language, 'Page %d %s' % (number, language), page)
+
+        for placeholder in page.placeholders.all():
+            for language in self.languages:
+                for index in range(self.params['plugins']):
+                    add_plugin(placeholder, 'TextPlugin', language, body=self.get_text())
+
+        for language in self.languages:
+            page.publish(language)
+        self.pages.append(page)
+        return page
+
+    def _create_permissions(self):
+        for index in range(self.params['permissions']):
+            assign_user_to_page(
+                self.random.choice(self.pages),
+                self.staff_user,
+                can_add=True,
+                can_change=True,
+                can_publish=True,
+            )
+
+
+def create_fixture(**params):
+    return BenchmarkFixture(**params).create()
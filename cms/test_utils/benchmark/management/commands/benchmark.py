@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, print_function, unicode_literals
+
+import io
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils.encoding import force_text
+
+from cms.test_utils.benchmark.fixtures import create_fixture
+from cms.test_utils.benchmark.runner import BENCHMARKS, compare_results, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = ('Measure the time, queries and cache operations of the CMS against a synthetic '
+            'site built in a test database, or compare the results of two runs')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', action='store', dest='pages', type=int, default=100,
+                            help='Number of pages')
+        parser.add_argument('--depth', action='store', dest='depth', type=int, default=3,
+                            help='Depth of the page tree')
+        parser.add_argument('--plugins', action='store', dest='plugins', type=int, default=3,
+                            help='Number of plugins per placeholder and language')
+        parser.add_argument('--languages', action='store', dest='languages', type=int, default=2,
+                            help='Number of languages the pages are published in')
+        parser.add_argument('--permissions', action='store', dest='permissions', type=int, default=10,
+                            help='Number of page permissions granted to a staff user')
+        parser.add_argument('--seed', action='store', dest='seed', type=int, default=0,
+                            help='Seed of the random choices of the fixture')
+        parser.add_argument('--repeat', action='store', dest='repeat', type=int, default=5,
+                            help='Number of runs of each benchmark')
+        parser.add_argument('--benchmark', action='append', dest='benchmarks', choices=list(BENCHMARKS),
+                            help='Benchmark to run, can be repeated (all by default)')
+        parser.add_argument('--output', action='store', dest='output',
+                            help='File to write the JSON results to')
+        parser.add_argument('--compare', action='store', dest='compare', nargs=2, metavar=('BEFORE', 'AFTER'),
+                            help='Compare the JSON results of two runs instead of running the benchmarks')
+        parser.add_argument('--threshold', action='store', dest='threshold', type=float, default=10,
+                            help='Increase of the median time (in percent) reported as a regression')
+
+    def handle(self, *args, **options):
+        if options['compare']:
+            self.compare(options['compare'], options['threshold'] / 100)
+            return
+
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be at least 1.')
+
+        if options['pages'] < 1 or options['depth'] < 1 or options['languages'] < 1:
+            raise CommandError('--pages, --depth and --languages must be at least 1.')
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+        try:
+            self.stdout.write('Creating %(pages)d pages...\n' % options)
+            fixture = create_fixture(
+                pages=options['pages'],
+                depth=options['depth'],
+                plugins=options['plugins'],
+                languages=options['languages'],
+                permissions=options['permissions'],
+                seed=options['seed'],
+            )
+            self.stdout.write('%-20s %10s %10s %10s %10s\n' % (
+                'benchmark', 'median ms', 'max ms', 'queries', 'cache ops'))
+            results = run_benchmarks(
+                fixture,
+                names=options['benchmarks'],
+                repeat=options['repeat'],
+                callback=self.write_summary,
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if options['output']:
+            with io.open(options['output'], 'w', encoding='utf-8') as output:
+                output.write(force_text(json.dumps(results, indent=2)))
+
+    def write_summary(self, name, summary):
+        self.stdout.write('%-20s %10.1f %10.1f %10s %10s\n' % (
+            name,
+            summary['time']['median'],
+            summary['time']['max'],
+            summary['queries'],
+            summary['cache_operations'],
+        ))
+
+    def compare(self, paths, threshold):
+        before, after = [_read_results(path) for path in paths]
+
+        for key in ('environment', 'fixture'):
+            if before[key] != after[key]:
+                self.stdout.write('Warning: the runs have a different %s\n' % key)
+
+        rows = compare_results(before, after, threshold)
+        self.stdout.write('%-20s %-18s %12s %12s %9s\n' % ('benchmark', 'metric', 'before', 'after', 'change'))
+
+        for row in rows:
+            change = (row['after'] - row['before']) * 100.0 / row['before'] if row['before'] else 0
+            self.stdout.write('%-20s %-18s %12.1f %12.1f %+8.1f%%%s\n' % (
+                row['name'],
+                row['metric'],
+                row['before'],
+                row['after'],
+                change,
+                '  REGRESSION' if row['regression'] else '',
+            ))
+
+        regressions = sum(1 for row in rows if row['regression'])
+
+        if regressions:
+            raise CommandError('%d regression(s) found.' % regressions)
+
+
+def _read_results(path):
+    try:
+        with io.open(path, encoding='utf-8') as results:
+            return json.load(results)
+    except (IOError, ValueError) as exc:
+        raise CommandError('Could not read the results in %s: %s' % (path, exc))
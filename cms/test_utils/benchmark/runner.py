@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+import platform
+import timeit
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from importlib import import_module
+
+import django
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.db import connection
+from django.template import Context, Template
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import translation
+
+import cms
+
+from cms.cache.local import cache as cms_cache
+from cms.models import Page
+from cms.sitemaps import CMSSitemap
+from cms.utils.plugins import assign_plugins
+from cms.views import details
+
+
+RESULTS_VERSION = 1
+
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'cms.test_utils.benchmark.cache.CountingLocMemCache',
+        'LOCATION': 'cms-benchmark',
+    }
+}
+
+BENCHMARKS = OrderedDict()
+
+
+def benchmark(name):
+    """
+    Registers a benchmark. It's called with the fixture and a ``measure``
+    context manager, which it must enter exactly once around what is measured.
+    """
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+class Recorder(object):
+    """
+    Records the wall time (in milliseconds), the database queries and the
+    cache operations of each ``measure()`` block.
+    """
+
+    def __init__(self):
+        self.runs = []
+
+    @contextmanager
+    def measure(self):
+        backend = caches['default']
+        cache_operations = getattr(backend, 'operations', 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            start = timeit.default_timer()
+            yield
+            elapsed = timeit.default_timer() - start
+
+        self.runs.append({
+            'time': elapsed * 1000,
+            'queries': len(queries),
+            'cache_operations': getattr(backend, 'operations', 0) - cache_operations,
+        })
+
+    def get_summary(self):
+        times = sorted(run['time'] for run in self.runs)
+        return OrderedDict((
+            ('runs', len(self.runs)),
+            ('time', OrderedDict((
+                ('min', times[0]),
+                ('median', _median(times)),
+                ('mean', sum(times) / len(times)),
+                ('max', times[-1]),
+            ))),
+            # These hardly ever change from a run to the next
+            ('queries', _median(sorted(run['queries'] for run in self.runs))),
+            ('cache_operations', _median(sorted(run['cache_operations'] for run in self.runs))),
+        ))
+
+
+def _median(values):
+    middle = len(values) // 2
+
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+def _get_request(path, user=None, language=None, data=None):
+    request = RequestFactory().get(path, data or {})
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+    request.user = user or AnonymousUser()
+    request.LANGUAGE_CODE = language or settings.LANGUAGE_CODE
+    request.current_page = None
+    return request
+
+
+def _get_public_page(page):
+    return Page.objects.get(pk=page.publisher_public_id)
+
+
+def _get_details_request(page, language):
+    public_page = _get_public_page(page)
+    request = _get_request(public_page.get_absolute_url(language), language=language)
+    return request, public_page.get_path(language)
+
+
+def _render_details(request, slug):
+    response = details(request, slug)
+
+    if hasattr(response, 'render'):
+        response.render()
+    return response
+
+
+@benchmark('details_cold')
+def benchmark_details_cold(fixture, measure):
+    request, slug = _get_details_request(fixture.leaf, fixture.languages[0])
+    cms_cache.clear()
+
+    with measure():
+        _render_details(request, slug)
+
+
+@benchmark('details_warm')
+def benchmark_details_warm(fixture, measure):
+    _render_details(*_get_details_request(fixture.leaf, fixture.languages[0]))
+    request, slug = _get_details_request(fixture.leaf, fixture.languages[0])
+
+    with measure():
+        _render_details(request, slug)
+
+
+@benchmark('show_menu')
+def benchmark_show_menu(fixture, measure):
+    language = fixture.languages[0]
+    public_page = _get_public_page(fixture.leaf)
+    cms_cache.clear()
+    request = _get_request(public_page.get_absolute_url(language), language=language)
+    request.current_page = public_page
+    template = Template('{% load menu_tags %}{% show_menu 0 100 100 100 %}')
+
+    with measure():
+        template.render(Context({'request': request}))
+
+
+@benchmark('assign_plugins')
+def benchmark_assign_plugins(fixture, measure):
+    language = fixture.languages[0]
+    public_page = _get_public_page(fixture.leaf)
+    placeholders = list(public_page.placeholders.all())
+    request = _get_request(public_page.get_absolute_url(language), language=language)
+
+    with measure():
+        assign_plugins(request, placeholders, public_page.get_template(), language)
+
+
+@benchmark('publish')
+def benchmark_publish(fixture, measure):
+    page = Page.objects.get(pk=fixture.branch.pk)
+
+    with measure():
+        page.publish(fixture.languages[0])
+
+
+@benchmark('copy_page')
+def benchmark_copy_page(fixture, measure):
+    page = Page.objects.get(pk=fixture.branch.pk)
+    target = Page.objects.get(pk=fixture.pages[0].pk)
+
+    with measure():
+        copy = page.copy_page(target, fixture.site, position='last-child')
+
+    copy.delete()
+
+
+@benchmark('admin_get_tree')
+def benchmark_admin_get_tree(fixture, measure):
+    language = fixture.languages[0]
+    # Only the pages the editor has permissions on are shown to them
+    user = fixture.staff_user if fixture.params['permissions'] else fixture.superuser
+    request = _get_request('/admin/cms/page/get-tree/', user=user, language=language, data={
+        'language': language,
+        'site': fixture.site.pk,
+        'openNodes[]': [page.pk for page in fixture.pages],
+    })
+    page_admin = admin.site._registry[Page]
+    cms_cache.clear()
+
+    with measure():
+        page_admin.get_tree(request)
+
+
+@benchmark('sitemap')
+def benchmark_sitemap(fixture, measure):
+    cms_cache.clear()
+
+    with measure():
+        CMSSitemap().get_urls(site=fixture.site, protocol='http')
+
+
+@benchmark('search')
+def benchmark_search(fixture, measure):
+    language = fixture.languages[0]
+
+    with measure():
+        list(Page.objects.search('benchmark lorem', language=language))
+
+
+def get_environment():
+    return OrderedDict((
+        ('cms', cms.__version__),
+        ('django', django.get_version()),
+        ('python', platform.python_version()),
+        ('database', connection.vendor),
+        ('cache', BENCHMARK_CACHES['default']['BACKEND']),
+    ))
+
+
+def run_benchmarks(fixture, names=None, repeat=5, callback=None):
+    """
+    Runs the given benchmarks (all of them if None) ``repeat`` times each
+    against the given fixture, with a local memory cache counting its
+    operations.
+
+    Returns the results as a dictionary which can be serialized to JSON.
+    ``callback`` is called with the name and the summary of each benchmark
+    once it's done.
+    """
+    names = names or list(BENCHMARKS)
+    results = OrderedDict()
+
+    with override_settings(CACHES=BENCHMARK_CACHES, ALLOWED_HOSTS=['*']):
+        for name in names:
+            recorder = Recorder()
+
+            with translation.override(fixture.languages[0]):
+                for index in range(repeat):
+                    BENCHMARKS[name](fixture, recorder.measure)
+
+            results[name] = recorder.get_summary()
+
+            if callback:
+                callback(name, results[name])
+
+    return OrderedDict((
+        ('version', RESULTS_VERSION),
+        ('environment', get_environment()),
+        ('fixture', fixture.params),
+        ('benchmarks', results),
+    ))
+
+
+def compare_results(before, after, threshold=0.1):
+    """
+    Compares the benchmarks found in both results.
+
+    Returns a list of dictionaries with the name of the benchmark, the metric
+    ('time', 'queries' or 'cache_operations'), its value before and after and
+    whether it's a regression: a median time more than ``threshold`` (a
+    fraction) higher, or any more queries or cache operations.
+    """
+    rows = []
+
+    for name, summary in after['benchmarks'].items():
+        try:
+            previous = before['benchmarks'][name]
+        except KeyError:
+            continue
+
+        rows.append({
+            'name': name,
+            'metric': 'time',
+            'before': previous['time']['median'],
+            'after': summary['time']['median'],
+            'regression': summary['time']['median'] > previous['time']['median'] * (1 + threshold),
+        })
+
+        for metric in ('queries', 'cache_operations'):
+            rows.append({
+                'name': name,
+                'metric': metric,
+                'before': previous[metric],
+                'after': summary[metric],
+                'regression': summary[metric] > previous[metric],
+            })
+    return rows
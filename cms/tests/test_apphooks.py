@@ -11,10 +11,14 @@ from django.test.utils import override_settings
 from django.utils import six
 from django.utils.timezone import now
 
+from cms import appresolver
 from cms.api import create_page, create_title
 from cms.app_base import CMSApp
 from cms.apphook_pool import apphook_pool
-from cms.appresolver import applications_page_check, clear_app_resolvers, get_app_patterns
+from cms.appresolver import (
+    applications_page_check, clear_app_resolvers, get_app_patterns,
+    get_page_app_resolver, update_app_resolvers,
+)
 from cms.models import Title, Page
 from cms.test_utils.project.placeholderapp.models import Example1
 from cms.test_utils.testcases import CMSTestCase
@@ -212,6 +216,81 @@ class ApphooksTestCase(CMSTestCase):
         self.assertContains(response, de_title.title)
         self.apphook_clear()
 
+    @override_settings(ROOT_URLCONF='cms.test_utils.project.second_urls_for_apphook_tests')
+    def test_update_app_resolvers(self):
+        en_title, de_title = self.create_base_structure(APP_NAME, ['en', 'de'])
+
+        with force_language("en"):
+            self.assertEqual(reverse('sample-settings'), '/en/child_page/child_child_page/settings/')
+
+        resolvers = list(appresolver.APP_RESOLVERS)
+        Title.objects.filter(pk=en_title.pk).update(path='child_page/renamed', slug='renamed')
+
+        self.assertTrue(update_app_resolvers([(en_title.page_id, 'en')]))
+        # The resolvers are updated in place
+        self.assertEqual(appresolver.APP_RESOLVERS, resolvers)
+
+        with force_language("en"):
+            self.assertEqual(reverse('sample-settings'), '/en/child_page/renamed/settings/')
+
+        with force_language("de"):
+            self.assertEqual(reverse('sample-settings'), '/de/child_page/child_child_page/settings/')
+
+        # A page without an apphook yet requires all apphooks to be reloaded
+        self.assertFalse(update_app_resolvers([(en_title.page.parent_id, 'en')]))
+        self.apphook_clear()
+
+    @override_settings(ROOT_URLCONF='cms.test_utils.project.second_urls_for_apphook_tests')
+    def test_update_app_resolvers_after_move(self):
+        en_title = self.create_base_structure(APP_NAME, 'en')
+        child_child_page = en_title.page
+        child_page = child_child_page.parent
+        Page.objects.filter(pk=child_page.pk).update(application_urls=APP_NAME)
+        self.reload_urls()
+
+        # The deepest page comes first
+        self.assertEqual([resolver.page_id for resolver in appresolver.APP_RESOLVERS],
+                         [child_child_page.pk, child_page.pk])
+        self.assertTrue(update_app_resolvers([(child_child_page.pk, 'en')]))
+
+        # The hooked child page is moved before its former parent
+        Page.objects.filter(pk=child_child_page.pk).update(path=child_page.path[:-1] + '0')
+        self.assertFalse(update_app_resolvers([(child_child_page.pk, 'en')]))
+        self.apphook_clear()
+
+    @override_settings(ROOT_URLCONF='cms.test_utils.project.second_urls_for_apphook_tests')
+    def test_page_app_resolver_is_cached(self):
+        en_title = self.create_base_structure(APP_NAME, 'en')
+        page = en_title.page
+
+        resolver = get_page_app_resolver(page, 'en', APP_NAME)
+        self.assertIs(get_page_app_resolver(page, 'en', APP_NAME), resolver)
+        self.assertIsNot(get_page_app_resolver(page, 'de', APP_NAME), resolver)
+
+        response = self.client.get(page.get_absolute_url('en'))
+        self.assertTemplateUsed(response, 'sampleapp/home.html')
+
+        clear_app_resolvers()
+        self.assertIsNot(get_page_app_resolver(page, 'en', APP_NAME), resolver)
+        self.apphook_clear()
+
+    @override_settings(ROOT_URLCONF='cms.test_utils.project.second_urls_for_apphook_tests')
+    def test_applications_page_check_by_path_prefix(self):
+        en_title = self.create_base_structure(APP_NAME, 'en')
+
+        with force_language("en"):
+            path = reverse('sample-settings')
+        request = self.get_request(path)
+
+        with force_language("en"):
+            self.assertEqual(applications_page_check(request, path=path[4:]).pk, en_title.page_id)
+
+            # The page is cached
+            with self.assertNumQueries(0):
+                self.assertEqual(applications_page_check(request, path=path[4:]).pk, en_title.page_id)
+                self.assertIsNone(applications_page_check(request, path='child_page/settings/'))
+        self.apphook_clear()
+
     @override_settings(ROOT_URLCONF='cms.test_utils.project.second_urls_for_apphook_tests')
     def test_apphook_permissions(self):
         en_title, de_title = self.create_base_structure(APP_NAME, ['en', 'de'])
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from cms.models import Page, PagePermission
+from cms.test_utils.benchmark.fixtures import create_fixture
+from cms.test_utils.benchmark.runner import BENCHMARKS, compare_results, run_benchmarks
+from cms.test_utils.testcases import CMSTestCase
+
+
+class BenchmarkTests(CMSTestCase):
+
+    def test_fixture(self):
+        fixture = create_fixture(pages=7, depth=2, plugins=2, languages=2, permissions=3)
+
+        self.assertEqual(fixture.get_fan_out(), 2)
+        self.assertEqual(Page.objects.drafts().count(), 7)
+        self.assertEqual(Page.objects.public().count(), 7)
+        self.assertEqual(max(page.depth for page in Page.objects.drafts()), 2)
+        self.assertEqual(PagePermission.objects.filter(user=fixture.staff_user).count(), 3)
+
+        for page in Page.objects.public():
+            self.assertEqual(page.get_published_languages(), sorted(fixture.languages))
+
+        self.assertEqual(fixture.branch.pk, fixture.leaf.parent_id)
+
+    def test_run_benchmarks(self):
+        fixture = create_fixture(pages=3, depth=2, plugins=1, languages=1, permissions=1)
+        before = run_benchmarks(fixture, repeat=2)
+
+        self.assertEqual(list(before['benchmarks']), list(BENCHMARKS))
+        self.assertEqual(before['fixture']['pages'], 3)
+
+        for summary in before['benchmarks'].values():
+            self.assertEqual(summary['runs'], 2)
+            self.assertTrue(summary['time']['min'] <= summary['time']['median'] <= summary['time']['max'])
+
+        # The cold render fills the caches the warm one reads
+        self.assertGreater(before['benchmarks']['details_cold']['queries'],
+                           before['benchmarks']['details_warm']['queries'])
+        self.assertGreater(before['benchmarks']['details_warm']['cache_operations'], 0)
+        # The copies are removed
+        self.assertEqual(Page.objects.drafts().count(), 3)
+
+        after = run_benchmarks(fixture, names=['search'], repeat=1)
+        after['benchmarks']['search']['queries'] += 1
+        rows = compare_results(before, after)
+
+        self.assertEqual([row['metric'] for row in rows], ['time', 'queries', 'cache_operations'])
+        self.assertTrue(rows[1]['regression'])
+        self.assertFalse(rows[2]['regression'])
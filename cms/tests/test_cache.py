@@ -1,14 +1,24 @@
 # -*- coding: utf-8 -*-
 
+import datetime
+import gzip
 import time
 
+from io import BytesIO
+
 from django.conf import settings
+from django.http import HttpResponse
 from django.template import Context
+from django.test import RequestFactory
 
 from sekizai.context import SekizaiContext
 
 from cms.api import add_plugin, create_page, create_title
 from cms.cache import _get_cache_version, invalidate_cms_page_cache
+from cms.cache import invalidation
+from cms.cache.local import cache as local_cache
+from cms.cache.page import (clear_page_cache_stats, get_page_cache_path, get_page_cache_stats,
+                            record_page_cache_lookup)
 from cms.cache.placeholder import (
     _get_placeholder_cache_version_key,
     _get_placeholder_cache_version,
@@ -36,6 +46,7 @@ from cms.test_utils.util.fuzzy_int import FuzzyInt
 from cms.toolbar.toolbar import CMSToolbar
 from cms.utils import get_cms_setting
 from cms.utils.helpers import get_timezone_name
+from menus.models import CacheKey
 
 
 class CacheTestCase(CMSTestCase):
@@ -458,6 +469,136 @@ class CacheTestCase(CMSTestCase):
                     response = self.client.get('/en/')
                 self.assertEqual(response.status_code, 200)
 
+    def test_cache_page_conditional_get(self):
+        # The view, not the middleware, has to answer conditional requests
+        exclude = [
+            'django.middleware.cache.UpdateCacheMiddleware',
+            'django.middleware.cache.FetchFromCacheMiddleware',
+            'django.middleware.http.ConditionalGetMiddleware',
+        ]
+        mw_classes = [mw for mw in settings.MIDDLEWARE_CLASSES if mw not in exclude]
+
+        with self.settings(MIDDLEWARE_CLASSES=mw_classes, CMS_PAGE_CACHE_GZIP=True):
+            page1 = create_page('test page 1', 'nav_playground.html', 'en', published=True)
+            placeholder = page1.placeholders.filter(slot="body")[0]
+            add_plugin(placeholder, "TextPlugin", 'en', body="English " * 100)
+            page1.publish('en')
+
+            response = self.client.get('/en/')
+            self.assertEqual(response.status_code, 200)
+            etag = response['ETag']
+            last_modified = response['Last-Modified']
+            content = response.content
+
+            with self.assertNumQueries(0):
+                response = self.client.get('/en/', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response['ETag'], etag)
+            self.assertEqual(response.content, b'')
+
+            response = self.client.get('/en/', HTTP_IF_MODIFIED_SINCE=last_modified)
+            self.assertEqual(response.status_code, 304)
+
+            response = self.client.get('/en/', HTTP_IF_NONE_MATCH='"other"')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.content, content)
+
+            response = self.client.get('/en/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertNotEqual(response['ETag'], etag)
+            self.assertEqual(gzip.GzipFile(fileobj=BytesIO(response.content)).read(), content)
+
+    def test_page_cache_path(self):
+        with self.settings(CMS_PAGE_CACHE_IGNORED_QUERY_PARAMETERS=['utm_*', 'fbclid']):
+            path = get_page_cache_path(self.get_request('/en/?b=2&utm_source=mail&a=1&fbclid=1'))
+            self.assertEqual(path, 'http://testserver/en/?a=1&b=2')
+            self.assertEqual(get_page_cache_path(self.get_request('/en/?a=1&b=2')), path)
+
+        with self.settings(CMS_PAGE_CACHE_QUERY_PARAMETERS=['page']):
+            path = get_page_cache_path(self.get_request('/en/?page=2&page=1&q=test'))
+            self.assertEqual(path, 'http://testserver/en/?page=2&page=1')
+
+        self.assertNotEqual(
+            get_page_cache_path(self.get_request('/en/')),
+            get_page_cache_path(RequestFactory().get('/en/', secure=True)),
+        )
+
+    def test_page_cache_stats(self):
+        exclude = [
+            'django.middleware.cache.UpdateCacheMiddleware',
+            'django.middleware.cache.FetchFromCacheMiddleware'
+        ]
+        mw_classes = [mw for mw in settings.MIDDLEWARE_CLASSES if mw not in exclude]
+
+        with self.settings(MIDDLEWARE_CLASSES=mw_classes, CMS_PAGE_CACHE_STATS=True,
+                           CMS_PAGE_CACHE_IGNORED_QUERY_PARAMETERS=['utm_*']):
+            create_page('test page 1', 'nav_playground.html', 'en', published=True)
+
+            self.client.get('/en/')
+            self.client.get('/en/?utm_campaign=1')
+            self.client.get('/en/?utm_campaign=2')
+
+            stats = get_page_cache_stats()
+            self.assertEqual(len(stats), 1)
+            self.assertEqual(stats[0]['path'], 'http://testserver/en/')
+            self.assertEqual((stats[0]['hits'], stats[0]['misses']), (2, 1))
+
+            clear_page_cache_stats()
+            self.assertEqual(get_page_cache_stats(), [])
+
+        # The counters bypass the local cache tier
+        with self.settings(CMS_LOCAL_CACHE={'TTL': 60}):
+            record_page_cache_lookup('http://testserver/en/', hit=True)
+            record_page_cache_lookup('http://testserver/en/', hit=True)
+            self.assertEqual(get_page_cache_stats()[0]['hits'], 2)
+            clear_page_cache_stats()
+
+    def test_local_cache_tier(self):
+        from django.core.cache import cache
+
+        with self.settings(CMS_LOCAL_CACHE={'TTL': 60}):
+            local_cache.set('local-key', {'a': 1})
+            local_cache.get('local-key')['a'] = 2
+            self.assertEqual(local_cache.get('local-key'), {'a': 1})
+
+            # Changes made by other processes are seen once the entry expires
+            cache.set('local-key', 'other')
+            self.assertEqual(local_cache.get('local-key'), {'a': 1})
+
+            local_cache.delete('local-key')
+            self.assertIsNone(local_cache.get('local-key'))
+            self.assertIsNone(cache.get('local-key'))
+
+            # Incrementing a version counter is seen right away
+            version = _get_cache_version()
+            invalidate_cms_page_cache()
+            self.assertEqual(_get_cache_version(), version + 1)
+        local_cache.clear_local()
+
+    def test_local_cache_tier_round_trips(self):
+        exclude = [
+            'django.middleware.cache.UpdateCacheMiddleware',
+            'django.middleware.cache.FetchFromCacheMiddleware'
+        ]
+        mw_classes = [mw for mw in settings.MIDDLEWARE_CLASSES if mw not in exclude]
+
+        with self.settings(MIDDLEWARE_CLASSES=mw_classes, CMS_PAGE_CACHE=False):
+            create_page('test page 1', 'nav_playground.html', 'en', published=True)
+            self.client.get('/en/')
+
+            local_cache.shared_round_trips = 0
+            self.client.get('/en/')
+            without_local_tier = local_cache.shared_round_trips
+
+            with self.settings(CMS_LOCAL_CACHE={'TTL': 60}):
+                self.client.get('/en/')
+                local_cache.shared_round_trips = 0
+                self.client.get('/en/')
+                with_local_tier = local_cache.shared_round_trips
+            local_cache.clear_local()
+        self.assertLess(with_local_tier, without_local_tier)
+
     def test_invalidate_restart(self):
 
         # Ensure that we're testing in an environment WITHOUT the MW cache...
@@ -746,3 +887,144 @@ class PlaceholderCacheTestCase(CMSTestCase):
             # Prove it still works as expected
             cached_en_crazy_content = get_placeholder_cache(self.placeholder, 'en', 1, en_crazy_request)
             self.assertEqual(en_crazy_content, cached_en_crazy_content)
+
+
+class InvalidationBatchTestCase(CMSTestCase):
+
+    def setUp(self):
+        from django.core.cache import cache
+        super(InvalidationBatchTestCase, self).setUp()
+        cache.clear()
+
+    def tearDown(self):
+        from django.core.cache import cache
+        invalidation.reset_batches()
+        super(InvalidationBatchTestCase, self).tearDown()
+        cache.clear()
+
+    def test_invalidations_outside_batch_run_immediately(self):
+        version = _get_cache_version()
+        invalidation.invalidate_page_cache()
+        self.assertEqual(_get_cache_version(), version + 1)
+
+    def test_invalidations_are_deferred_and_deduplicated(self):
+        page = create_page('test page', 'nav_playground.html', 'en', published=True)
+        placeholder = page.placeholders.get(slot='body')
+        version = _get_cache_version()
+
+        invalidation.open_batch()
+        page.publish('en')
+        page.publish('en')
+        invalidation.invalidate_placeholder(placeholder, 'en', 1)
+        invalidation.invalidate_placeholder(placeholder, 'en', 1)
+        invalidation.invalidate_menu(site_id=1, language='en')
+        collector = invalidation.get_current_collector()
+        invalidation.close_batch(discard=True)
+
+        # Nothing has been invalidated yet
+        self.assertEqual(_get_cache_version(), version)
+        self.assertTrue(collector.page_cache)
+        self.assertTrue(collector.permissions)
+        self.assertEqual(list(collector.placeholders), [(placeholder.pk, 'en', 1)])
+        self.assertEqual(collector.menu_sites, set([1]))
+
+        collector.run()
+        self.assertEqual(_get_cache_version(), version + 1)
+
+    def test_nested_batches_are_merged(self):
+        CacheKey.objects.create(key='menu-key', language='en', site=1)
+        invalidation.open_batch()
+        with invalidation.batch():
+            invalidation.invalidate_menu(site_id=1)
+        collector = invalidation.get_current_collector()
+        self.assertEqual(collector.menu_sites, set([1]))
+        invalidation.close_batch(discard=True)
+        self.assertTrue(CacheKey.objects.exists())
+        collector.run()
+        self.assertFalse(CacheKey.objects.exists())
+
+
+    def test_middleware_runs_batch_once_on_failed_request(self):
+        from cms.middleware.invalidation import InvalidationMiddleware
+
+        middleware = InvalidationMiddleware()
+        request = self.get_request('/en/')
+        version = _get_cache_version()
+
+        middleware.process_request(request)
+        invalidation.invalidate_page_cache()
+        self.assertEqual(_get_cache_version(), version)
+        # Django turns the exception into an error response
+        # which goes through process_response
+        middleware.process_response(request, HttpResponse(status=500))
+        self.assertEqual(_get_cache_version(), version + 1)
+        self.assertIsNone(invalidation.get_current_collector())
+
+class PublicationWindowCacheTestCase(CMSTestCase):
+
+    def setUp(self):
+        from django.core.cache import cache
+        super(PublicationWindowCacheTestCase, self).setUp()
+        cache.clear()
+
+    def tearDown(self):
+        from django.core.cache import cache
+        super(PublicationWindowCacheTestCase, self).tearDown()
+        cache.clear()
+
+    def test_ttl_is_capped_at_next_publication_date(self):
+        from django.utils.timezone import now
+        from cms.cache.publication import get_next_publication_boundary, get_publication_ttl
+
+        create_page('home', 'nav_playground.html', 'en', published=True)
+        timestamp = now()
+        self.assertIsNone(get_next_publication_boundary(1, timestamp))
+        self.assertEqual(get_publication_ttl(3600, 1, timestamp), 3600)
+
+        starts = timestamp + datetime.timedelta(seconds=100)
+        create_page('scheduled', 'nav_playground.html', 'en', published=True,
+                    publication_date=starts)
+        self.assertEqual(get_next_publication_boundary(1, timestamp), starts)
+        self.assertEqual(get_publication_ttl(3600, 1, timestamp), 101)
+
+        # Other sites are not affected
+        self.assertEqual(get_publication_ttl(3600, 2, timestamp), 3600)
+
+        # The boundary is cached until the next publish
+        with self.assertNumQueries(0):
+            self.assertEqual(get_next_publication_boundary(1, timestamp), starts)
+
+        # and looked up again once the cache is cleared
+        from django.core.cache import cache
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_next_publication_boundary(1, timestamp), starts)
+
+    def test_sweep_invalidates_once_per_window(self):
+        from django.utils.timezone import now
+        from cms.cache.publication import sweep_publication_windows
+
+        create_page('home', 'nav_playground.html', 'en', published=True)
+        timestamp = now()
+        # The home page just went live
+        self.assertEqual(sweep_publication_windows(until=timestamp), set([1]))
+
+        create_page('scheduled', 'nav_playground.html', 'en', published=True,
+                    publication_date=timestamp + datetime.timedelta(seconds=100))
+        CacheKey.objects.create(key='menu-key', language='en', site=1)
+        version = _get_cache_version()
+
+        # The window hasn't opened yet
+        self.assertEqual(sweep_publication_windows(until=timestamp + datetime.timedelta(seconds=1)), set())
+        self.assertEqual(_get_cache_version(), version)
+        self.assertTrue(CacheKey.objects.exists())
+
+        later = timestamp + datetime.timedelta(seconds=200)
+        self.assertEqual(sweep_publication_windows(until=later), set([1]))
+        self.assertEqual(_get_cache_version(), version + 1)
+        self.assertFalse(CacheKey.objects.exists())
+
+        # Already swept
+        self.assertEqual(sweep_publication_windows(until=later), set())
+        self.assertEqual(_get_cache_version(), version + 1)
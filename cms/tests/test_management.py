@@ -1,23 +1,33 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 import uuid
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
 from cms.test_utils.project.sampleapp.cms_apps import SampleApp
 from cms.test_utils.util.context_managers import apphooks
 
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.core import management
+from django.core.cache import cache
 from django.core.management import CommandError
+from django.test import RequestFactory, SimpleTestCase
 from django.test.utils import override_settings
 from django.utils.six.moves import StringIO
 
 from cms.api import create_page, add_plugin, create_title
+from cms.cache.page import get_page_cache
 from cms.management.commands.subcommands.list import plugin_report
 from cms.models import Page, StaticPlaceholder
 from cms.models.placeholdermodel import Placeholder
 from cms.models.pluginmodel import CMSPlugin
 from cms.test_utils.fixtures.navextenders import NavextendersFixture
-from cms.test_utils.testcases import CMSTestCase
+from cms.test_utils.testcases import CMSTestCase, TransactionCMSTestCase
+from cms.utils import warmup
 from djangocms_text_ckeditor.cms_plugins import TextPlugin
 
 
@@ -303,6 +313,113 @@ class ManagementTestCase(CMSTestCase):
 
         self.assertEqual(Page.objects.public().count(), 3)
 
+    def test_warmup(self):
+        admin = self.get_superuser()
+        home = create_page('home', 'nav_playground.html', 'en', published=True, created_by=admin)
+        create_title('de', 'home de', home)
+        home.publish('de')
+        create_page('private', 'nav_playground.html', 'en', published=True, login_required=True)
+        create_page('draft', 'nav_playground.html', 'en', published=False)
+        out = StringIO()
+
+        management.call_command('cms', 'warmup', '--language', 'en', '--language', 'de', interactive=False, stdout=out)
+        output = out.getvalue()
+        self.assertIn('Rendered: 2\n', output)
+        self.assertIn('Failed:   0\n', output)
+        self.assertIn(home.get_public_url('de'), output)
+        self.assertNotIn('/private/', output)
+        self.assertNotIn('/draft/', output)
+
+        out = StringIO()
+        management.call_command('cms', 'warmup', '-l', 'de', interactive=False, stdout=out)
+        self.assertIn('Rendered: 1\n', out.getvalue())
+
+        with self.assertRaises(CommandError):
+            management.call_command('cms', 'warmup', '--workers', '0', interactive=False, stdout=StringIO())
+
+    def test_warm_up_secure(self):
+        home = create_page('home', 'nav_playground.html', 'en', published=True)
+        url = home.get_public_url('en')
+        domain = Site.objects.get_current().domain
+        cache.clear()
+
+        with self.settings(CMS_PAGE_CACHE=True):
+            results = warmup.warm_up([('en', url)], secure=True)
+            self.assertEqual(results[0]['status'], 200)
+
+            # The page is cached for the visitors of an HTTPS site
+            request = RequestFactory().get(url, secure=True, HTTP_HOST=domain)
+            self.assertIsNotNone(get_page_cache(request))
+            request = RequestFactory().get(url, HTTP_HOST=domain)
+            self.assertIsNone(get_page_cache(request))
+        cache.clear()
+
+
+class FakeClock(object):
+
+    def __init__(self, now):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RateLimiterTestCase(SimpleTestCase):
+
+    def test_rate_limiter(self):
+        clock = FakeClock(100)
+
+        with mock.patch.object(warmup, 'time', clock):
+            limiter = warmup.RateLimiter(2)
+
+            for index in range(3):
+                limiter.wait()
+            self.assertEqual(clock.sleeps, [0.5, 0.5])
+
+            # Time spent between the calls counts
+            clock.now += 2
+            limiter.wait()
+            limiter.wait()
+            self.assertEqual(clock.sleeps, [0.5, 0.5, 0.5])
+
+            limiter = warmup.RateLimiter(None)
+
+            for index in range(3):
+                limiter.wait()
+            self.assertEqual(clock.sleeps, [0.5, 0.5, 0.5])
+
+
+class WarmupTestCase(TransactionCMSTestCase):
+
+    def test_warm_up_threads(self):
+        # The threads have their own database connection, they
+        # only see the data committed by a transaction test case.
+        home = create_page('home', 'nav_playground.html', 'en', published=True)
+        create_title('de', 'home de', home)
+        home.publish('de')
+
+        for index in range(3):
+            create_page('page %s' % index, 'nav_playground.html', 'en', published=True, parent=home)
+
+        urls = warmup.get_warmup_urls(['en', 'de'])
+        self.assertEqual(len(urls), 5)
+        callbacks = []
+
+        results = warmup.warm_up(urls, workers=3, rate=1000, callback=callbacks.append)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(callbacks, results)
+        self.assertEqual(
+            sorted((result['language'], result['url']) for result in results),
+            sorted(urls),
+        )
+        self.assertEqual([result['error'] for result in results], [None] * 5)
+        self.assertEqual(set(result['status'] for result in results), set([200]))
+
 
 class PageFixtureManagementTestCase(NavextendersFixture, CMSTestCase):
 
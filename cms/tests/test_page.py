@@ -16,11 +16,12 @@ from django.utils.timezone import now as tz_now
 
 from cms import constants
 from cms.api import create_page, add_plugin, create_title, publish_page
+from cms.cache.page import _page_inheritance_key, get_page_inheritance_cache, set_page_inheritance_cache
 from cms.exceptions import PublicIsUnmodifiable, PublicVersionNeeded
 from cms.models import Page, Title
 from cms.models.placeholdermodel import Placeholder
 from cms.models.pluginmodel import CMSPlugin
-from cms.signals import pre_save_page, post_save_page
+from cms.signals import pre_save_page, post_save_page, title_paths_updated
 from cms.sitemaps import CMSSitemap
 from cms.test_utils.testcases import CMSTestCase
 from cms.utils import get_cms_setting
@@ -424,8 +425,9 @@ class PagesTestCase(CMSTestCase):
         grand_child2.template = constants.TEMPLATE_INHERITANCE_MAGIC
         grand_child2.save()
 
-        # kill template cache
+        # kill template cache and what the pages of the tree inherit
         delattr(grand_child, '_template_cache')
+        cache.clear()
         with self.assertNumQueries(1):
             self.assertEqual(child.template, constants.TEMPLATE_INHERITANCE_MAGIC)
             self.assertEqual(parent.get_template_name(), grand_child.get_template_name())
@@ -434,9 +436,9 @@ class PagesTestCase(CMSTestCase):
         with self.assertNumQueries(0):
             grand_child.get_template()
 
-        # kill template cache
+        # kill template cache, the tree has been looked up already
         delattr(grand_child2, '_template_cache')
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(0):
             self.assertEqual(child2.template, 'col_two.html')
             self.assertEqual(child2.get_template_name(), grand_child2.get_template_name())
 
@@ -626,6 +628,112 @@ class PagesTestCase(CMSTestCase):
         self.assertEqual(page3.get_absolute_url(),
                          self.get_pages_root() + 'i-want-another-url/')
 
+    def test_descendant_title_paths_updated_in_bulk(self):
+        create_page('home', 'nav_playground.html', 'en', published=True)
+        page1 = create_page('test page 1', 'nav_playground.html', 'en')
+        page2 = create_page('test page 2', 'nav_playground.html', 'en', parent=page1)
+        page3 = create_page('test page 3', 'nav_playground.html', 'en', parent=page2)
+        page4 = create_page('test page 4', 'nav_playground.html', 'en', parent=page3)
+        page5 = create_page('test page 5', 'nav_playground.html', 'en', parent=page2,
+                            overwrite_url='i-want-another-url')
+        page6 = create_page('test page 6', 'nav_playground.html', 'en', parent=page5)
+        calls = []
+
+        def receiver(**kwargs):
+            calls.append(kwargs)
+
+        title_paths_updated.connect(receiver)
+
+        try:
+            title2 = page2.title_set.get()
+            title2.slug = 'page-test-2'
+            title2.save()
+        finally:
+            title_paths_updated.disconnect(receiver)
+
+        self.assertEqual(page3.title_set.get().path, 'test-page-1/page-test-2/test-page-3')
+        self.assertEqual(page4.title_set.get().path, 'test-page-1/page-test-2/test-page-3/test-page-4')
+        # Overwritten urls and the pages below them are left alone
+        self.assertEqual(page5.title_set.get().path, 'i-want-another-url')
+        self.assertEqual(page6.title_set.get().path, 'i-want-another-url/test-page-6')
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0]['old_path'], 'test-page-1/test-page-2')
+        self.assertEqual(calls[0]['new_path'], 'test-page-1/page-test-2')
+        self.assertEqual(
+            set(calls[0]['titles']),
+            set(Title.objects.filter(page__in=[page3, page4]).values_list('pk', flat=True)),
+        )
+
+    def test_descendant_title_paths_query_count(self):
+        create_page('home', 'nav_playground.html', 'en', published=True)
+        root = create_page('root', 'nav_playground.html', 'en')
+        parent = root
+
+        for i in range(10):
+            parent = create_page('page %s' % i, 'nav_playground.html', 'en', parent=parent)
+
+        title = root.title_set.get()
+        title.slug = 'new-root'
+
+        # Independent from the number of descendants: the old title, its
+        # old path, the update, the overwritten urls, the descendant ids
+        # and their update.
+        with self.assertNumQueries(6):
+            title.save()
+        self.assertEqual(
+            parent.title_set.get().path,
+            'new-root/' + '/'.join('page-%s' % i for i in range(10)),
+        )
+
+    def test_move_updates_descendant_titles_in_fallback_languages(self):
+        create_page('home', 'nav_playground.html', 'en', published=True)
+        target = create_page('target', 'nav_playground.html', 'en')
+        page = create_page('page', 'nav_playground.html', 'en')
+        child = create_page('child', 'nav_playground.html', 'en', parent=page)
+        create_title('de', 'kind', child)
+        # The page has no german title, the path falls back to english
+        self.assertEqual(child.title_set.get(language='de').path, 'page/kind')
+
+        page.move_page(target, 'last-child')
+        self.assertEqual(child.title_set.get(language='en').path, 'target/page/child')
+        self.assertEqual(child.title_set.get(language='de').path, 'target/page/kind')
+
+    def test_with_titles_prefetches_titles(self):
+        parent = create_page('parent', 'nav_playground.html', 'en')
+        create_title('de', 'Eltern', parent)
+        create_page('child', 'nav_playground.html', 'en', parent=parent)
+
+        with self.assertNumQueries(2):
+            pages = list(Page.objects.drafts().with_titles().order_by('path'))
+
+        with self.assertNumQueries(0):
+            self.assertEqual([page.get_title('en') for page in pages], ['parent', 'child'])
+            self.assertEqual(pages[0].get_title('de', fallback=False), 'Eltern')
+            # The child has no german title, there's nothing to look up
+            self.assertEqual(pages[1].get_title('de', fallback=False), '')
+
+        pages = list(Page.objects.drafts().with_titles(['de']).order_by('path'))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(pages[0].get_title('de', fallback=False), 'Eltern')
+
+        with self.assertNumQueries(1):
+            self.assertEqual(pages[1].get_title('en', fallback=False), 'child')
+
+    def test_template_change_creates_inherited_placeholders(self):
+        parent = create_page('parent', 'col_two.html', 'en')
+        child = create_page('child', constants.TEMPLATE_INHERITANCE_MAGIC, 'en', parent=parent)
+        self.assertFalse(child.placeholders.filter(slot='col_right').exists())
+
+        parent.template = 'col_three.html'
+        parent.save()
+        self.assertTrue(child.placeholders.filter(slot='col_right').exists())
+
+        # Moving the page under another template creates them too
+        other = create_page('other', 'nav_playground.html', 'en')
+        child.reload().move_page(other, 'last-child')
+        self.assertTrue(child.placeholders.filter(slot='body').exists())
+
     def test_slug_url_overwrite_clash(self):
         """ Tests if a URL-Override clashes with a normal page url
         """
@@ -814,6 +922,50 @@ class PagesTestCase(CMSTestCase):
         resp = self.client.get(child3.get_absolute_url('en'))
         self.assertEqual(resp.get('X-Frame-Options'), None)
 
+    def test_inherited_template_and_xframe_options_are_cached(self):
+        parent = create_page('parent', 'col_two.html', 'en',
+                             xframe_options=Page.X_FRAME_OPTIONS_DENY)
+        child = create_page('child', constants.TEMPLATE_INHERITANCE_MAGIC, 'en', parent=parent,
+                            xframe_options=Page.X_FRAME_OPTIONS_INHERIT)
+        child = child.reload()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(child.get_template(), 'col_two.html')
+            self.assertEqual(child.get_xframe_options(), Page.X_FRAME_OPTIONS_DENY)
+
+        parent.template = 'col_three.html'
+        parent.xframe_options = Page.X_FRAME_OPTIONS_SAMEORIGIN
+        parent.save()
+        child = child.reload()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(child.get_template(), 'col_three.html')
+            self.assertEqual(child.get_xframe_options(), Page.X_FRAME_OPTIONS_SAMEORIGIN)
+
+        # A page missing from the cache is looked up on its own
+        grandchild = create_page('grandchild', constants.TEMPLATE_INHERITANCE_MAGIC, 'en', parent=child)
+        grandchild = grandchild.reload()
+        cache.delete(_page_inheritance_key(grandchild.site_id, grandchild.pk))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(grandchild.get_template(), 'col_three.html')
+
+        grandchild = grandchild.reload()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(grandchild.get_template(), 'col_three.html')
+
+        # Moving the page to the top level stores the template it inherits,
+        # even if the cache of this process still has an outdated one.
+        child = child.reload()
+        inherited, version = get_page_inheritance_cache(child)
+        set_page_inheritance_cache(child, ('col_two.html', Page.X_FRAME_OPTIONS_DENY), version)
+        child.move_page(parent, 'right')
+        child = child.reload()
+        self.assertEqual(child.template, 'col_three.html')
+        self.assertEqual(child.get_template(), 'col_three.html')
+        self.assertIsNone(child.get_xframe_options())
+
     def test_top_level_page_inherited_xframe_options_are_applied(self):
         with self.settings(MIDDLEWARE_CLASSES=settings.MIDDLEWARE_CLASSES + ['django.middleware.clickjacking.XFrameOptionsMiddleware']):
             page = create_page('test page 1', 'nav_playground.html', 'en',
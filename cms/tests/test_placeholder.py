@@ -301,6 +301,18 @@ class PlaceholderTestCase(CMSTestCase, UnittestCompatMixin):
             # test generic configuration
             returned = get_placeholder_conf('plugins', 'something')
             self.assertEqual(returned, TEST_CONF[None]['plugins'])
+            # test inherit entry without the setting falls back to the default
+            returned = get_placeholder_conf('require_parent', 'main', 'layout/other.html', default=False)
+            self.assertEqual(returned, False)
+
+    def test_get_placeholder_conf_rebuilt_on_setting_change(self):
+        with self.settings(CMS_PLACEHOLDER_CONF={'main': {'name': 'main content'}}):
+            self.assertEqual(get_placeholder_conf('name', 'main'), 'main content')
+
+            with self.settings(CMS_PLACEHOLDER_CONF={'main': {'name': 'other content'}}):
+                self.assertEqual(get_placeholder_conf('name', 'main'), 'other content')
+            self.assertEqual(get_placeholder_conf('name', 'main'), 'main content')
+        self.assertEqual(get_placeholder_conf('name', 'main', default='default'), 'default')
 
     def test_placeholder_context_leaking(self):
         TEST_CONF = {'test': {'extra_context': {'extra_width': 10}}}
@@ -1257,6 +1257,58 @@ class PluginsTestCase(PluginsTestBaseCase):
             self.assertIn('ChildPlugin', child_classes)
             self.assertIn('ParentPlugin', child_classes)
 
+    def test_plugin_compatibility_cached_on_pool(self):
+        page = api.create_page("page", "nav_playground.html", "en", published=True)
+        ParentPlugin = type('ParentPlugin', (CMSPluginBase,),
+                                    dict(render_plugin=False))
+        ChildPlugin = type('ChildPlugin', (CMSPluginBase,),
+                                    dict(parent_classes=['ParentPlugin'], render_plugin=False))
+
+        with register_plugins(ParentPlugin):
+            self.assertNotIn('ChildPlugin', plugin_pool.get_plugin_children('body', page)['ParentPlugin'])
+            plugin_names = [plugin.__name__ for plugin in plugin_pool.get_all_plugins('body', page)]
+            self.assertIn('ParentPlugin', plugin_names)
+
+            # Registering a plugin clears the cache
+            with register_plugins(ChildPlugin):
+                self.assertIn('ChildPlugin', plugin_pool.get_plugin_children('body', page)['ParentPlugin'])
+                self.assertEqual(plugin_pool.get_plugin_parents('body', page)['ChildPlugin'], ['ParentPlugin'])
+                self.assertEqual(plugin_pool.get_plugin_parents('body', page)['ParentPlugin'], [])
+
+            # So does changing the placeholder configuration
+            CMS_PLACEHOLDER_CONF = {
+                'body': {
+                    'excluded_plugins': ['ParentPlugin'],
+                }
+            }
+            with self.settings(CMS_PLACEHOLDER_CONF=CMS_PLACEHOLDER_CONF):
+                plugin_names = [plugin.__name__ for plugin in plugin_pool.get_all_plugins('body', page)]
+                self.assertNotIn('ParentPlugin', plugin_names)
+
+    def test_plugin_compatibility_overrides_not_cached(self):
+        page = api.create_page("page", "nav_playground.html", "en", published=True)
+        other_page = api.create_page("other", "nav_playground.html", "en", published=True,
+                                     reverse_id="other")
+        ParentPlugin = type('ParentPlugin', (CMSPluginBase,),
+                                    dict(render_plugin=False))
+
+        class ChildPlugin(CMSPluginBase):
+            render_plugin = False
+
+            def get_parent_classes(self, slot, page):
+                # Depends on more than the template of the page
+                if page and page.reverse_id == 'other':
+                    return ['ParentPlugin']
+                return []
+
+        with register_plugins(ParentPlugin, ChildPlugin):
+            self.assertEqual(plugin_pool.get_plugin_parents('body', page)['ChildPlugin'], [])
+            self.assertEqual(plugin_pool.get_plugin_parents('body', other_page)['ChildPlugin'], ['ParentPlugin'])
+
+            plugin_names = [plugin.__name__ for plugin in plugin_pool.get_all_plugins('body', page)]
+            self.assertIn('ChildPlugin', plugin_names)
+            plugin_names = [plugin.__name__ for plugin in plugin_pool.get_all_plugins('body', other_page)]
+            self.assertNotIn('ChildPlugin', plugin_names)
 
     def test_plugin_translatable_content_getter_setter(self):
         """
@@ -781,6 +781,55 @@ class PublishingTests(TestCase):
         self.assertFalse(child.publisher_public.is_published('en'))
         self.assertFalse(gchild.publisher_public.is_published('en'))
 
+    def test_descendant_state_changes_in_bulk(self):
+        from cms.signals import post_mark_descendants_pending, post_mark_descendants_published
+
+        page = self.create_page("Page", published=True)
+        parent = page
+        descendants = []
+
+        for i in range(6):
+            parent = self.create_page("Child %s" % i, parent=parent, published=True)
+            descendants.append(parent)
+
+        page = page.reload()
+        calls = []
+
+        def receiver(signal, **kwargs):
+            calls.append((signal, kwargs))
+
+        post_mark_descendants_pending.connect(receiver)
+        post_mark_descendants_published.connect(receiver)
+
+        try:
+            # Independent from the number of descendants
+            with self.assertNumQueries(FuzzyInt(1, 6)):
+                page.mark_descendants_pending('en')
+
+            for item in descendants:
+                item = self.reload(item)
+                self.assertTrue(item.is_published('en'))
+                self.assertFalse(item.publisher_public.is_published('en'))
+                self.assertEqual(item.get_publisher_state('en'), PUBLISHER_STATE_PENDING)
+
+            with self.assertNumQueries(FuzzyInt(1, 8)):
+                page.mark_descendants_as_published('en')
+
+            for item in descendants:
+                item = self.reload(item)
+                self.assertTrue(item.publisher_public.is_published('en'))
+                self.assertEqual(item.get_publisher_state('en'), PUBLISHER_STATE_DEFAULT)
+        finally:
+            post_mark_descendants_pending.disconnect(receiver)
+            post_mark_descendants_published.disconnect(receiver)
+
+        page_ids = set(item.pk for item in descendants)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[0][0], post_mark_descendants_pending)
+        self.assertEqual(set(calls[0][1]['pages']), page_ids)
+        self.assertEqual(calls[1][0], post_mark_descendants_published)
+        self.assertEqual(set(calls[1][1]['pages']), page_ids)
+
     def test_prepublish_descendants(self):
         page = self.create_page("Page", published=True)
         child_1 = self.create_page("Child", parent=page, published=False)
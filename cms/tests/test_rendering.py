@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+import json
+
+from django.conf import settings
 from django.core.cache import cache
 from django.template import Template
 from django.test.utils import override_settings
@@ -6,12 +9,15 @@ from sekizai.context import SekizaiContext
 
 from cms import plugin_rendering
 from cms.api import create_page, add_plugin
-from cms.cache.placeholder import get_placeholder_cache
+from cms.cache.placeholder import (get_inherited_placeholders_cache, get_placeholder_cache,
+                                   set_inherited_placeholders_cache)
 from cms.models import Page, Placeholder, CMSPlugin
 from cms.plugin_rendering import PluginContext
+from cms.signals import render_profiled
 from cms.test_utils.project.placeholderapp.models import Example1
 from cms.test_utils.testcases import CMSTestCase
 from cms.toolbar.toolbar import CMSToolbar
+from cms.utils.profiling import PROFILE_HEADER, summarize_plugin_types
 from cms.views import details
 
 TEMPLATE_NAME = 'tests/rendering/base.html'
@@ -521,6 +527,98 @@ class RenderingTestCase(CMSTestCase):
         r = self.render(t, self.test_page6)
         self.assertEqual(r, u'|' + self.test_data5['text_main'] + '|' + self.test_data6['text_sub'])
 
+    def test_inherited_placeholders_are_indexed(self):
+        t = u'{% load cms_tags %}|{% placeholder "main" inherit %}'
+        main = self.test_page.placeholders.get(slot='main')
+        ancestors = self.test_page3.get_cached_ancestors()
+        r = self.render(t, self.test_page3)
+        self.assertEqual(r, u'|' + self.test_data['text_main'])
+        sources, versions = get_inherited_placeholders_cache(self.test_page3, ancestors, 'main', 'en')
+        self.assertEqual(sources, [(self.test_page.pk, main.pk)])
+
+        # plugins outside of the ancestors leave the index alone
+        add_plugin(self.test_page3.placeholders.get(slot='sub'), 'TextPlugin', 'en', body=u'sub')
+        add_plugin(Placeholder.objects.create(slot='clipboard'), 'TextPlugin', 'en', body=u'clipboard')
+        sources, versions = get_inherited_placeholders_cache(self.test_page3, ancestors, 'main', 'en')
+        self.assertEqual(sources, [(self.test_page.pk, main.pk)])
+
+        # content added to a nearer ancestor takes over
+        parent_main = self.test_page2.placeholders.get(slot='main')
+        add_plugin(parent_main, 'TextPlugin', 'en', body=u'RenderingTestCase-main2')
+        sources, versions = get_inherited_placeholders_cache(self.test_page3, ancestors, 'main', 'en')
+        self.assertIsNone(sources)
+        r = self.render(t, self.test_page3)
+        self.assertEqual(r, u'|RenderingTestCase-main2')
+        sources, versions = get_inherited_placeholders_cache(self.test_page3, ancestors, 'main', 'en')
+        self.assertEqual(sources, [(self.test_page2.pk, parent_main.pk), (self.test_page.pk, main.pk)])
+
+    def test_inherited_placeholders_invalidated_while_computed(self):
+        main = self.test_page.placeholders.get(slot='main')
+        ancestors = self.test_page3.get_cached_ancestors()
+        sources, versions = get_inherited_placeholders_cache(self.test_page3, ancestors, 'main', 'en')
+        self.assertIsNone(sources)
+
+        # The sources are stored under the versions read before an
+        # invalidation which happened while they were computed
+        add_plugin(self.test_page2.placeholders.get(slot='main'), 'TextPlugin', 'en', body=u'main2')
+        set_inherited_placeholders_cache(self.test_page3, 'main', 'en', [(self.test_page.pk, main.pk)], versions)
+        sources, versions = get_inherited_placeholders_cache(self.test_page3, ancestors, 'main', 'en')
+        self.assertIsNone(sources)
+
+    def _get_render_profiles(self, **settings_overrides):
+        reports = []
+
+        def receiver(report, **kwargs):
+            reports.append(report)
+
+        middleware = list(settings.MIDDLEWARE_CLASSES)
+        middleware.append('cms.middleware.profiling.RenderProfilingMiddleware')
+        settings_overrides.setdefault('CMS_RENDER_PROFILING_SAMPLE_RATE', 1)
+        render_profiled.connect(receiver)
+
+        try:
+            with self.settings(MIDDLEWARE_CLASSES=middleware, CMS_PAGE_CACHE=False, **settings_overrides):
+                response = self.client.get(self.test_page.get_absolute_url())
+        finally:
+            render_profiled.disconnect(receiver)
+        self.assertEqual(response.status_code, 200)
+        return response, reports
+
+    def test_render_profiling(self):
+        response, reports = self._get_render_profiles()
+        self.assertEqual(len(reports), 1)
+        # Only staff users get the summary
+        self.assertNotIn(PROFILE_HEADER, response)
+
+        records = reports[0]['records']
+        plugins = [record for record in records if record['kind'] == 'plugin']
+        placeholders = [record for record in records if record['kind'] == 'placeholder']
+        self.assertEqual(len(plugins), 2)
+        self.assertEqual(set(record['plugin_type'] for record in plugins), {'TextPlugin'})
+        self.assertTrue(all(record['bytes'] > 0 for record in plugins))
+        self.assertEqual(
+            set(record['slot'] for record in placeholders),
+            {'main', 'sub', 'empty'},
+        )
+
+        summaries = summarize_plugin_types(['INFO cms.profiling ' + json.dumps(reports[0]), 'not a report'])
+        self.assertEqual(len(summaries), 1)
+        self.assertEqual(summaries[0]['plugin_type'], 'TextPlugin')
+        self.assertEqual(summaries[0]['count'], 2)
+
+    def test_render_profiling_counts_bytes(self):
+        # Three bytes per character
+        add_plugin(self.test_placeholders['main'], 'TextPlugin', 'en', body=u'\u20ac' * 100)
+        self.test_placeholders['main'].page.publish('en')
+        response, reports = self._get_render_profiles()
+        records = reports[0]['records']
+        plugins = [record for record in records if record['kind'] == 'plugin']
+        self.assertTrue(any(record['bytes'] >= 300 for record in plugins))
+
+    def test_render_profiling_sample_rate(self):
+        response, reports = self._get_render_profiles(CMS_RENDER_PROFILING_SAMPLE_RATE=0)
+        self.assertEqual(reports, [])
+
     def test_render_placeholder_toolbar(self):
         placeholder = Placeholder()
         placeholder.slot = 'test'
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from django.db import connection
+from django.test.utils import override_settings
+
+from cms import search
+from cms.api import add_plugin, create_page, create_title
+from cms.models import Page, PageSearchDocument
+from cms.search import get_search_backend, rebuild_index
+from cms.search.backends import DatabaseSearchBackend, SqliteFTS5SearchBackend, get_terms
+from cms.test_utils.testcases import CMSTestCase, TransactionCMSTestCase
+
+
+class SearchIndexMixin(object):
+
+    def _create_page(self, title, body, language='en', **kwargs):
+        page = create_page(title, 'nav_playground.html', language, **kwargs)
+        placeholder = page.placeholders.get(slot='body')
+        add_plugin(placeholder, 'TextPlugin', language, body=body)
+        page.publish(language)
+        return page.reload()
+
+
+class SearchIndexTestCase(SearchIndexMixin, CMSTestCase):
+
+    def test_get_terms(self):
+        self.assertEqual(get_terms('Hello, "World" OR foo*'), ['hello', 'world', 'or', 'foo'])
+        self.assertEqual(get_terms(None), [])
+
+    def test_document_is_updated_on_publish(self):
+        page = self._create_page('first page', '<p>Hello <b>world</b></p>')
+        document = PageSearchDocument.objects.get(page=page.publisher_public, language='en')
+        self.assertEqual(document.title, 'first page')
+        self.assertEqual(document.content, 'Hello world')
+
+        # Draft changes are only indexed on publish
+        placeholder = page.placeholders.get(slot='body')
+        add_plugin(placeholder, 'TextPlugin', 'en', body='Goodbye')
+        self.assertEqual(Page.objects.search('goodbye').count(), 0)
+
+        page.publish('en')
+        self.assertEqual(list(Page.objects.search('goodbye')), [page.publisher_public])
+
+    def test_document_is_removed_on_unpublish(self):
+        page = self._create_page('first page', 'Hello world')
+        self.assertEqual(Page.objects.search('hello').count(), 1)
+
+        page.unpublish('en')
+        self.assertFalse(PageSearchDocument.objects.exists())
+        self.assertEqual(Page.objects.search('hello').count(), 0)
+
+    def test_search_before_the_index_is_built(self):
+        page = self._create_page('first page', 'Hello world')
+        self._create_page('second page', 'Hello there', language='de')
+        PageSearchDocument.objects.all().delete()
+
+        self.assertEqual(list(Page.objects.search('first')), [page.publisher_public])
+        self.assertEqual(Page.objects.search('page', language='en').count(), 1)
+
+        rebuild_index()
+        self.assertEqual(list(Page.objects.search('hello', language='en')), [page.publisher_public])
+
+    def test_title_matches_rank_first(self):
+        content_match = self._create_page('first page', 'All about django')
+        title_match = self._create_page('django', 'Something else')
+        self._create_page('third page', 'Unrelated')
+
+        results = list(Page.objects.search('django'))
+        self.assertEqual(results, [title_match.publisher_public, content_match.publisher_public])
+
+    def test_number_of_results_is_capped(self):
+        pages = [self._create_page('page %s' % index, 'Hello world') for index in range(3)]
+
+        with mock.patch.object(search, 'MAX_SEARCH_RESULTS', 2):
+            results = list(Page.objects.search('hello'))
+        self.assertEqual(len(results), 2)
+        self.assertTrue(set(results) < set(page.publisher_public for page in pages))
+
+    def test_all_terms_have_to_match(self):
+        page = self._create_page('first page', 'Hello world')
+        self._create_page('second page', 'Hello there')
+
+        self.assertEqual(list(Page.objects.search('world hello')), [page.publisher_public])
+        self.assertEqual(Page.objects.search('').count(), 0)
+
+    def test_language_filter(self):
+        page = self._create_page('first page', 'Hello world')
+        create_title('de', 'erste seite', page)
+        placeholder = page.placeholders.get(slot='body')
+        add_plugin(placeholder, 'TextPlugin', 'de', body='Hallo Welt')
+        page.publish('de')
+
+        self.assertEqual(Page.objects.search('hallo').count(), 1)
+        self.assertEqual(Page.objects.search('hallo', language='de').count(), 1)
+        self.assertEqual(Page.objects.search('hallo', language='en').count(), 0)
+
+    def test_rebuild_index(self):
+        page = self._create_page('first page', 'Hello world')
+        PageSearchDocument.objects.all().delete()
+        self.assertEqual(Page.objects.search('hello').count(), 0)
+
+        self.assertEqual(rebuild_index(), 1)
+        self.assertEqual(list(Page.objects.search('hello')), [page.publisher_public])
+
+    @override_settings(CMS_SEARCH_BACKEND='cms.search.backends.DatabaseSearchBackend')
+    def test_database_backend(self):
+        self.assertIsInstance(get_search_backend(), DatabaseSearchBackend)
+
+        content_match = self._create_page('first page', 'All about django, django and django')
+        title_match = self._create_page('django', 'Something else')
+
+        results = list(Page.objects.search('djang'))
+        self.assertEqual(results, [title_match.publisher_public, content_match.publisher_public])
+
+
+@override_settings(CMS_SEARCH_BACKEND='cms.search.backends.SqliteFTS5SearchBackend')
+class SqliteFTS5SearchTestCase(SearchIndexMixin, TransactionCMSTestCase):
+
+    def setUp(self):
+        if not SqliteFTS5SearchBackend.is_available(connection):
+            self.skipTest('Requires SQLite with FTS5')
+        # The table is there if FTS5 was available when migrating
+        self.created_table = SqliteFTS5SearchBackend.get_table_name() not in connection.introspection.table_names()
+
+        if self.created_table:
+            SqliteFTS5SearchBackend.create_table(connection)
+        super(SqliteFTS5SearchTestCase, self).setUp()
+
+    def tearDown(self):
+        super(SqliteFTS5SearchTestCase, self).tearDown()
+
+        if self.created_table:
+            SqliteFTS5SearchBackend.drop_table(connection)
+        else:
+            # The documents table is flushed, its mirror isn't
+            with connection.cursor() as cursor:
+                cursor.execute('DELETE FROM %s' % connection.ops.quote_name(SqliteFTS5SearchBackend.get_table_name()))
+        # The backend picked for other tests depends on the table
+        search._backends.clear()
+
+    def test_prefix_search(self):
+        self.assertIsInstance(get_search_backend(), SqliteFTS5SearchBackend)
+
+        page = self._create_page('first page', 'Hello world')
+        self.assertEqual(list(Page.objects.search('hel')), [page.publisher_public])
+        self.assertEqual(Page.objects.search('ello').count(), 0)
+
+        page.unpublish('en')
+        self.assertEqual(Page.objects.search('hel').count(), 0)
+
+    def test_title_matches_rank_first(self):
+        content_match = self._create_page('first page', 'All about django')
+        title_match = self._create_page('django', 'Something else')
+
+        results = list(Page.objects.search('django'))
+        self.assertEqual(results, [title_match.publisher_public, content_match.publisher_public])
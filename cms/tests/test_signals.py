@@ -1,7 +1,13 @@
 # -*- coding: utf-8 -*-
 from contextlib import contextmanager
 
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
 from django.conf import settings
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.test.utils import override_settings
@@ -12,6 +18,7 @@ from cms.signals import urls_need_reloading
 from cms.test_utils.project.sampleapp.cms_apps import SampleApp
 from cms.test_utils.util.context_managers import apphooks
 from cms.test_utils.testcases import CMSTestCase
+from cms.utils import apphook_reload
 
 
 class SignalTester(object):
@@ -129,3 +136,53 @@ class ApphooksReloadTests(CMSTestCase):
         # And, this should result in a the updating of the UrlconfRevision
         new_revision, _ = UrlconfRevision.get_or_create_revision()
         self.assertNotEquals(current_revision, new_revision)
+
+    def test_concurrent_urlconf_changes(self):
+        self.addCleanup(apphook_reload._global_revision.update, revision=None, checked=0, polled=0)
+        UrlconfRevision.update_revision('initial')
+        revision = apphook_reload.mark_urlconf_as_changed(changes=[(1, 'en')])
+        self.assertEqual(UrlconfRevision.get_or_create_revision()[0], revision)
+        self.assertEqual(apphook_reload.get_urlconf_changes('initial', revision), set([(1, 'en')]))
+
+        # Another change read the revision before this one was stored
+        with mock.patch.object(UrlconfRevision, 'get_or_create_revision', return_value=('initial', False)):
+            other_revision = apphook_reload.mark_urlconf_as_changed(changes=[(2, 'en')])
+
+        # Its changes can't be chained, all apphooks are reloaded
+        self.assertEqual(UrlconfRevision.get_or_create_revision()[0], other_revision)
+        self.assertIsNone(apphook_reload.get_urlconf_changes('initial', other_revision))
+        self.assertIsNone(apphook_reload.get_urlconf_changes(revision, other_revision))
+        self.assertEqual(apphook_reload.get_local_revision(), other_revision)
+
+    @override_settings(CMS_APPHOOK_RELOAD_CACHE_TTL=60, CMS_APPHOOK_RELOAD_POLL_INTERVAL=60)
+    def test_global_revision_is_polled(self):
+        self.addCleanup(apphook_reload._global_revision.update, revision=None, checked=0, polled=0)
+        revision = apphook_reload.mark_urlconf_as_changed()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(apphook_reload.get_global_revision(), revision)
+
+        # Another process changes the revision
+        UrlconfRevision.update_revision('other')
+        cache.set(apphook_reload._get_global_revision_key(), 'other')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(apphook_reload.get_global_revision(), revision)
+
+            with self.settings(CMS_APPHOOK_RELOAD_CACHE_TTL=0):
+                self.assertEqual(apphook_reload.get_global_revision(), 'other')
+
+        # The database is polled when the cache lost the revision
+        cache.clear()
+        UrlconfRevision.update_revision('polled')
+
+        with self.settings(CMS_APPHOOK_RELOAD_CACHE_TTL=0):
+            with self.assertNumQueries(1):
+                self.assertEqual(apphook_reload.get_global_revision(), 'polled')
+
+        # An interval of 0 polls the database on every call
+        with self.settings(CMS_APPHOOK_RELOAD_POLL_INTERVAL=0):
+            UrlconfRevision.update_revision('always')
+
+            with self.assertNumQueries(1):
+                self.assertEqual(apphook_reload.get_global_revision(), 'always')
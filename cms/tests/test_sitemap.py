@@ -2,6 +2,7 @@
 from cms.models import Title, Page
 from cms.sitemaps import CMSSitemap
 from cms.test_utils.testcases import CMSTestCase
+from cms.test_utils.util.fuzzy_int import FuzzyInt
 from cms.api import create_page, create_title
 
 
@@ -151,3 +152,49 @@ class SitemapTestCase(CMSTestCase):
             else:
                 url = 'http://example.com/%s/%s' % (title.language, title.path)
             self.assertFalse(url in locations)
+
+    def test_sitemap_language(self):
+        sitemap = CMSSitemap(language='de')
+        self.assertEqual(sitemap.items().count(), 8)
+        self.assertTrue(all(item['item'].language == 'de' for item in sitemap.get_urls()))
+
+    def test_sitemap_query_count(self):
+        sitemap = CMSSitemap()
+
+        # Independent from the number of pages and plugins
+        with self.assertNumQueries(FuzzyInt(2, 3)):
+            urls = sitemap.get_urls()
+        self.assertEqual(len(urls), 18)
+
+        for item in urls:
+            self.assertEqual(item['lastmod'], sitemap.lastmod(Title.objects.get(pk=item['item'].pk)))
+
+    def test_sitemap_cache(self):
+        locations = [item['location'] for item in CMSSitemap().get_urls()]
+
+        with self.assertNumQueries(0):
+            urls = CMSSitemap().get_urls()
+        self.assertEqual([item['location'] for item in urls], locations)
+        # The titles aren't cached
+        self.assertEqual(set(urls[0]), set(['location', 'lastmod', 'changefreq', 'priority']))
+
+        # Publishing a page invalidates the sitemap
+        page = Page.objects.drafts().get(title_set__title='P11')
+        title = page.get_title_obj('en')
+        title.slug = 'new-p11'
+        title.save()
+        page.publish('en')
+
+        new_locations = [item['location'] for item in CMSSitemap().get_urls()]
+        self.assertEqual(len(new_locations), 18)
+        self.assertNotEqual(new_locations, locations)
+        self.assertTrue(any(location.endswith('/new-p11/') for location in new_locations))
+
+    def test_sitemap_cache_per_class_and_limit(self):
+        class LimitedSitemap(CMSSitemap):
+            limit = 5
+
+        self.assertEqual(len(CMSSitemap().get_urls()), 18)
+        self.assertEqual(len(LimitedSitemap().get_urls()), 5)
+        self.assertEqual(len(LimitedSitemap().get_urls(page=4)), 3)
+        self.assertEqual(len(CMSSitemap().get_urls()), 18)
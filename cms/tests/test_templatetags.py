@@ -19,6 +19,7 @@ from sekizai.helpers import get_varname
 
 import cms
 from cms.api import create_page, create_title, add_plugin
+from cms.exceptions import PlaceholderNotFound
 from cms.middleware.toolbar import ToolbarMiddleware
 from cms.models import Page, Placeholder
 from cms.templatetags.cms_tags import (
@@ -255,10 +256,44 @@ class TemplatetagDatabaseTests(TwoPagesFixture, CMSTestCase):
 
         context = self.get_context(page=page)
         content_renderer = context['cms_content_renderer']
+        content_renderer.toolbar.edit_mode = True
         placeholder = content_renderer._get_page_placeholder(context, page, 'col_right')
         page.placeholders.get(slot='col_right')
         self.assertEqual(placeholder.slot, 'col_right')
 
+    def test_render_does_not_create_placeholders(self):
+        """
+        Tests that rendering a page outside of edit mode doesn't create
+        the placeholders missing from its template.
+        """
+        page = create_page('Test', 'col_two.html', 'en')
+        page._template_cache = 'col_three.html'
+
+        context = self.get_context(page=page)
+        content_renderer = context['cms_content_renderer']
+
+        with self.assertRaises(PlaceholderNotFound):
+            content_renderer._get_page_placeholder(context, page, 'col_right')
+        self.assertFalse(page.placeholders.filter(slot='col_right').exists())
+
+        # Saving the page creates them
+        page.template = 'col_three.html'
+        page.save()
+        self.assertTrue(page.placeholders.filter(slot='col_right').exists())
+
+    def test_declared_placeholders_are_cached(self):
+        page = create_page('Test', 'col_two.html', 'en')
+        placeholders = page.rescan_placeholders()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(page.get_declared_placeholders(), placeholders)
+
+        # Changing the placeholders of the page clears the cached slots
+        placeholder = Placeholder.objects.create(slot='col_left')
+        page.placeholders.remove(placeholders['col_left'])
+        page.placeholders.add(placeholder)
+        self.assertEqual(page.get_declared_placeholders()['col_left'], placeholder)
+
     def test_render_plugin_toolbar_config(self):
         """
         Ensures that the render_plugin_toolbar_config tag
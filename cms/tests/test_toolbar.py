@@ -34,7 +34,7 @@ from cms.test_utils.testcases import (CMSTestCase,
 from cms.test_utils.util.context_managers import UserLoginContext
 from cms.toolbar.items import (ToolbarAPIMixin, LinkItem, ItemSearchResult,
                                Break, SubMenu, AjaxItem)
-from cms.toolbar.toolbar import CMSToolbar
+from cms.toolbar.toolbar import CMSToolbar, InertToolbar
 from cms.utils.conf import get_cms_setting
 from cms.utils.i18n import get_language_tuple
 from cms.utils.urlutils import admin_reverse
@@ -156,6 +156,70 @@ class ToolbarMiddlewareTest(ToolbarTestBase):
             request = self.get_page_request(None, self.get_staff(), '/en/example/')
             self.assertFalse(hasattr(request, 'toolbar'))
 
+    def test_inert_toolbar_for_anonymous_visitors(self):
+        page = create_page('foo', 'col_two.html', 'en', published=True)
+        request = self.get_page_request(page, self.get_anon())
+        toolbar = request.toolbar
+
+        self.assertIsInstance(toolbar, InertToolbar)
+        self.assertFalse(toolbar.edit_mode)
+        self.assertFalse(toolbar.show_toolbar)
+        self.assertFalse(toolbar._cache_disabled)
+        self.assertIsNone(toolbar.request_hook())
+        self.assertNotIn('toolbar', toolbar.__dict__)
+
+        # The real toolbar is built on demand
+        self.assertEqual(toolbar.get_left_items(), [])
+        self.assertIsInstance(toolbar.toolbar, CMSToolbar)
+        self.assertIs(toolbar.content_renderer, toolbar.toolbar.content_renderer)
+
+    def test_inert_toolbar_renders_uncached_page(self):
+        page = create_page('foo', 'col_two.html', 'en', published=True)
+
+        with self.settings(CMS_PAGE_CACHE=False):
+            response = self.client.get(page.get_absolute_url())
+
+        self.assertEqual(response.status_code, 200)
+        toolbar = response.wsgi_request.toolbar
+        self.assertIsInstance(toolbar, InertToolbar)
+        self.assertEqual(toolbar.obj, page.publisher_public)
+        # No CMSToolbar has been built
+        self.assertNotIn('toolbar', toolbar.__dict__)
+
+    def test_full_toolbar_for_editors(self):
+        page = create_page('foo', 'col_two.html', 'en', published=True)
+        request = self.get_page_request(page, self.get_anon(), edit=True)
+        self.assertIsInstance(request.toolbar, CMSToolbar)
+
+        request = self.get_page_request(page, self.get_staff())
+        self.assertIsInstance(request.toolbar, CMSToolbar)
+
+    def test_staff_toolbar_data_is_cached(self):
+        from cms.cache.toolbar import get_latest_log_entry
+
+        page = create_page('foo', 'col_two.html', 'en', published=True)
+        staff = self.get_staff()
+        request = self.get_page_request(page, staff)
+        self.assertEqual(request.cms_latest_entry, -1)
+        user_settings = request.toolbar.get_user_settings()
+
+        request = RequestFactory().get(page.get_absolute_url())
+        request.session = {}
+        request.user = staff
+
+        with self.assertNumQueries(0):
+            ToolbarMiddleware().process_request(request)
+        self.assertEqual(request.toolbar.clipboard, user_settings.clipboard)
+
+        # New log entries and user settings changes are picked up
+        self._fake_logentry(page.pk, staff, 'foo')
+        self.assertEqual(get_latest_log_entry(staff), LogEntry.objects.latest('pk').pk)
+
+        user_settings.language = 'de'
+        user_settings.save()
+        request = self.get_page_request(page, staff)
+        self.assertEqual(request.toolbar.get_user_settings().language, 'de')
+
 
 @override_settings(CMS_PERMISSION=False)
 class ToolbarTests(ToolbarTestBase):
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from collections import OrderedDict
 
+from cms.cache.toolbar import get_user_settings_cache, set_user_settings_cache
 from cms.constants import LEFT, REFRESH_PAGE
 from cms.models import UserSettings, Placeholder
 from cms.toolbar.items import Menu, ToolbarAPIMixin, ButtonList
@@ -148,6 +149,11 @@ class CMSToolbar(ToolbarAPIMixin):
     def get_user_settings(self):
         user_settings = None
         if self.is_staff:
+            user_settings = get_user_settings_cache(self.request.user)
+
+            if user_settings is not None:
+                return user_settings
+
             try:
                 user_settings = UserSettings.objects.select_related('clipboard').get(user=self.request.user)
             except UserSettings.DoesNotExist:
@@ -157,6 +163,7 @@ class CMSToolbar(ToolbarAPIMixin):
                     language=self.language,
                     user=self.request.user,
                 )
+            set_user_settings_cache(user_settings)
         return user_settings
 
     def _reorder_toolbars(self):
@@ -414,3 +421,69 @@ class EmptyToolbar(object):
         from cms.plugin_rendering import ContentRenderer
 
         return ContentRenderer(request=self.request)
+
+
+class InertToolbar(EmptyToolbar):
+    """
+    Stands in for the toolbar of visitors who can't edit. Provides what
+    page rendering and caching read without building anything, the real
+    CMSToolbar is only built when anything else is accessed.
+    """
+    build_mode = False
+    use_draft = False
+    redirect_url = None
+    obj = None
+
+    def init_toolbar(self, request):
+        self.request = request
+
+    def set_object(self, obj):
+        if not self.obj:
+            self.obj = obj
+
+        if 'toolbar' in self.__dict__:
+            self.toolbar.set_object(obj)
+
+    def populate(self):
+        pass
+
+    def post_template_populate(self):
+        pass
+
+    def render_addons(self, context):
+        return ''
+
+    def post_template_render_addons(self, context):
+        return ''
+
+    def request_hook(self):
+        if ('cms-toolbar-login' in self.request.GET
+                or 'cms-toolbar-logout' in self.request.GET
+                or toolbar_pool.has_request_hooks()):
+            return self.toolbar.request_hook()
+
+    @cached_property
+    def content_renderer(self):
+        from cms.plugin_rendering import ContentRenderer
+
+        if 'toolbar' in self.__dict__:
+            return self.toolbar.content_renderer
+        return ContentRenderer(request=self.request)
+
+    @cached_property
+    def toolbar(self):
+        toolbar = CMSToolbar(self.request)
+
+        if 'content_renderer' in self.__dict__:
+            # Keep what has been rendered so far
+            toolbar.content_renderer = self.content_renderer
+
+        if self.obj:
+            toolbar.set_object(self.obj)
+        return toolbar
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the inert toolbar
+        if name.startswith('__') or name == 'toolbar':
+            raise AttributeError(name)
+        return getattr(self.toolbar, name)
@@ -5,6 +5,7 @@ from cms.exceptions import ToolbarAlreadyRegistered, ToolbarNotRegistered
 from cms.utils.conf import get_cms_setting
 from cms.utils.django_load import load, iterload_objects
 from django.core.exceptions import ImproperlyConfigured
+from django.utils import six
 
 
 class ToolbarPool(object):
@@ -62,6 +63,16 @@ class ToolbarPool(object):
         self.discover_toolbars()
         return self.toolbars
 
+    def has_request_hooks(self):
+        """
+        Returns True if any registered toolbar implements request_hook.
+        """
+        from cms.toolbar_base import CMSToolbar
+
+        base_hook = six.get_unbound_function(CMSToolbar.request_hook)
+        return any(six.get_unbound_function(toolbar.request_hook) is not base_hook
+                   for toolbar in self.get_toolbars().values())
+
     def get_watch_models(self):
         return sum((list(getattr(tb, 'watch_models', []))
                     for tb in self.toolbars.values()), [])
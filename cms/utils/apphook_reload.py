@@ -3,6 +3,7 @@
 from __future__ import absolute_import
 
 import sys
+import time
 import uuid
 
 from threading import local
@@ -13,11 +14,20 @@ from django.core.urlresolvers import reverse, clear_url_caches
 # Py2 and Py3 compatible reload
 from imp import reload
 
+from cms.utils.conf import get_cms_setting
+
 _urlconf_revision = {}
+# The global revision as last seen by this process, when it was last read
+# from the cache and when the database was last polled.
+_global_revision = {'revision': None, 'checked': 0, 'polled': 0}
 _urlconf_revision_threadlocal = local()
 
 use_threadlocal = False
 
+# How many revisions ensure_urlconf_is_up_to_date() follows back to find
+# the apphook changes since the local revision, before it reloads them all.
+MAX_URLCONF_CHANGES = 20
+
 
 def ensure_urlconf_is_up_to_date():
     global_revision = get_global_revision()
@@ -33,7 +43,12 @@ def ensure_urlconf_is_up_to_date():
                       global_revision, type(global_revision),
                       local_revision, type(local_revision),))
         debug_check_url('my_test_app_view')
-        reload_urlconf(new_revision=global_revision)
+        changes = get_urlconf_changes(local_revision, global_revision)
+
+        if changes is not None and update_urlconf(changes):
+            set_local_revision(global_revision)
+        else:
+            reload_urlconf(new_revision=global_revision)
         debug_check_url('my_test_app_view')
 
 
@@ -60,10 +75,63 @@ def set_local_revision(revision):
         _urlconf_revision['urlconf_revision'] = revision
 
 
+def _get_global_revision_key():
+    return '%s:urlconf_revision' % get_cms_setting('CACHE_PREFIX')
+
+
+def _remember_global_revision(revision, polled=False):
+    from django.core.cache import cache
+
+    timestamp = time.time()
+    cache.set(_get_global_revision_key(), revision,
+              get_cms_setting('CACHE_DURATIONS')['content'])
+    _global_revision['revision'] = revision
+    _global_revision['checked'] = timestamp
+
+    if polled:
+        _global_revision['polled'] = timestamp
+
+
 def get_global_revision():
+    """
+    Returns the urlconf revision shared by all processes.
+
+    The revision this process has seen last is trusted for
+    CMS_APPHOOK_RELOAD_CACHE_TTL seconds, then it's read from the cache.
+    The database is only polled every CMS_APPHOOK_RELOAD_POLL_INTERVAL
+    seconds or when the cache lost the revision. An interval of 0 polls
+    it on every call.
+    """
+    from django.core.cache import cache
+
+    if not get_cms_setting('APPHOOK_RELOAD_POLL_INTERVAL'):
+        return poll_global_revision()
+
+    timestamp = time.time()
+    revision = _global_revision['revision']
+
+    if revision and timestamp - _global_revision['checked'] < get_cms_setting('APPHOOK_RELOAD_CACHE_TTL'):
+        return revision
+
+    if timestamp - _global_revision['polled'] < get_cms_setting('APPHOOK_RELOAD_POLL_INTERVAL'):
+        revision = cache.get(_get_global_revision_key())
+
+        if revision is not None:
+            _global_revision['revision'] = revision
+            _global_revision['checked'] = timestamp
+            return revision
+    return poll_global_revision()
+
+
+def poll_global_revision():
+    """
+    Reads the urlconf revision from the database and shares it through
+    the cache.
+    """
     from ..models import UrlconfRevision
     revision, _ = UrlconfRevision.get_or_create_revision(
         revision=str(uuid.uuid4()))
+    _remember_global_revision(revision, polled=True)
     return revision
 
 
@@ -72,14 +140,92 @@ def set_global_revision(new_revision=None):
     if new_revision is None:
         new_revision = str(uuid.uuid4())
     UrlconfRevision.update_revision(new_revision)
+    # The other processes pick the revision up from the cache
+    # or when they next poll the database.
+    _remember_global_revision(new_revision)
+
 
+def _get_urlconf_changes_key(revision):
+    return '%s:urlconf_changes:%s' % (get_cms_setting('CACHE_PREFIX'), revision)
+
+
+def mark_urlconf_as_changed(changes=None):
+    """
+    Starts a new urlconf revision. If the (page id, language) pairs of the
+    changed apphooks are given, they are shared through the cache along
+    with the revision they change, so that the other processes can rebuild
+    only those.
+
+    The revision is only replaced if it hasn't changed in the meantime.
+    Otherwise the changes can't be chained to the previous ones: they are
+    dropped and all processes reload all apphooks.
+    """
+    from django.core.cache import cache
+    from ..models import UrlconfRevision
 
-def mark_urlconf_as_changed():
     new_revision = str(uuid.uuid4())
-    set_global_revision(new_revision=new_revision)
+
+    if changes is None:
+        set_global_revision(new_revision=new_revision)
+        return new_revision
+
+    previous_revision = UrlconfRevision.get_or_create_revision()[0]
+    changes_key = _get_urlconf_changes_key(new_revision)
+    cache.set(
+        changes_key,
+        (previous_revision, list(changes)),
+        get_cms_setting('CACHE_DURATIONS')['content'],
+    )
+
+    if UrlconfRevision.replace_revision(previous_revision, new_revision):
+        _remember_global_revision(new_revision)
+    else:
+        # Another change got in first
+        cache.delete(changes_key)
+        set_global_revision(new_revision=new_revision)
+        reload_urlconf(new_revision=new_revision)
     return new_revision
 
 
+def get_urlconf_changes(from_revision, to_revision):
+    """
+    Returns the (page id, language) pairs of the apphooks changed between
+    the given revisions, or None if they aren't all known.
+    """
+    from django.core.cache import cache
+
+    changes = set()
+    revision = to_revision
+
+    for _ in range(MAX_URLCONF_CHANGES):
+        if revision == from_revision:
+            return changes
+
+        entry = cache.get(_get_urlconf_changes_key(revision))
+
+        if entry is None:
+            return None
+
+        revision, revision_changes = entry
+        changes.update(tuple(change) for change in revision_changes)
+
+    if revision == from_revision:
+        return changes
+    return None
+
+
+def update_urlconf(changes):
+    """
+    Rebuilds the url patterns of the given apphooks in place.
+    Returns False if all of them have to be reloaded instead.
+    """
+    from cms.appresolver import update_app_resolvers
+
+    if not changes:
+        return True
+    return update_app_resolvers(changes)
+
+
 def reload_urlconf(urlconf=None, new_revision=None):
     from cms.appresolver import clear_app_resolvers, get_app_patterns
 
@@ -46,6 +46,14 @@ DEFAULTS = {
     'PAGE_MEDIA_PATH': 'cms_page_media/',
     'TITLE_CHARACTER': '+',
     'PAGE_CACHE': True,
+    # Whether the page cache keeps a gzip compressed copy of the pages
+    'PAGE_CACHE_GZIP': False,
+    # The query parameters pages are cached for, None for all of them
+    'PAGE_CACHE_QUERY_PARAMETERS': None,
+    # The query parameters ignored by the page cache, such as 'utm_*'
+    'PAGE_CACHE_IGNORED_QUERY_PARAMETERS': [],
+    # Whether to count the page cache hits and misses of each path
+    'PAGE_CACHE_STATS': False,
     'PLACEHOLDER_CACHE': True,
     'PLUGIN_CACHE': True,
     'CACHE_PREFIX': 'cms-',
@@ -71,6 +79,13 @@ DEFAULTS = {
     'PAGE_WIZARD_CONTENT_PLUGIN': 'TextPlugin',
     'PAGE_WIZARD_CONTENT_PLUGIN_BODY': 'body',
     'PAGE_WIZARD_CONTENT_PLACEHOLDER': None,  # Use first placeholder it finds.
+    'SEARCH_BACKEND': None,  # Picked from the database vendor.
+    # Seconds a process trusts the urlconf revision it has seen last
+    # and between polls of the database, see ApphookReloadMiddleware
+    'APPHOOK_RELOAD_CACHE_TTL': 1,
+    'APPHOOK_RELOAD_POLL_INTERVAL': 60,
+    # Share of the requests profiled by RenderProfilingMiddleware
+    'RENDER_PROFILING_SAMPLE_RATE': 0.01,
 }
 
 
@@ -85,6 +100,20 @@ def get_cache_durations():
     })
 
 
+def get_local_cache():
+    """
+    Returns the setting: CMS_LOCAL_CACHE completed with the defaults.
+    The process-local cache tier is disabled unless TTL is set.
+    """
+    local_cache = {
+        'TTL': 0,
+        'MAX_ENTRIES': 1000,
+        'MAX_ENTRY_SIZE': 64 * 1024,
+    }
+    local_cache.update(getattr(settings, 'CMS_LOCAL_CACHE', {}))
+    return local_cache
+
+
 @default('CMS_MEDIA_ROOT')
 def get_media_root():
     return os.path.join(settings.MEDIA_ROOT, get_cms_setting('MEDIA_PATH'))
@@ -256,6 +285,7 @@ def get_unihandecode_host():
 
 COMPLEX = {
     'CACHE_DURATIONS': get_cache_durations,
+    'LOCAL_CACHE': get_local_cache,
     'MEDIA_ROOT': get_media_root,
     'MEDIA_URL': get_media_url,
     # complex because not prefixed by CMS_
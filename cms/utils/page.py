@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from django.conf import settings
+from django.contrib.sites.models import Site
 from django.db.models import Q
 import re
 from cms.exceptions import NoHomeFound
@@ -95,3 +96,81 @@ def check_title_slugs(page):
         title.slug = get_available_slug(title)
         if title.slug != old_slug or title.path != old_path:
             title.save()
+
+
+def prefetch_titles(pages, languages=None):
+    """Fills the title cache of the given pages with their titles in the given
+    languages (all languages if None) using a single query.
+
+    Titles in these languages are not looked up again, a page without a title
+    in one of them returns an EmptyTitle for it.
+    """
+    from cms.models import Title
+
+    pages_by_id = {}
+
+    for page in pages:
+        page.title_cache = {}
+        # None stands for all languages
+        page._prefetched_title_languages = None if languages is None else frozenset(languages)
+        pages_by_id[page.pk] = page
+
+    if not pages_by_id:
+        return
+
+    titles = Title.objects.filter(page__in=list(pages_by_id))
+
+    if languages is not None:
+        titles = titles.filter(language__in=languages)
+
+    for title in titles:
+        pages_by_id[title.page_id].title_cache[title.language] = title
+
+
+def get_page_render_profile(request, page):
+    """Returns what rendering the given public page needs to know about it
+    besides its own fields, as a dictionary:
+
+    * titles: its titles by language, with their path, slug, redirect and
+      publication state
+    * template and xframe_options: its effective template and X-Frame-Options
+    * is_restricted: whether view permissions restrict access to it
+
+    The profile is loaded from the cache, or with a single query for the
+    titles and one for the view restrictions. It is cached until a page is
+    published or unpublished, or page permissions change.
+
+    The title, template, X-Frame-Options and view restriction caches of the
+    page and the request are filled from the profile, so that the page
+    methods details() and render_page() call don't query the database.
+    """
+    from cms.cache.page import get_page_render_profile_cache, set_page_render_profile_cache
+    from cms.models import Title
+    from cms.utils.permissions import get_any_page_view_permissions
+
+    profile = get_page_render_profile_cache(page.pk)
+
+    if profile is None:
+        profile = {
+            'titles': dict((title.language, title) for title in Title.objects.filter(page=page)),
+            'template': page.get_template(),
+            'xframe_options': page.get_xframe_options(),
+            'is_restricted': bool(get_any_page_view_permissions(request, page)),
+        }
+        set_page_render_profile_cache(page, profile)
+
+    page.title_cache = dict(profile['titles'])
+    page._prefetched_title_languages = None
+    page._template_cache = profile['template']
+    page._xframe_options_cache = profile['xframe_options']
+
+    if not profile['is_restricted']:
+        # See get_any_page_view_permissions()
+        if not hasattr(request, '_cms_view_perms'):
+            request._cms_view_perms = {}
+        request._cms_view_perms[page.publisher_public_id] = []
+
+    if page.site_id == settings.SITE_ID:
+        # Site.objects.get_current() doesn't query the database once cached
+        page.site = Site.objects.get_current()
+    return profile
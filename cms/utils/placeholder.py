@@ -4,6 +4,7 @@ import warnings
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
 from django.db.models.query_utils import Q
 from django.template import TemplateSyntaxError, NodeList, Variable, Context, Template, engines
 from django.template.base import VariableNode
@@ -34,6 +35,93 @@ def get_context():
         return {}
 
 
+class PlaceholderConf(object):
+    """
+    CMS_PLACEHOLDER_CONF compiled for fast lookups.
+
+    The configuration entries are indexed by their key once and every
+    (template, placeholder, setting) lookup is resolved only once,
+    following the inherit chains. Rebuilt when the setting changes.
+    """
+
+    def __init__(self, conf):
+        self.confs = {}
+        self.resolved = {}
+
+        for key, value in conf.items():
+            if value:
+                self.confs.setdefault(force_text(key), []).append(value)
+
+    def _get_confs(self, placeholder, template):
+        # Same order as documented in get_placeholder_conf()
+        if template:
+            for conf in self.confs.get(force_text(u'%s %s' % (template, placeholder)), ()):
+                yield conf
+        for conf in self.confs.get(force_text(placeholder), ()):
+            yield conf
+        if template:
+            for conf in self.confs.get(force_text(template), ()):
+                yield conf
+        for conf in self.confs.get(force_text(None), ()):
+            yield conf
+
+    def resolve(self, setting, placeholder, template=None):
+        """
+        Returns a (value, stopped) tuple. value is the first value found
+        or None. stopped is True if an inherit entry without the setting
+        came first, in that case the given default is returned instead.
+        """
+        key = (template, placeholder, setting)
+
+        if key not in self.resolved:
+            self.resolved[key] = self._resolve(setting, placeholder, template)
+        return self.resolved[key]
+
+    def _resolve(self, setting, placeholder, template):
+        stopped = False
+
+        for conf in self._get_confs(placeholder, template):
+            value = conf.get(setting)
+
+            if value is not None:
+                return value, stopped
+
+            inherit = conf.get('inherit')
+
+            if inherit:
+                if ' ' in inherit:
+                    inherit = inherit.split(' ')
+                else:
+                    inherit = (None, inherit)
+                value, inherited_stopped = self.resolve(setting, inherit[1], inherit[0])
+
+                if value is not None:
+                    return value, stopped or inherited_stopped
+                stopped = True
+        return None, stopped
+
+
+_placeholder_conf = None
+
+
+def _get_placeholder_conf():
+    global _placeholder_conf
+
+    if _placeholder_conf is None:
+        _placeholder_conf = PlaceholderConf(get_cms_setting('PLACEHOLDER_CONF'))
+    return _placeholder_conf
+
+
+def clear_placeholder_conf(**kwargs):
+    global _placeholder_conf
+
+    if kwargs.get('setting', 'CMS_PLACEHOLDER_CONF') == 'CMS_PLACEHOLDER_CONF':
+        _placeholder_conf = None
+
+
+setting_changed.connect(clear_placeholder_conf, dispatch_uid='cms_clear_placeholder_conf')
+
+
 def get_placeholder_conf(setting, placeholder, template=None, default=None):
     """
     Returns the placeholder configuration for a given setting. The key would for
@@ -48,35 +136,10 @@ def get_placeholder_conf(setting, placeholder, template=None, default=None):
     """
 
     if placeholder:
-        keys = []
-        placeholder_conf = get_cms_setting('PLACEHOLDER_CONF')
-        # 1st level
-        if template:
-            keys.append(u'%s %s' % (template, placeholder))
-        # 2nd level
-        keys.append(placeholder)
-        # 3rd level
-        if template:
-            keys.append(template)
-        # 4th level
-        keys.append(None)
-        for key in keys:
-            for conf_key, conf in placeholder_conf.items():
-                if force_text(conf_key) == force_text(key):
-                    if not conf:
-                        continue
-                    value = conf.get(setting)
-                    if value is not None:
-                        return value
-                    inherit = conf.get('inherit')
-                    if inherit:
-                        if ' ' in inherit:
-                            inherit = inherit.split(' ')
-                        else:
-                            inherit = (None, inherit)
-                        value = get_placeholder_conf(setting, inherit[1], inherit[0], default)
-                        if value is not None:
-                            return value
+        value, stopped = _get_placeholder_conf().resolve(setting, placeholder, template)
+
+        if value is not None and not (stopped and default is not None):
+            return value
     return default
 
 
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+"""
+Render-time profiling of placeholders and plugins.
+
+``RenderProfilingMiddleware`` attaches a ``RenderProfiler`` to a sample of the
+requests (see ``CMS_RENDER_PROFILING_SAMPLE_RATE``). The ``ContentRenderer`` of
+such a request records the wall time, the number of database queries, the
+placeholder cache hits and misses and the rendered bytes of every placeholder
+and plugin it renders, as well as of looking up the plugins of a placeholder
+(``assign_plugins``). Other requests only pay for an attribute lookup.
+
+The report of a request is sent with the ``cms.signals.render_profiled``
+signal and logged as JSON to the ``cms.profiling`` logger.
+``cms render-profile`` summarizes the slowest plugin types of such logs.
+"""
+
+import json
+import logging
+import random
+import time
+
+from collections import OrderedDict
+
+from django.db import connection
+
+from cms.utils.conf import get_cms_setting
+
+
+logger = logging.getLogger('cms.profiling')
+
+PROFILE_HEADER = 'X-CMS-Render-Profile'
+
+
+class NoopMeasure(object):
+    """
+    Stands in for RenderProfiler.measure() when the request isn't profiled.
+    """
+
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NOOP_MEASURE = NoopMeasure()
+
+
+class Measure(object):
+
+    def __init__(self, profiler, record):
+        self.profiler = profiler
+        self.record = record
+
+    def __enter__(self):
+        self.start = time.time()
+        self.queries = self.profiler.get_query_count()
+        self.profiler.stack.append(self.record)
+        return self.record
+
+    def __exit__(self, *exc_info):
+        record = self.profiler.stack.pop()
+        # Times and queries include those of nested records
+        record['time'] = (time.time() - self.start) * 1000
+        record['queries'] = self.profiler.get_query_count() - self.queries
+        self.profiler.records.append(record)
+        return False
+
+
+class RenderProfiler(object):
+    """
+    Collects the render records of a request.
+    Only the queries of the default database connection are counted.
+    """
+
+    def __init__(self):
+        self.records = []
+        self.stack = []
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._start = None
+        self._queries = 0
+        self._force_debug_cursor = None
+
+    def start(self):
+        self._start = time.time()
+        # Makes the connection log the queries, like CaptureQueriesContext
+        self._force_debug_cursor = connection.force_debug_cursor
+        connection.force_debug_cursor = True
+        self._queries = self.get_query_count()
+
+    def stop(self):
+        connection.force_debug_cursor = self._force_debug_cursor
+
+    def get_query_count(self):
+        return len(connection.queries_log)
+
+    def measure(self, kind, **info):
+        """
+        Returns a context manager that records the time and queries it takes
+        to render something of the given kind ('placeholder', 'plugin' or
+        'assign_plugins'). It yields the record so that more can be added.
+        """
+        info['kind'] = kind
+        return Measure(self, info)
+
+    def add_cache_lookup(self, hit):
+        if hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+
+        if self.stack:
+            self.stack[-1]['cache'] = 'hit' if hit else 'miss'
+
+    def get_report(self, request):
+        return OrderedDict((
+            ('path', request.path),
+            ('time', (time.time() - self._start) * 1000),
+            ('queries', self.get_query_count() - self._queries),
+            ('cache_hits', self.cache_hits),
+            ('cache_misses', self.cache_misses),
+            ('records', self.records),
+        ))
+
+
+def get_render_profiler(request):
+    return getattr(request, '_cms_render_profiler', None)
+
+
+def start_profiling(request):
+    """
+    Attaches a profiler to a sample of the requests,
+    returns it or None if the request is not profiled.
+    """
+    if random.random() >= get_cms_setting('RENDER_PROFILING_SAMPLE_RATE'):
+        return None
+
+    profiler = RenderProfiler()
+    profiler.start()
+    request._cms_render_profiler = profiler
+    return profiler
+
+
+def stop_profiling(request):
+    """
+    Detaches the profiler from the request and returns it,
+    or None if the request is not profiled.
+    """
+    profiler = get_render_profiler(request)
+
+    if profiler is not None:
+        profiler.stop()
+        del request._cms_render_profiler
+    return profiler
+
+
+def get_report_summary(report):
+    """
+    Returns the summary of a report sent in the X-CMS-Render-Profile header.
+    """
+    plugins = sum(1 for record in report['records'] if record['kind'] == 'plugin')
+    return 'time=%.1f; queries=%d; plugins=%d; cache_hits=%d; cache_misses=%d' % (
+        report['time'],
+        report['queries'],
+        plugins,
+        report['cache_hits'],
+        report['cache_misses'],
+    )
+
+
+def log_report(report):
+    logger.info(json.dumps(report))
+
+
+def summarize_plugin_types(lines):
+    """
+    Aggregates the plugin records of the reports logged in the given lines
+    per plugin type. Lines without a report are ignored, the JSON report may
+    be preceded by anything the log formatter adds.
+
+    Returns a list of dictionaries, the slowest plugin types (by total time)
+    first.
+    """
+    plugin_types = {}
+
+    for line in lines:
+        try:
+            report = json.loads(line[line.index('{'):])
+            records = report['records']
+        except (ValueError, KeyError, TypeError):
+            continue
+
+        for record in records:
+            if record.get('kind') != 'plugin':
+                continue
+
+            summary = plugin_types.setdefault(record['plugin_type'], {
+                'plugin_type': record['plugin_type'],
+                'count': 0,
+                'time': 0,
+                'max_time': 0,
+                'queries': 0,
+                'bytes': 0,
+            })
+            summary['count'] += 1
+            summary['time'] += record['time']
+            summary['max_time'] = max(summary['max_time'], record['time'])
+            summary['queries'] += record['queries']
+            summary['bytes'] += record.get('bytes', 0)
+    return sorted(plugin_types.values(), key=lambda summary: summary['time'], reverse=True)
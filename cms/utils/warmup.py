@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+"""
+Warming up the caches of the CMS after a deploy or a cache flush (see
+``cms warmup``).
+
+The published pages of the current site are requested through the Django
+test client, which goes through the whole middleware and view stack. Each
+request fills the caches a visitor would fill: the page cache (if
+``CMS_PAGE_CACHE`` is enabled), the placeholder cache, the menu cache and the
+apphook url patterns.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.db import connection
+from django.utils.six.moves import queue
+
+from cms.utils.i18n import get_public_languages
+from cms.utils.page import prefetch_titles
+
+
+class RateLimiter(object):
+    """
+    Spaces out the calls to wait() of all threads so that there are at most
+    ``rate`` of them per second. A rate of 0 (or None) doesn't limit them.
+    """
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+
+        with self._lock:
+            now = time.time()
+            delay = self._next - now
+            self._next = max(self._next, now) + self.interval
+
+        if delay > 0:
+            time.sleep(delay)
+
+
+def get_warmup_urls(languages=None):
+    """
+    Returns the urls of the published pages of the current site in the given
+    languages (all public languages if None), as (language, url) pairs.
+    Pages which require a login are left out, their content isn't cached.
+    """
+    from cms.models import Page
+
+    site_id = settings.SITE_ID
+    public_languages = get_public_languages(site_id)
+
+    if languages is None:
+        languages = public_languages
+    else:
+        languages = [language for language in languages if language in public_languages]
+
+    pages = list(
+        Page.objects
+        .public()
+        .published(site=site_id)
+        .filter(login_required=False)
+        .select_related('site')
+        .order_by('path')
+        .distinct()
+    )
+    prefetch_titles(pages, languages)
+
+    urls = []
+
+    for page in pages:
+        for language in languages:
+            if page.is_published(language):
+                urls.append((language, page.get_absolute_url(language, fallback=False)))
+    return urls
+
+
+def warm_up(urls, workers=1, rate=None, host=None, secure=False, callback=None):
+    """
+    Requests the given (language, url) pairs with ``workers`` threads, no more
+    than ``rate`` requests per second altogether. Requests are made for the
+    given host, the domain of the current site by default, over HTTPS if
+    ``secure`` is set: the page cache entries are stored per scheme.
+
+    Returns a list of dictionaries with the language, url, status code,
+    time (in milliseconds) and error (None if the page was rendered) of every
+    request, in the order they were made. ``callback`` is called with each of
+    these dictionaries as soon as the request is done.
+    """
+    if host is None:
+        host = Site.objects.get_current().domain
+
+    pending = queue.Queue()
+
+    for item in urls:
+        pending.put(item)
+
+    limiter = RateLimiter(rate)
+    results = []
+    results_lock = threading.Lock()
+
+    def add_result(result):
+        with results_lock:
+            results.append(result)
+
+            if callback:
+                callback(result)
+
+    if workers <= 1:
+        _warm_up_worker(pending, limiter, host, secure, add_result)
+        return results
+
+    threads = [
+        threading.Thread(target=_warm_up_worker, args=(pending, limiter, host, secure, add_result, True))
+        for index in range(workers)
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def _warm_up_worker(pending, limiter, host, secure, add_result, own_thread=False):
+    from django.test import Client
+
+    client = Client(HTTP_HOST=host)
+
+    try:
+        while True:
+            try:
+                language, url = pending.get_nowait()
+            except queue.Empty:
+                break
+
+            limiter.wait()
+            start = time.time()
+            status = None
+            error = None
+
+            try:
+                response = client.get(url, secure=secure, HTTP_ACCEPT_LANGUAGE=language)
+                status = response.status_code
+
+                if status >= 400:
+                    error = 'HTTP %d' % status
+            except Exception as exc:
+                error = '%s: %s' % (exc.__class__.__name__, exc)
+
+            add_result({
+                'language': language,
+                'url': url,
+                'status': status,
+                'time': (time.time() - start) * 1000,
+                'error': error,
+            })
+    finally:
+        if own_thread:
+            # Each thread has its own database connection
+            connection.close()
@@ -1,25 +1,86 @@
 # -*- coding: utf-8 -*-
 
+import re
+
 from django.conf import settings
 from django.contrib.auth.views import redirect_to_login
-from django.core.urlresolvers import resolve, Resolver404, reverse
-from django.http import HttpResponseRedirect, HttpResponse
+from django.core.urlresolvers import Resolver404, reverse
+from django.http import HttpResponseRedirect, HttpResponse, HttpResponseNotModified
 from django.utils.cache import patch_cache_control
-from django.utils.http import urlquote
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag, urlquote
 from django.utils.timezone import now
 from django.utils.translation import get_language
 
 from cms.apphook_pool import apphook_pool
-from cms.appresolver import get_app_urls
+from cms.appresolver import get_page_app_resolver
 from cms.cache.page import get_page_cache
 from cms.page_rendering import _handle_no_page, render_page
 from cms.utils import get_language_code, get_language_from_request, get_cms_setting
 from cms.utils.i18n import (get_fallback_languages, force_language, get_public_languages,
                             get_redirect_on_fallback, get_language_list,
                             is_language_prefix_patterns_used)
+from cms.utils.page import get_page_render_profile
 from cms.utils.page_resolver import get_page_from_request
 
 
+re_accepts_gzip = re.compile(r'\bgzip\b')
+
+
+def _is_not_modified(request, etags, last_modified):
+    """
+    Checks the validators of a conditional GET request against those of
+    the cached page. If-None-Match takes precedence over If-Modified-Since.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return False
+
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+
+    if if_none_match:
+        request_etags = parse_etags(if_none_match)
+        return '*' in request_etags or any(etag in request_etags for etag in etags)
+
+    if_modified_since = request.META.get('HTTP_IF_MODIFIED_SINCE')
+    if_modified_since = if_modified_since and parse_http_date_safe(if_modified_since)
+    return bool(if_modified_since) and last_modified <= if_modified_since
+
+
+def _get_cached_response(request, cache_content, response_timestamp):
+    """
+    Builds the response for a page served from the page cache,
+    see cms.cache.page.get_page_cache().
+    """
+    etag = cache_content['etag']
+    # The compressed variant needs an etag of its own
+    gzip_etag = etag + '-gzip'
+    gzip_content = cache_content['gzip_content']
+    use_gzip = gzip_content is not None and re_accepts_gzip.search(
+        request.META.get('HTTP_ACCEPT_ENCODING', ''))
+
+    if _is_not_modified(request, (etag, gzip_etag), cache_content['last_modified']):
+        response = HttpResponseNotModified()
+        # Only the headers a 304 response should carry
+        for header in ('Cache-Control', 'Expires', 'Vary', 'Content-Location'):
+            if header.lower() in cache_content['headers']:
+                response[header] = cache_content['headers'][header.lower()][1]
+        response['Last-Modified'] = http_date(cache_content['last_modified'])
+    elif use_gzip:
+        response = HttpResponse(gzip_content)
+        response._headers = cache_content['headers'].copy()
+        response['Content-Encoding'] = 'gzip'
+        response['Content-Length'] = str(len(gzip_content))
+    else:
+        response = HttpResponse(cache_content['content'])
+        response._headers = cache_content['headers'].copy()
+
+    response['ETag'] = quote_etag(gzip_etag if use_gzip else etag)
+    # Recalculate the max-age header for this cached response
+    max_age = int(
+        (cache_content['expires'] - response_timestamp).total_seconds() + 0.5)
+    patch_cache_control(response, max_age=max_age)
+    return response
+
+
 def details(request, slug):
     """
     The main view of the Django-CMS! Takes a request and a slug, renders the
@@ -35,19 +96,16 @@ def details(request, slug):
     ):
         cache_content = get_page_cache(request)
         if cache_content is not None:
-            content, headers, expires_datetime = cache_content
-            response = HttpResponse(content)
-            response._headers = headers
-            # Recalculate the max-age header for this cached response
-            max_age = int(
-                (expires_datetime - response_timestamp).total_seconds() + 0.5)
-            patch_cache_control(response, max_age=max_age)
-            return response
+            return _get_cached_response(request, cache_content, response_timestamp)
 
     # Get a Page model object from the request
     page = get_page_from_request(request, use_path=slug)
     if not page:
         return _handle_no_page(request, slug)
+    if not page.publisher_is_draft:
+        # Loads the titles, template, X-Frame-Options and view restrictions
+        # of the page at once, mostly from the cache.
+        get_page_render_profile(request, page)
     current_language = request.GET.get('language', None)
     if not current_language:
         current_language = request.POST.get('language', None)
@@ -148,13 +206,10 @@ def details(request, slug):
                 and request.toolbar.edit_mode):
             skip_app = True
         if app_urls and not skip_app:
-            app = apphook_pool.get_apphook(app_urls)
-            pattern_list = []
-            if app:
-                for urlpatterns in get_app_urls(app.get_urls(page, current_language)):
-                    pattern_list += urlpatterns
+            resolver = get_page_app_resolver(page, current_language, app_urls)
+            if resolver:
                 try:
-                    view, args, kwargs = resolve('/', tuple(pattern_list))
+                    view, args, kwargs = resolver.resolve('/')
                     return view(request, *args, **kwargs)
                 except Resolver404:
                     pass
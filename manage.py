@@ -85,6 +85,7 @@ if __name__ == '__main__':
         'sekizai',
         'hvad',
         'better_test',
+        'cms.test_utils.benchmark',
     ] + PLUGIN_APPS
 
     dynamic_configs = {
@@ -6,12 +6,13 @@ from logging import getLogger
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.sites.models import Site
-from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.urlresolvers import NoReverseMatch
 from django.utils.translation import get_language
 from django.utils.translation import ugettext_lazy as _
 
+from cms.cache.local import cache
+from cms.cache.publication import get_publication_ttl
 from cms.utils import get_cms_setting
 from cms.utils.django_load import load
 
@@ -156,7 +157,9 @@ class MenuRenderer(object):
             final_nodes += _build_nodes_inner_for_one_menu(
                 nodes, menu_class_name)
 
-        cache.set(key, final_nodes, get_cms_setting('CACHE_DURATIONS')['menus'])
+        # Pages going live or expiring have to show up in the menu in time
+        duration = get_publication_ttl(get_cms_setting('CACHE_DURATIONS')['menus'], site_id)
+        cache.set(key, final_nodes, duration)
         # We need to have a list of the cache keys for languages and sites that
         # span several processes - so we follow the Django way and share through
         # the database. It's still cheaper than recomputing every time!